@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# Author: Timur Gilmullin
+
+"""
+This module reduces count of points drawn on charts of long series (level of detail): candles are aggregated into
+OHLCV-buckets (the first open, the highest high, the lowest low, the last close and the sum of volumes of candles in a bucket),
+and lines are downsampled with Largest-Triangle-Three-Buckets algorithm (LTTB), which keeps visual shape of lines.
+
+Chart renderers use it when count of candles is greater than chart width in pixels, because it is impossible to see
+more candles than pixels, but every extra candle makes HTML-file bigger and browser slower.
+"""
+
+# Copyright (c) 2022 Gilmillin Timur Mansurovich
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import numpy as np
+import pandas as pd
+
+
+WEBGL_THRESHOLD = 10000
+"""Count of candles after which charts are rendered with WebGL backend."""
+
+
+def BucketBounds(count: int, buckets: int) -> np.ndarray:
+    """
+    Start positions of contiguous buckets with (almost) the same count of items.
+
+    :param count: count of items.
+    :param buckets: count of buckets. If it is not less than `count`, then every item is a bucket.
+    :return: numpy array with start positions of buckets.
+    """
+    if buckets >= count:
+        return np.arange(count, dtype=np.int64)
+
+    return np.unique(np.linspace(0, count, buckets + 1)[:-1].astype(np.int64))
+
+
+def OHLCVBuckets(prices: pd.DataFrame, buckets: int) -> pd.DataFrame:
+    """
+    Aggregate candles into OHLCV-buckets: datetime and open of the first candle, the highest high, the lowest low,
+    close of the last candle and the sum of volumes. Calculated with one reduction per column, without loops.
+
+    :param prices: Pandas DataFrame with `datetime`, `open`, `high`, `low`, `close` and `volume` columns.
+    :param buckets: count of buckets, e.g. chart width in pixels.
+    :return: Pandas DataFrame with the same columns and `candles` column (count of candles in every bucket).
+    """
+    starts = BucketBounds(len(prices), buckets)
+    ends = np.append(starts[1:], len(prices))
+
+    return pd.DataFrame({
+        "datetime": prices.datetime.iloc[starts].reset_index(drop=True),  # timezone of datetimes is kept
+        "open": prices.open.values[starts],
+        "high": np.maximum.reduceat(prices.high.values, starts),
+        "low": np.minimum.reduceat(prices.low.values, starts),
+        "close": prices.close.values[ends - 1],
+        "volume": np.add.reduceat(prices.volume.values, starts),
+        "candles": ends - starts,
+    })
+
+
+def LTTB(x, y, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling of line: the first and the last points are kept, and from every bucket
+    of points between them the point forming the largest triangle with the previously selected point and the average point
+    of the next bucket is selected. Not finite points (e.g. NaN at the beginning of moving averages) are skipped.
+
+    See also: Sveinn Steinarsson, "Downsampling Time Series for Visual Representation", 2013.
+
+    :param x: x-coordinates: numpy array or Pandas Series of numbers or datetimes, sorted ascending.
+    :param y: y-coordinates.
+    :param threshold: maximal count of points after downsampling.
+    :return: numpy array with positions of selected points.
+    """
+    xValues = np.asarray(x)
+    xValues = xValues.astype("datetime64[ns]").astype(np.int64) if np.issubdtype(xValues.dtype, np.datetime64) else xValues
+    xValues = np.asarray(xValues, dtype=np.float64)
+    yValues = np.asarray(y, dtype=np.float64)
+
+    finite = np.flatnonzero(np.isfinite(yValues) & np.isfinite(xValues))
+    count = len(finite)
+
+    if threshold >= count or threshold < 3:
+        return finite
+
+    xs = xValues[finite]
+    ys = yValues[finite]
+
+    # bounds of buckets between the first and the last points, averages of all buckets are calculated at once
+    bounds = np.floor(np.arange(threshold - 1) * (count - 2) / (threshold - 2)).astype(np.int64) + 1
+    bounds[-1] = count - 1
+    sizes = np.diff(bounds)
+    avgX = np.add.reduceat(xs[:-1], bounds[:-1]) / sizes
+    avgY = np.add.reduceat(ys[:-1], bounds[:-1]) / sizes
+    avgX = np.append(avgX[1:], xs[-1])  # average of the next bucket, and the last point for the last bucket
+    avgY = np.append(avgY[1:], ys[-1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = count - 1
+    a = 0
+
+    for i in range(threshold - 2):
+        start, end = bounds[i], bounds[i + 1]
+        areas = np.abs((xs[a] - avgX[i]) * (ys[start:end] - ys[a]) - (xs[a] - xs[start:end]) * (avgY[i] - ys[a]))
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+
+    return finite[selected]
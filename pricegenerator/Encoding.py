@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# Author: Timur Gilmullin
+
+"""
+This module prepares compact binary representation of chart data: numeric columns are embedded into HTML-files
+as base64-encoded typed arrays (`Int32Array`, `Float32Array` or `Float64Array` in browser) instead of text lists.
+
+Prices are stored as integer ticks (price multiplied by `10^precision`) if it is exact, datetimes are stored as integer
+offsets from the first candle. Every encoded column is a dictionary:
+
+```python
+{"dtype": "int32", "data": "<base64 of little-endian values>", "offset": 0, "multiplier": 1, "divisor": 100}
+```
+
+and decoded value is `offset + data[i] * multiplier / divisor`, see `decodeColumn()` JavaScript function in Google template.
+All arithmetic operations of decoding are exact for integer ticks, so decoded prices are the same as source prices.
+"""
+
+# Copyright (c) 2022 Gilmillin Timur Mansurovich
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import base64
+import json
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+INT32_MAX = np.iinfo(np.int32).max
+"""The biggest value of integer ticks and offsets."""
+
+
+def CompactArray(values, precision: Optional[int] = None) -> np.ndarray:
+    """
+    Convert numbers to the smallest type without loss of precision: integers to `int32` if they fit, and floats to `float32`
+    if all values rounded to `precision` digits are the same after conversion. Not finite values are kept.
+
+    :param values: numpy array, Pandas Series or list of numbers.
+    :param precision: count of significant digits after comma. If `None`, then floats are not converted.
+    :return: numpy array of `int32`, `float32` or source type.
+    """
+    values = np.asarray(values)
+
+    if np.issubdtype(values.dtype, np.integer):
+        if not len(values) or np.abs(values).max() <= INT32_MAX:
+            return values.astype(np.int32)
+
+        return values
+
+    if precision is None or not np.issubdtype(values.dtype, np.floating):
+        return values
+
+    compact = values.astype(np.float32)
+    finite = np.isfinite(values)
+
+    if np.array_equal(np.round(compact[finite].astype(np.float64), precision), np.round(values[finite], precision)):
+        return compact
+
+    return values
+
+
+def EncodeArray(values, precision: Optional[int] = None, offset: float = 0, multiplier: int = 1) -> dict:
+    """
+    Encode numbers as base64 of typed array: float prices with `precision` as `int32` ticks (values multiplied by `10^precision`)
+    if it is exact, otherwise as `float32` or `float64`, see `CompactArray()`.
+
+    :param values: numpy array, Pandas Series or list of numbers.
+    :param precision: count of significant digits after comma. If `None`, then floats are not converted to ticks.
+    :param offset: value added to every decoded number, e.g. datetime of the first candle.
+    :param multiplier: every decoded number is multiplied by it before offset is added.
+    :return: dictionary with `dtype`, `data`, `offset`, `multiplier` and `divisor` keys.
+    """
+    values = np.asarray(values)
+    divisor = 1
+
+    if precision is not None and np.issubdtype(values.dtype, np.floating) and np.all(np.isfinite(values)):
+        divisor = 10 ** precision
+        ticks = np.round(values * divisor)
+
+        if len(ticks) and np.abs(ticks).max() <= INT32_MAX and np.array_equal(ticks / divisor, values):  # prices have no more digits than precision
+            values = ticks.astype(np.int32)
+
+        else:
+            divisor = 1
+
+    values = CompactArray(values, precision)
+    values = values.astype(np.float64) if values.dtype not in (np.int32, np.float32, np.float64) else values
+
+    return {
+        "dtype": values.dtype.name,
+        "data": base64.b64encode(values.astype(values.dtype.newbyteorder("<")).tobytes()).decode("ascii"),
+        "offset": offset,
+        "multiplier": multiplier,
+        "divisor": divisor,
+    }
+
+
+def EncodeDatetimes(datetimes) -> dict:
+    """
+    Encode datetimes as milliseconds since epoch (UTC): offsets from the first datetime in seconds or milliseconds as `int32` if they fit.
+
+    :param datetimes: numpy array or Pandas Series of datetimes.
+    :return: dictionary with encoded column, see `EncodeArray()`.
+    """
+    ms = np.asarray(pd.Series(datetimes).values).astype("datetime64[ms]").astype(np.int64)
+    first = int(ms[0]) if len(ms) else 0
+    offsets = ms - first
+
+    if len(offsets) and np.all(offsets % 1000 == 0) and np.abs(offsets // 1000).max() <= INT32_MAX:
+        return EncodeArray(offsets // 1000, offset=first, multiplier=1000)
+
+    return EncodeArray(offsets if not len(offsets) or np.abs(offsets).max() <= INT32_MAX else offsets.astype(np.float64), offset=first)
+
+
+def EncodeCandles(prices: pd.DataFrame, precision: int) -> str:
+    """
+    Encode OHLCV-candles for embedding into HTML-file as JavaScript object.
+
+    :param prices: Pandas DataFrame with `datetime`, `open`, `high`, `low`, `close` and `volume` columns.
+    :param precision: count of significant digits after comma in prices.
+    :return: JSON string with encoded columns: `datetime`, `open`, `high`, `low`, `close` and `volume`.
+    """
+    columns = {"datetime": EncodeDatetimes(prices.datetime)}
+    columns.update({name: EncodeArray(prices[name].values, precision) for name in ["open", "high", "low", "close"]})
+    columns["volume"] = EncodeArray(prices.volume.values)
+
+    return json.dumps(columns, separators=(",", ":"))
+
+
+def DecodeArray(column: dict) -> np.ndarray:
+    """
+    Decode typed array the same way as browser does, see `EncodeArray()`.
+
+    :param column: dictionary with encoded column.
+    :return: numpy array of `float64`.
+    """
+    values = np.frombuffer(base64.b64decode(column["data"]), dtype=np.dtype(column["dtype"]).newbyteorder("<"))
+
+    return column["offset"] + values.astype(np.float64) * column["multiplier"] / column["divisor"]
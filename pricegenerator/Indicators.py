@@ -0,0 +1,482 @@
+# -*- coding: utf-8 -*-
+# Author: Timur Gilmullin
+
+"""
+This module implements a lazy dependency graph of technical analysis indicators used by PriceGenerator.
+
+Every indicator declares its inputs (base OHLCV columns or other indicators), names of parameters it depends on
+and a function to calculate it. Indicators are calculated only when a renderer or a caller asks for them,
+and every intermediate series is calculated only once per prices series. For example, `hma20` depends on
+`wma10` and `wma20` (through `hmaRaw20`), so `wma20` is shared with any other indicator that needs it.
+
+Parametric indicators are resolved by name: `smaN`, `wmaN`, `hmaN` and `vwmaN`, where `N` is the length of an indicator, e.g. `sma5`, `hma13` or `vwma20`.
+
+Custom indicators can be added to the same graph with `RegisterIndicator()` (for all graphs) or `IndicatorGraph.Register()` (for one graph only). Example:
+
+```python
+from pricegenerator.PriceGenerator import PriceGenerator
+
+priceModel = PriceGenerator()
+priceModel.Generate()
+priceModel.RegisterIndicator(name="spread", inputs=["high", "low"], func=lambda high, low: high - low)
+print(priceModel.indicators["spread"])
+```
+"""
+
+# Copyright (c) 2022 Gilmillin Timur Mansurovich
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import re
+from math import sqrt
+from typing import Callable, Optional, Union
+
+import numpy as np
+import pandas as pd
+import pandas_ta as ta
+
+import pricegenerator.UniLogger as uLog
+from pricegenerator.Patterns import ScanPatterns
+
+
+# --- Common technical parameters:
+
+uLogger = uLog.UniLogger
+
+BASE_COLUMNS = ("datetime", "open", "high", "low", "close", "volume")
+"""Columns of prices DataFrame which can be used as inputs of indicators."""
+
+
+class Indicator:
+    """
+    Description of one node in the graph of indicators.
+    """
+
+    def __init__(self, name: str, inputs: list[str], func: Callable, params: Optional[list[str]] = None, description: str = ""):
+        """
+        :param name: unique name of indicator, e.g. `sma5`.
+        :param inputs: list of base columns or names of other indicators, e.g. `["close"]` or `["wma5", "wma10"]`.
+                       Values of inputs are passed to `func` as positional arguments in the same order.
+        :param func: function that calculates indicator, it must return Pandas Series or Pandas DataFrame.
+        :param params: list of graph parameters names (e.g. `["precision"]`), passed to `func` as keyword arguments. `None` by default.
+        :param description: some human-readable description of indicator. Empty by default.
+        """
+        self.name = name
+        """Unique name of indicator."""
+
+        self.inputs = list(inputs)
+        """Base columns or names of other indicators used as inputs."""
+
+        self.func = func
+        """Function to calculate indicator: `func(*inputs, **params)`."""
+
+        self.params = list(params) if params else []
+        """Names of graph parameters used by indicator."""
+
+        self.description = description
+        """Human-readable description of indicator."""
+
+    def __repr__(self):
+        return "Indicator(name={}, inputs={}, params={})".format(self.name, self.inputs, self.params)
+
+
+INDICATORS = {}
+"""Global registry of indicators, shared by all graphs. Use `RegisterIndicator()` to add your own indicator."""
+
+
+def RegisterIndicator(name: str, inputs: list[str], func: Callable, params: Optional[list[str]] = None, description: str = "") -> Indicator:
+    """
+    Register indicator in the global registry, so it will be available in every `IndicatorGraph`.
+
+    :param name: unique name of indicator.
+    :param inputs: list of base columns or names of other indicators.
+    :param func: function that calculates indicator: `func(*inputs, **params)`.
+    :param params: list of graph parameters names used by indicator. `None` by default.
+    :param description: some human-readable description of indicator.
+    :return: registered `Indicator` object.
+    """
+    if name in BASE_COLUMNS:
+        raise Exception("Indicator name [{}] must be differ from base columns: {}".format(name, BASE_COLUMNS))
+
+    INDICATORS[name] = Indicator(name=name, inputs=inputs, func=func, params=params, description=description)
+
+    return INDICATORS[name]
+
+
+def _Wma(values: pd.Series, length: int) -> pd.Series:
+    """Weighted Moving Average with a minimal length 1."""
+    return ta.wma(close=values, length=max(1, length), offset=None)
+
+
+def _ParametricIndicator(name: str) -> Optional[Indicator]:
+    """
+    Creates indicators with a length in name, e.g. `sma5`, `wma10`, `hma20` or `vwma5`.
+
+    Hull Moving Average is decomposed into shared intermediates: `hmaN = WMA(2 * WMA(N / 2) - WMA(N), √N)`.
+
+    :param name: name of indicator.
+    :return: `Indicator` object or `None` if name is unknown.
+    """
+    match = re.fullmatch(r"(sma|wma|hmaRaw|hma|vwma)(\d+)", name)
+    if not match:
+        return None
+
+    kind, length = match.group(1), int(match.group(2))
+
+    if kind == "sma":
+        return Indicator(name, ["close"], lambda close: ta.sma(close=close, length=length, offset=None), description="Simple Moving Average ({})".format(length))
+
+    if kind == "wma":
+        return Indicator(name, ["close"], lambda close: _Wma(close, length), description="Weighted Moving Average ({})".format(length))
+
+    if kind == "hmaRaw":
+        return Indicator(name, ["wma{}".format(int(length / 2)), "wma{}".format(length)], lambda wmaHalf, wmaFull: 2 * wmaHalf - wmaFull, description="Hull MA intermediate ({})".format(length))
+
+    if kind == "hma":
+        return Indicator(name, ["hmaRaw{}".format(length)], lambda raw: _Wma(raw, int(sqrt(length))), description="Hull Moving Average ({})".format(length))
+
+    return Indicator(name, ["close", "volume"], lambda close, volume: ta.vwma(close=close, volume=volume, length=length, offset=None), description="Volume Weighted Moving Average ({})".format(length))
+
+
+def _Bbands(close: pd.Series) -> pd.DataFrame:
+    bbands = ta.bbands(close=close, length=None, std=None, mamode=None, offset=None)
+    bbands.columns = ["lower", "mid", "upper", "bandwidth", "percent"]
+
+    return bbands
+
+
+def _Psar(high: pd.Series, low: pd.Series, close: pd.Series) -> pd.DataFrame:
+    psar = ta.psar(high=high, low=low, close=close, af=0.02, max_af=0.2, offset=None)
+    psar.columns = ["long", "short", "af", "reversal"]
+
+    return psar
+
+
+def ZigZagPivots(high, low, deviations: Union[float, list[float]]) -> dict[float, tuple[np.ndarray, np.ndarray]]:
+    """
+    Zig-Zag indicator with swing-point semantics: pivots are true swing highs and lows, and they always alternate.
+    A swing high is confirmed when a low falls from it by `deviation` (relative), and a swing low is confirmed
+    when a high rises from it by `deviation`. Until confirmation the extreme point of the current leg may move.
+    The last (not confirmed yet) extreme point is included as the last pivot.
+
+    All deviation levels are processed in one sequential pass over plain buffers of high and low prices.
+
+    :param high: high prices: numpy array, Pandas Series or list.
+    :param low: low prices: numpy array, Pandas Series or list.
+    :param deviations: one relative deviation in `[0, 1]` interval or list of them, e.g. `[0.01, 0.03, 0.05]`.
+    :return: dictionary `deviation -> (indices, kinds)`, where `indices` are positions of pivots (numpy array of `int64`)
+             and `kinds` are `1` for swing highs and `-1` for swing lows (numpy array of `int8`).
+    """
+    levels = [deviations] if isinstance(deviations, (int, float)) else list(deviations)
+    highs = np.asarray(high, dtype=np.float64).tolist()  # plain Python lists are the fastest buffers for sequential loop
+    lows = np.asarray(low, dtype=np.float64).tolist()
+    count = len(highs)
+
+    # state of every level: direction of the current leg (0 - unknown, 1 - up, -1 - down), index of leg extreme,
+    # and for unknown direction: indexes of the highest high and the lowest low from the start
+    direction = [0] * len(levels)
+    extreme = [0] * len(levels)
+    maxIndex = [0] * len(levels)
+    minIndex = [0] * len(levels)
+    pivots = [[] for _ in levels]
+    ups = [1 + dev for dev in levels]
+    downs = [1 - dev for dev in levels]
+
+    for i in range(1, count):
+        hi = highs[i]
+        lo = lows[i]
+
+        for k in range(len(levels)):
+            d = direction[k]
+
+            if d == 1:
+                e = extreme[k]
+                if hi > highs[e]:
+                    extreme[k] = i
+
+                elif lo <= highs[e] * downs[k]:
+                    pivots[k].append(e)  # swing high is confirmed
+                    direction[k] = -1
+                    extreme[k] = i
+
+            elif d == -1:
+                e = extreme[k]
+                if lo < lows[e]:
+                    extreme[k] = i
+
+                elif hi >= lows[e] * ups[k]:
+                    pivots[k].append(e)  # swing low is confirmed
+                    direction[k] = 1
+                    extreme[k] = i
+
+            else:
+                if hi > highs[maxIndex[k]]:
+                    maxIndex[k] = i
+
+                if lo < lows[minIndex[k]]:
+                    minIndex[k] = i
+
+                if hi >= lows[minIndex[k]] * ups[k] and minIndex[k] < i:
+                    pivots[k].append(minIndex[k])  # the first pivot is a swing low
+                    direction[k] = 1
+                    extreme[k] = maxIndex[k] if maxIndex[k] > minIndex[k] else i
+
+                elif lo <= highs[maxIndex[k]] * downs[k] and maxIndex[k] < i:
+                    pivots[k].append(maxIndex[k])  # the first pivot is a swing high
+                    direction[k] = -1
+                    extreme[k] = minIndex[k] if minIndex[k] > maxIndex[k] else i
+
+    result = {}
+    for k, dev in enumerate(levels):
+        if count and direction[k] != 0:
+            pivots[k].append(extreme[k])  # the last extreme point, not confirmed yet
+
+        indices = np.array(pivots[k], dtype=np.int64)
+        last = 1 if direction[k] == 1 else -1  # the last pivot is a high for up leg and a low for down leg
+        kinds = np.array([last if (len(indices) - 1 - n) % 2 == 0 else -last for n in range(len(indices))], dtype=np.int8)
+        result[dev] = (indices, kinds)
+
+    return result
+
+
+def _ZigZag(datetime: pd.Series, high: pd.Series, low: pd.Series, zigZagDeviation: float) -> pd.DataFrame:
+    """Zig-Zag points for chart: datetimes and prices of swing highs and lows."""
+    indices, kinds = ZigZagPivots(high, low, zigZagDeviation)[zigZagDeviation]
+    values = np.where(kinds == 1, high.values[indices], low.values[indices])
+
+    return pd.DataFrame(data={"datetimes": datetime.iloc[indices], "filtered": values}, index=datetime.index[indices], columns=["datetimes", "filtered"])
+
+
+# --- Standard indicators used by PriceGenerator statistics and charts:
+
+RegisterIndicator("delta", ["high", "low"], lambda high, low: high - low, description="Deltas between high and low values")
+RegisterIndicator("avg", ["high", "low"], lambda high, low, precision: round((high + low) / 2, precision), params=["precision"], description="Average points (highs - deltas/2)")
+RegisterIndicator("body", ["open", "close"], lambda open_, close: (close - open_).abs(), description="Sizes of candle bodies |close - open|")
+RegisterIndicator("upperShadow", ["open", "high", "close"], lambda open_, high, close: high - np.maximum(open_, close), description="Sizes of upper shadows")
+RegisterIndicator("lowerShadow", ["open", "low", "close"], lambda open_, low, close: np.minimum(open_, close) - low, description="Sizes of lower shadows")
+RegisterIndicator("returns", ["close"], lambda close: np.log(close).diff(), description="Log-returns of close prices")
+RegisterIndicator("up", ["open", "close"], lambda open_, close: close >= open_, description="True mean that is up candle, and False mean down")
+RegisterIndicator("bbands", ["close"], _Bbands, description="Bollinger Bands")
+RegisterIndicator("psar", ["high", "low", "close"], _Psar, description="Parabolic Stop and Reverse")
+RegisterIndicator("alligatorJaw", ["hma13"], lambda hma: hma.shift(8), description="Alligator Jaw (HMA 13 with offset 8)")
+RegisterIndicator("alligatorTeeth", ["hma8"], lambda hma: hma.shift(5), description="Alligator Teeth (HMA 8 with offset 5)")
+RegisterIndicator("alligatorLips", ["hma5"], lambda hma: hma.shift(3), description="Alligator Lips (HMA 5 with offset 3)")
+RegisterIndicator("zigzag", ["datetime", "high", "low"], _ZigZag, params=["zigZagDeviation"], description="Zig-Zag indicator (swing highs and lows)")
+RegisterIndicator("patterns", ["open", "high", "low", "close"], lambda open_, high, low, close: pd.Series(ScanPatterns(open_, high, low, close), index=close.index), description="Bitmasks of candlestick patterns, see `pricegenerator.Patterns`")
+
+
+class IndicatorGraph:
+    """
+    Lazy graph of indicators bound to one prices series. Every indicator is calculated on the first request only,
+    and then it is taken from internal cache together with all its intermediates.
+    """
+
+    def __init__(self, prices: pd.DataFrame, params: Optional[dict] = None, registry: Optional[dict] = None, dtype: Optional[str] = None):
+        """
+        :param prices: Pandas DataFrame with OHLCV-candlesticks. It is never changed by the graph.
+        :param params: dictionary with graph parameters, e.g. `{"precision": 2, "zigZagDeviation": 0.03}`.
+        :param registry: dictionary with additional indicators for this graph only. Global `INDICATORS` are always available.
+        :param dtype: storage type for float values of indicators, e.g. `"float32"` to decrease memory usage twice. `None` by default (means `float64`).
+        """
+        self.prices = prices
+        """Pandas DataFrame with OHLCV-candlesticks used as base inputs."""
+
+        self.dtype = dtype
+        """Storage type for float values of indicators. `None` means that values are stored as calculated (`float64`)."""
+
+        self.params = dict(params) if params else {}
+        """Graph parameters passed to indicators, e.g. `precision` or `zigZagDeviation`."""
+
+        self._registry = dict(registry) if registry else {}
+        self._values = {}  # calculated indicators: name -> Pandas Series or DataFrame
+
+    def __getitem__(self, name: str) -> Union[pd.Series, pd.DataFrame]:
+        return self.Get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return self.Find(name) is not None
+
+    @property
+    def computed(self) -> list[str]:
+        """Names of indicators already calculated and stored in cache."""
+        return list(self._values.keys())
+
+    def Register(self, name: str, inputs: list[str], func: Callable, params: Optional[list[str]] = None, description: str = "") -> Indicator:
+        """
+        Register indicator only for this graph. Parameters are the same as for `RegisterIndicator()`.
+
+        :return: registered `Indicator` object.
+        """
+        if name in BASE_COLUMNS:
+            raise Exception("Indicator name [{}] must be differ from base columns: {}".format(name, BASE_COLUMNS))
+
+        self._registry[name] = Indicator(name=name, inputs=inputs, func=func, params=params, description=description)
+        self.Invalidate(name)
+
+        return self._registry[name]
+
+    def Find(self, name: str) -> Optional[Indicator]:
+        """
+        Find indicator by name: in local registry, then in global registry, then in parametric indicators.
+
+        :param name: name of indicator.
+        :return: `Indicator` object or `None` if it is not found.
+        """
+        return self._registry.get(name) or INDICATORS.get(name) or _ParametricIndicator(name)
+
+    def Dependencies(self, name: str) -> list[str]:
+        """
+        All indicators needed to calculate `name` (including itself) in order of calculation.
+
+        :param name: name of indicator.
+        :return: list of indicator names, base columns are not included.
+        """
+        order = []
+        self._Visit(name, order, [])
+
+        return order
+
+    def _Visit(self, name: str, order: list[str], path: list[str]) -> None:
+        if name in BASE_COLUMNS or name in order:
+            return
+
+        if name in path:
+            raise Exception("Cyclic dependency between indicators: {}".format(" -> ".join(path + [name])))
+
+        indicator = self.Find(name)
+        if indicator is None:
+            raise Exception("Unknown indicator [{}]!".format(name))
+
+        for inputName in indicator.inputs:
+            self._Visit(inputName, order, path + [name])
+
+        order.append(name)
+
+    def Get(self, name: str) -> Union[pd.Series, pd.DataFrame]:
+        """
+        Get indicator by name, calculating it and all its dependencies if they are not in cache yet.
+
+        :param name: name of indicator or base column.
+        :return: Pandas Series or Pandas DataFrame with indicator values.
+        """
+        if name in BASE_COLUMNS:
+            return self.prices[name]
+
+        if name in self._values:  # e.g. restored indicator, its intermediates are not needed
+            return self._values[name]
+
+        for item in self.Dependencies(name):
+            if item not in self._values:
+                indicator = self.Find(item)
+                uLogger.debug("Calculating indicator [{}]...".format(item))
+
+                self._values[item] = self._Compact(indicator.func(
+                    *[self.prices[x] if x in BASE_COLUMNS else self._values[x] for x in indicator.inputs],
+                    **{p: self.params[p] for p in indicator.params},
+                ))
+
+        return self._values[name]
+
+    def _Compact(self, values: Union[pd.Series, pd.DataFrame]) -> Union[pd.Series, pd.DataFrame]:
+        """Convert float values to storage type `dtype` (if it is set)."""
+        if self.dtype is None:
+            return values
+
+        if isinstance(values, pd.DataFrame):
+            floats = values.select_dtypes(include="floating").columns
+
+            return values.astype({column: self.dtype for column in floats}) if len(floats) else values
+
+        return values.astype(self.dtype) if pd.api.types.is_float_dtype(values) else values
+
+    def SetDtype(self, dtype: Optional[str]) -> None:
+        """
+        Change storage type for float values of indicators. Cache is cleared if type was changed.
+
+        :param dtype: e.g. `"float32"` or `None` (means `float64`).
+        """
+        if dtype != self.dtype:
+            self.dtype = dtype
+            self.Invalidate()
+
+    def Frame(self, columns: Optional[list[str]] = None) -> pd.DataFrame:
+        """
+        Build separate Pandas DataFrame with indicators, aligned with index of prices. Base prices DataFrame is not changed.
+        Only requested indicators (and their dependencies) are calculated. Indicators returning DataFrame (e.g. `bbands`)
+        are expanded to several columns with names like `bbands_lower`, datetime columns of them are skipped.
+
+        :param columns: list of indicator names. If `None`, then all already calculated indicators are used.
+        :return: Pandas DataFrame with indicators.
+        """
+        frame = {}
+
+        for name in (self.computed if columns is None else columns):
+            values = self.Get(name)
+
+            if isinstance(values, pd.DataFrame):
+                for column in values.columns:
+                    if not pd.api.types.is_datetime64_any_dtype(values[column]):
+                        frame["{}_{}".format(name, column)] = values[column].reindex(self.prices.index)
+
+            else:
+                frame[name] = values.reindex(self.prices.index)
+
+        return pd.DataFrame(frame, index=self.prices.index)
+
+    def Snapshot(self, customs: bool = False) -> dict:
+        """
+        Copy of calculated indicators, e.g. to persist them on disk.
+
+        :param customs: if `False` (by default), then indicators registered only in this graph are not included.
+        :return: dictionary `name -> values` of calculated indicators.
+        """
+        return {name: values for name, values in self._values.items() if customs or name not in self._registry}
+
+    def Restore(self, values: dict) -> None:
+        """
+        Put previously calculated indicators (see `Snapshot()`) into cache of this graph.
+
+        :param values: dictionary `name -> values` of indicators calculated for the same prices and parameters.
+        """
+        self._values.update(values)
+
+    def SetParams(self, **params) -> None:
+        """
+        Update graph parameters. Only indicators depending on changed parameters (directly or through their inputs) are removed from cache.
+        """
+        changed = [key for key, value in params.items() if key not in self.params or self.params[key] != value]
+        self.params.update(params)
+
+        if changed:
+            for name in self.computed:
+                if name in self._values and any(p in changed for p in self._Params(name)):
+                    self.Invalidate(name)
+
+    def _Params(self, name: str) -> set[str]:
+        """Parameters used by indicator and all its dependencies."""
+        return {p for item in self.Dependencies(name) for p in self.Find(item).params}
+
+    def Invalidate(self, name: Optional[str] = None) -> None:
+        """
+        Remove indicator and all dependent indicators from cache.
+
+        :param name: name of indicator. If `None`, then cache will be fully cleared.
+        """
+        if name is None:
+            self._values = {}
+
+        else:
+            for item in self.computed:
+                if item == name or (item in self._values and name in self.Dependencies(item)):
+                    self._values.pop(item, None)
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+# Author: Timur Gilmullin
+
+"""
+This module shows a live-updating chart of a real-time feed in local Bokeh server application. Chart is built from
+the same layout as `RenderBokeh()`, and then new candles are pushed to the browser with `ColumnDataSource.stream()`:
+only new rows are sent, and the oldest candles are dropped when the count of candles is greater than `rollover`.
+
+Indicators are updated incrementally: for every update they are calculated only for `lookback` last candles,
+not for the whole history. So only the last `max(rollover, lookback)` candles are kept in prices of a feed, and memory
+and time of every update do not grow in a long-lived session.
+
+Example (open http://localhost:5006/ in browser, new candle is generated every second):
+
+```python
+from pricegenerator.PriceGenerator import PriceGenerator
+from pricegenerator.LiveChart import ServeLive
+
+priceModel = PriceGenerator()
+priceModel.Generate()
+ServeLive(priceModel, port=5006, period=1000, indicators=["sma5", "sma20", "bbands"])
+```
+
+Without server (e.g. in tests), `LiveChart.Update()` streams new candles to chart models directly.
+"""
+
+# Copyright (c) 2022 Gilmillin Timur Mansurovich
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from bokeh.application import Application
+from bokeh.application.handlers.function import FunctionHandler
+from bokeh.document import Document
+from bokeh.layouts import gridplot
+from bokeh.models import ColumnDataSource, GlyphRenderer, BooleanFilter, InversionFilter, GroupFilter
+from bokeh.palettes import Category10_10
+from bokeh.server.server import Server
+
+import pricegenerator.UniLogger as uLog
+from pricegenerator.PriceGenerator import PriceGenerator, INDICATOR_LINES
+
+
+# --- Common technical parameters:
+
+uLogger = uLog.UniLogger
+
+
+class LiveChart:
+    """
+    Live-updating Bokeh chart of candles of one `PriceGenerator` object, see `Update()` and `MakeDocument()`.
+    """
+
+    def __init__(
+            self, priceModel: PriceGenerator, rollover: int = 1000, lookback: int = 500, indicators: Optional[list[str]] = None,
+            darkTheme: bool = False, title: Optional[str] = None, width: int = 1800, height: int = 940,
+    ):
+        """
+        :param priceModel: `PriceGenerator` object with generated or loaded prices. New candles are added to its `prices`,
+                           and the oldest candles are removed, so only the last `max(rollover, lookback)` candles are kept.
+        :param rollover: maximal count of candles on chart, the oldest candles are dropped. 1000 by default.
+        :param lookback: count of the last candles used to calculate indicators for new candles. 500 by default.
+                         It must be greater than length of indicators, e.g. 200 for `sma200`.
+        :param indicators: names of indicators to draw as lines, e.g. `["sma5", "hma20", "bbands"]`, see `indicators` graph.
+                           Sparse indicators (e.g. Zig-Zag) are not supported. `["sma5", "sma20"]` by default.
+        :param darkTheme: chart theme. `False` by default, mean that will be used light theme, `True` mean dark theme.
+        :param title: specific chart title. If `None`, then used auto-generated title. `None` by default.
+        :param width: chart width. 1800 px by default.
+        :param height: chart height. 940 px by default.
+        """
+        if priceModel.prices is None or priceModel.prices.empty:
+            raise Exception("Empty price data! Generate or load prices before show as live chart!")
+
+        self.priceModel = priceModel
+        """`PriceGenerator` object, new candles are added to its `prices`."""
+
+        self.rollover = rollover
+        """Maximal count of candles on chart."""
+
+        self.lookback = lookback
+        """Count of the last candles used to calculate indicators for new candles."""
+
+        self.indicators = ["sma5", "sma20"] if indicators is None else indicators
+        """Names of indicators drawn as lines."""
+
+        self.darkTheme = darkTheme
+        """Chart theme: `False` for light theme and `True` for dark theme."""
+
+        self.title = title
+        """Specific chart title or `None` for auto-generated title."""
+
+        self.width = width
+        """Chart width in pixels."""
+
+        self.height = height
+        """Chart height in pixels."""
+
+        self.layout = None
+        """Bokeh gridplot with main and volume charts, see `Layout()`."""
+
+        self.chart = None
+        """Main chart with candles and indicators."""
+
+        self.volumeChart = None
+        """Chart with volumes."""
+
+        self.source = None
+        """Data source shared by all glyphs of chart, new candles are streamed into it."""
+
+        self.candles = len(priceModel.prices)
+        """Count of candles in the whole chain, including the oldest candles removed from `priceModel`."""
+
+    def _IndicatorColumns(self, window: PriceGenerator) -> dict[str, np.ndarray]:
+        """
+        Values of indicators for all candles of `window`, multi-column indicators are expanded to columns like `bbands_lower`.
+
+        :param window: `PriceGenerator` object with the last candles, see `PriceGenerator.Window()`.
+        :return: dictionary: column name -> values.
+        """
+        columns = {}
+
+        for name in self.indicators:
+            values = window.indicators[name]
+
+            if isinstance(values, pd.DataFrame):
+                if "datetimes" in values.columns:
+                    uLogger.warning("Sparse indicator [{}] is not supported on live chart!".format(name))
+                    continue
+
+                for column in INDICATOR_LINES.get(name, values.columns):
+                    columns["{}_{}".format(name, column)] = values[column].values.astype(np.float64)
+
+            else:
+                columns[name] = values.values.astype(np.float64)
+
+        return columns
+
+    def _UpdateRanges(self) -> None:
+        """Fit ranges of prices and volumes to candles on chart."""
+        self.chart.y_range.update(start=float(np.min(self.source.data["low"])) - 3, end=float(np.max(self.source.data["high"])) + 3)
+
+        maxVolume = max(float(np.max(self.source.data["volume"])), 1)
+        self.volumeChart.y_range.update(end=maxVolume, bounds=(0, maxVolume))
+
+    def Layout(self) -> gridplot:
+        """
+        Build chart with the last `rollover` candles: layout is rendered by `RenderBokeh()`, and then up and down candles are selected
+        by `direction` column of data source (not by static filters), so new candles can be streamed to all glyphs.
+
+        :return: bokeh.layouts.gridplot with main and volume charts.
+        """
+        window = self.priceModel.Window(-self.rollover)
+        first = self.candles - len(window.prices)
+
+        self.layout = window.RenderBokeh(
+            fileName=None, darkTheme=self.darkTheme, title=self.title, width=self.width, height=self.height,
+            showStatOnChart=False, maxCandles=0,  # one row of data source for every candle
+        )
+        self.chart, self.volumeChart = [child[0] for child in self.layout.children]
+        self.source = next(source for source in self.layout.select({"type": ColumnDataSource}) if "candle" in source.data)
+
+        self.source.data["candle"] = np.arange(first, first + len(window.prices))  # numbers of candles in the whole chain
+        self.source.data["direction"] = np.where(window.prices.open.values <= window.prices.close.values, "inc", "dec")
+
+        for renderer in self.layout.select({"type": GlyphRenderer}):
+            if isinstance(renderer.view.filter, BooleanFilter):
+                renderer.view.filter = GroupFilter(column_name="direction", group="inc")
+
+            elif isinstance(renderer.view.filter, InversionFilter):
+                renderer.view.filter = GroupFilter(column_name="direction", group="dec")
+
+        for number, (column, values) in enumerate(self._IndicatorColumns(window).items()):
+            self.source.data[column] = values
+            self.chart.line(
+                x="datetime", y=column, source=self.source,
+                line_width=2, line_color=Category10_10[number % len(Category10_10)], line_alpha=1, legend_label=column,
+            )
+
+        self._UpdateRanges()
+
+        return self.layout
+
+    def Update(self, horizon: int = 1, candles: Optional[pd.DataFrame] = None) -> dict:
+        """
+        Add new candles to `priceModel` (see `PriceGenerator.Extend()`) and stream them to chart with indicators calculated
+        for `lookback` last candles. Only new rows are sent to browser. Then the oldest candles are removed from `priceModel`,
+        only the last `max(rollover, lookback)` candles are kept.
+
+        :param horizon: count of new candles to generate. `1` by default. Not used if `candles` are given.
+        :param candles: Pandas DataFrame with new OHLCV-candlesticks, e.g. received from a real feed. `None` by default, mean that new candles will be generated.
+        :return: dictionary with streamed columns.
+        """
+        if self.layout is None:
+            self.Layout()
+
+        newCandles = self.priceModel.Extend(horizon=horizon, candles=candles)
+        count = len(newCandles)
+        first = self.candles
+        self.candles += count
+
+        data = {
+            "candle": np.arange(first, first + count),
+            "datetime": newCandles.datetime.values,
+            "open": newCandles.open.values,
+            "high": newCandles.high.values,
+            "low": newCandles.low.values,
+            "close": newCandles.close.values,
+            "volume": newCandles.volume.values,
+            "direction": np.where(newCandles.open.values <= newCandles.close.values, "inc", "dec"),
+        }
+        window = self.priceModel.Window(-(self.lookback + count))
+        data.update({column: values[-count:] for column, values in self._IndicatorColumns(window).items()})
+        data = {column: values.astype(self.source.data[column].dtype) if values.dtype.kind in "iuf" else values for column, values in data.items()}  # the same typed arrays in browser
+
+        self.source.stream(data, rollover=self.rollover)
+        self._UpdateRanges()
+
+        keep = max(self.rollover, self.lookback)  # enough for indicators of the next candles
+        if len(self.priceModel.prices) > keep:
+            self.priceModel.prices = self.priceModel.prices.iloc[-keep:].reset_index(drop=True)
+            self.priceModel.horizon = keep
+
+        return data
+
+    def MakeDocument(self, doc: Document, period: int = 1000) -> Document:
+        """
+        Add chart to Bokeh document of server session and schedule generating of new candles.
+
+        :param doc: Bokeh document, e.g. `curdoc()` or document of new session created by Bokeh server.
+        :param period: period of new candles in milliseconds. If `0`, then candles are added only by `Update()` calls. 1000 ms by default.
+        :return: the same Bokeh document.
+        """
+        doc.add_root(self.Layout() if self.layout is None else self.layout)
+        doc.title = self.chart.title.text
+
+        if period:
+            doc.add_periodic_callback(self.Update, period)
+
+        return doc
+
+
+def ServeLive(priceModel: PriceGenerator, port: int = 5006, period: int = 1000, show: bool = True, block: bool = True, **chartArgs) -> Server:
+    """
+    Start local Bokeh server with live-updating chart. Every browser session gets its own chart and its own copy of feed
+    (see `PriceGenerator.Window()`), so sessions do not add candles to each other.
+
+    :param priceModel: `PriceGenerator` object with generated or loaded prices.
+    :param port: local port of server. 5006 by default.
+    :param period: period of new candles in milliseconds. 1000 ms by default.
+    :param show: if `True` (by default), then chart is opened in browser.
+    :param block: if `True` (by default), then server is running until process is stopped. If `False`, then started server is returned immediately.
+    :param chartArgs: parameters of `LiveChart()`, e.g. `rollover=500` or `indicators=["sma5", "bbands"]`.
+    :return: `bokeh.server.server.Server` object.
+    """
+    if priceModel.prices is None or priceModel.prices.empty:
+        raise Exception("Empty price data! Generate or load prices before show as live chart!")
+
+    def Session(doc: Document) -> None:
+        LiveChart(priceModel.Window(), **chartArgs).MakeDocument(doc, period=period)
+
+    server = Server({"/": Application(FunctionHandler(Session))}, port=port)
+    server.start()
+    uLogger.info("Live chart is served on http://localhost:{}/".format(server.port))
+
+    if show:
+        server.io_loop.add_callback(server.show, "/")
+
+    if block:
+        server.io_loop.start()
+
+    return server
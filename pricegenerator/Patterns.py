@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+# Author: Timur Gilmullin
+
+"""
+This module detects candlestick patterns in OHLC-candles: doji, hammer, bullish and bearish engulfing, bullish and bearish harami,
+morning and evening stars, gaps up and down. All patterns are detected with boolean algebra on shifted numpy arrays,
+without Python loops, and stored as compact bitmask (one `uint16` value per candle, one bit per pattern, see `PATTERNS`).
+
+A pattern is marked on its last candle, e.g. bullish engulfing is marked on the engulfing candle, and morning star is marked on the third candle.
+
+Example:
+
+```python
+from pricegenerator.PriceGenerator import PriceGenerator
+from pricegenerator.Patterns import PatternCounts
+
+priceModel = PriceGenerator()
+priceModel.Generate()
+
+mask = priceModel.indicators["patterns"]  # bitmask, calculated on demand
+print(PatternCounts(mask))  # e.g. {"doji": 12, "hammer": 3, ...}
+
+priceModel.RenderBokeh(fileName="index.html", viewInBrowser=True, markers=priceModel.GetPatternMarkers())
+```
+"""
+
+# Copyright (c) 2022 Gilmillin Timur Mansurovich
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import numpy as np
+import pandas as pd
+
+
+PATTERNS = {
+    "doji": {"bit": 1 << 0, "symbol": "+", "position": "markersCenter"},
+    "hammer": {"bit": 1 << 1, "symbol": "H", "position": "markersLower"},
+    "bullishEngulfing": {"bit": 1 << 2, "symbol": "E", "position": "markersLower"},
+    "bearishEngulfing": {"bit": 1 << 3, "symbol": "E", "position": "markersUpper"},
+    "bullishHarami": {"bit": 1 << 4, "symbol": "h", "position": "markersLower"},
+    "bearishHarami": {"bit": 1 << 5, "symbol": "h", "position": "markersUpper"},
+    "morningStar": {"bit": 1 << 6, "symbol": "☆", "position": "markersLower"},
+    "eveningStar": {"bit": 1 << 7, "symbol": "☆", "position": "markersUpper"},
+    "gapUp": {"bit": 1 << 8, "symbol": "↑", "position": "markersLower"},
+    "gapDown": {"bit": 1 << 9, "symbol": "↓", "position": "markersUpper"},
+}
+"""Candlestick patterns: name -> bit in bitmask, symbol for chart markers and position of marker (see `markers` in `RenderBokeh()`).
+Bullish patterns are marked below candles and bearish patterns above candles."""
+
+CHUNK_SIZE = 1 << 14
+"""Count of candles scanned at once. Temporary arrays of this size fit in CPU cache."""
+
+
+def ScanPatterns(open, high, low, close, dojiBody: float = 0.1, starBody: float = 0.3) -> np.ndarray:
+    """
+    Detect candlestick patterns in all candles at once.
+
+    - Doji: body is not greater than `dojiBody` part of candle range `high - low`.
+    - Hammer: not doji, lower shadow is at least twice as large as body, and upper shadow is not greater than body.
+    - Engulfing: body of current candle covers body of previous candle with opposite direction.
+    - Harami: body of current candle is inside body of previous candle with opposite direction.
+    - Morning (evening) star: long down (up) candle, then small candle (body not greater than `starBody` part of the first body)
+      below (above) the first close, then up (down) candle closing above (below) the middle of the first body.
+    - Gap up (down): low of current candle is greater than high of previous candle (high is less than previous low).
+
+    :param open: open prices: numpy array, Pandas Series or list.
+    :param high: high prices.
+    :param low: low prices.
+    :param close: close prices.
+    :param dojiBody: maximal relative size of doji body. Default: `0.1`.
+    :param starBody: maximal size of star body relative to the first candle body. Default: `0.3`.
+    :return: numpy array of `uint16` bitmasks, see `PATTERNS`.
+    """
+    o = np.asarray(open, dtype=np.float64)
+    h = np.asarray(high, dtype=np.float64)
+    lo = np.asarray(low, dtype=np.float64)
+    c = np.asarray(close, dtype=np.float64)
+    mask = np.zeros(len(c), dtype=np.uint16)
+
+    # candles are scanned by chunks, so temporary arrays stay in CPU cache; every chunk also contains two previous candles
+    for start in range(0, len(c), CHUNK_SIZE):
+        first = max(0, start - 2)
+        end = min(len(c), start + CHUNK_SIZE)
+        mask[start:end] = _ScanChunk(o[first:end], h[first:end], lo[first:end], c[first:end], dojiBody, starBody)[start - first:]
+
+    return mask
+
+
+def _ScanChunk(o: np.ndarray, h: np.ndarray, lo: np.ndarray, c: np.ndarray, dojiBody: float, starBody: float) -> np.ndarray:
+    """Bitmasks of candlestick patterns for one chunk of candles, see `ScanPatterns()`."""
+    mask = np.zeros(len(c), dtype=np.uint16)
+    body = np.abs(c - o)
+    top = np.maximum(o, c)
+    bottom = np.minimum(o, c)
+    up = c > o
+    down = c < o
+
+    doji = body <= dojiBody * (h - lo)
+    _Mark(mask, doji, "doji")
+    _Mark(mask, ~doji & (bottom - lo >= 2 * body) & (h - top <= body), "hammer")
+
+    # patterns of two candles: previous candle is [:-1] and current candle is [1:]
+    higherTop = top[1:] >= top[:-1]
+    lowerTop = top[1:] <= top[:-1]
+    lowerBottom = bottom[1:] <= bottom[:-1]
+    higherBottom = bottom[1:] >= bottom[:-1]
+    covers = higherTop & lowerBottom & ~(lowerTop & higherBottom)  # body covers previous body and it is bigger
+    inside = lowerTop & higherBottom & ~(higherTop & lowerBottom)  # body is inside previous body and it is smaller
+    _Mark(mask[1:], down[:-1] & up[1:] & covers, "bullishEngulfing")
+    _Mark(mask[1:], up[:-1] & down[1:] & covers, "bearishEngulfing")
+    _Mark(mask[1:], down[:-1] & up[1:] & inside, "bullishHarami")
+    _Mark(mask[1:], up[:-1] & down[1:] & inside, "bearishHarami")
+    _Mark(mask[1:], lo[1:] > h[:-1], "gapUp")
+    _Mark(mask[1:], h[1:] < lo[:-1], "gapDown")
+
+    # patterns of three candles: the first candle is [:-2], the star is [1:-1] and the last candle is [2:]
+    small = body[1:-1] <= starBody * body[:-2]
+    middle = (o[:-2] + c[:-2]) / 2
+    _Mark(mask[2:], down[:-2] & small & (top[1:-1] <= c[:-2]) & up[2:] & (c[2:] >= middle), "morningStar")
+    _Mark(mask[2:], up[:-2] & small & (bottom[1:-1] >= c[:-2]) & down[2:] & (c[2:] <= middle), "eveningStar")
+
+    return mask
+
+
+def ScanLastCandle(candles, dojiBody: float = 0.1, starBody: float = 0.3) -> int:
+    """
+    Detect candlestick patterns ending on the last candle with scalar comparisons only, e.g. for online statistics updated
+    after every new candle. Rules are the same as in `ScanPatterns()`.
+
+    :param candles: sequence of one to three the last candles, every candle is tuple `(open, high, low, close)`.
+    :param dojiBody: maximal relative size of doji body. Default: `0.1`.
+    :param starBody: maximal size of star body relative to the first candle body. Default: `0.3`.
+    :return: bitmask of patterns of the last candle, see `PATTERNS`.
+    """
+    o, h, lo, c = candles[-1]
+    body = abs(c - o)
+    top, bottom = max(o, c), min(o, c)
+    mask = 0
+
+    if body <= dojiBody * (h - lo):
+        mask |= PATTERNS["doji"]["bit"]
+
+    elif bottom - lo >= 2 * body and h - top <= body:
+        mask |= PATTERNS["hammer"]["bit"]
+
+    if len(candles) >= 2:
+        o1, h1, lo1, c1 = candles[-2]
+        top1, bottom1 = max(o1, c1), min(o1, c1)
+        higherTop, lowerTop = top >= top1, top <= top1
+        lowerBottom, higherBottom = bottom <= bottom1, bottom >= bottom1
+        covers = higherTop and lowerBottom and not (lowerTop and higherBottom)
+        inside = lowerTop and higherBottom and not (higherTop and lowerBottom)
+        bullish = c1 < o1 and c > o
+        bearish = c1 > o1 and c < o
+
+        if bullish and covers:
+            mask |= PATTERNS["bullishEngulfing"]["bit"]
+
+        if bearish and covers:
+            mask |= PATTERNS["bearishEngulfing"]["bit"]
+
+        if bullish and inside:
+            mask |= PATTERNS["bullishHarami"]["bit"]
+
+        if bearish and inside:
+            mask |= PATTERNS["bearishHarami"]["bit"]
+
+        if lo > h1:
+            mask |= PATTERNS["gapUp"]["bit"]
+
+        if h < lo1:
+            mask |= PATTERNS["gapDown"]["bit"]
+
+    if len(candles) >= 3:
+        o2, _, _, c2 = candles[-3]
+        o1, _, _, c1 = candles[-2]
+        small = abs(c1 - o1) <= starBody * abs(c2 - o2)
+        middle = (o2 + c2) / 2
+
+        if c2 < o2 and small and max(o1, c1) <= c2 and c > o and c >= middle:
+            mask |= PATTERNS["morningStar"]["bit"]
+
+        if c2 > o2 and small and min(o1, c1) >= c2 and c < o and c <= middle:
+            mask |= PATTERNS["eveningStar"]["bit"]
+
+    return mask
+
+
+def _Mark(mask: np.ndarray, found: np.ndarray, name: str) -> None:
+    """Set bit of pattern in bitmasks of candles where pattern is found, in place."""
+    np.bitwise_or(mask, found.view(np.uint8) * np.uint16(PATTERNS[name]["bit"]), out=mask)
+
+
+def PatternCounts(mask) -> dict[str, int]:
+    """
+    Counts of every candlestick pattern in bitmasks.
+
+    :param mask: numpy array or Pandas Series of bitmasks, see `ScanPatterns()`.
+    :return: dictionary: pattern name -> count of candles with this pattern.
+    """
+    mask = np.asarray(mask, dtype=np.uint16)
+
+    return {name: int(np.count_nonzero(mask & np.uint16(pattern["bit"]))) for name, pattern in PATTERNS.items()}
+
+
+def PatternCountsByRows(open, high, low, close) -> dict[str, np.ndarray]:
+    """
+    Counts of every candlestick pattern in every row of 2D arrays `paths × horizon` (e.g. Monte Carlo paths). All rows are
+    scanned at once as one long series, then patterns crossing borders of rows are removed.
+
+    :param open: 2D array of open prices, one row per path.
+    :param high: 2D array of high prices.
+    :param low: 2D array of low prices.
+    :param close: 2D array of close prices.
+    :return: dictionary: pattern name -> numpy array of counts, one count per row.
+    """
+    shape = np.shape(close)
+    mask = ScanPatterns(*[np.ravel(values) for values in [open, high, low, close]]).reshape(shape)
+
+    oneCandle = np.uint16(PATTERNS["doji"]["bit"] | PATTERNS["hammer"]["bit"])
+    threeCandles = np.uint16(PATTERNS["morningStar"]["bit"] | PATTERNS["eveningStar"]["bit"])
+    mask[:, 0] &= oneCandle  # the first candle of every row has no previous candles
+    if shape[1] > 1:
+        mask[:, 1] &= ~threeCandles  # the second candle of every row has only one previous candle
+
+    return {name: np.count_nonzero(mask & np.uint16(pattern["bit"]), axis=1) for name, pattern in PATTERNS.items()}
+
+
+def PatternMarkers(datetime, mask) -> pd.DataFrame:
+    """
+    Markers of candlestick patterns for `markers` parameter of `RenderBokeh()`: symbols of bullish patterns are placed below
+    candles, bearish patterns above candles and doji in the center of candles, see `PATTERNS`.
+
+    :param datetime: datetimes of candles.
+    :param mask: numpy array or Pandas Series of bitmasks, see `ScanPatterns()`.
+    :return: Pandas DataFrame with `datetime`, `markersUpper`, `markersCenter` and `markersLower` columns.
+    """
+    mask = np.asarray(mask, dtype=np.uint16)
+    markers = {"datetime": np.asarray(datetime)}
+
+    for position in ["markersUpper", "markersCenter", "markersLower"]:
+        text = np.full(len(mask), "", dtype=object)
+        for pattern in PATTERNS.values():
+            if pattern["position"] == position:
+                found = (mask & np.uint16(pattern["bit"])) > 0
+                text[found] += pattern["symbol"]
+
+        markers[position] = text
+
+    return pd.DataFrame(markers)
@@ -30,7 +30,12 @@ Sample example:
 
 import os
 import sys
-from typing import Optional, Union
+import hashlib
+import pickle
+import time
+from copy import copy, deepcopy
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional, Union
 from datetime import datetime, timedelta
 
 import numpy as np
@@ -38,19 +43,27 @@ from dateutil.tz import tzlocal
 from argparse import ArgumentParser
 
 from math import pi
-from statistics import mode, pstdev, StatisticsError
-from itertools import groupby
 import pandas as pd
-import pandas_ta as ta
 import random
 from bokeh.plotting import figure, save, output_file, ColumnDataSource
-from bokeh.models import Legend, HoverTool, Range1d, NumeralTickFormatter
+from bokeh.models import Legend, HoverTool, Range1d, NumeralTickFormatter, BooleanFilter, CDSView
 from bokeh.layouts import gridplot
+from bokeh.transform import dodge
 from bokeh.io import output_notebook, show
 from bokeh.resources import INLINE
-import jinja2
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection, PolyCollection
 
 import pricegenerator.UniLogger as uLog
+from pricegenerator.Indicators import IndicatorGraph, Indicator
+from pricegenerator.Patterns import PatternCounts, PatternMarkers
+from pricegenerator.Downsampling import OHLCVBuckets, LTTB, WEBGL_THRESHOLD
+from pricegenerator.Encoding import CompactArray, EncodeCandles
+from pricegenerator.Templates import GetTemplate, TemplateVariables
+from pricegenerator.Validation import ValidateOHLCV, RepairOHLCV, BrokenCandles, INVARIANTS, REPAIR_METHODS
+from pricegenerator.Similarity import SeriesFeatures, CompareFeatures, ComparisonMarkdown
+from pricegenerator.Statistics import Trend, TimeIndex, SummaryMarkdown, OnlineStatistics, DetectPrecision, ChainStatistics, DistributionSummary, RollingStatistics, BatchStatistics, PanelStatistics, PanelMarkdown, DEFAULT_QUANTILES
 import traceback as tb
 
 
@@ -61,6 +74,10 @@ uLogger.level = 10  # debug level by default
 uLogger.handlers[0].level = 20  # info level by default for STDOUT
 # uLogger.handlers[1].level = 10  # debug level by default for log.txt
 
+STAT_CACHE_FORMAT = 2
+"""Format of statistics cache, it is a part of cache keys. Increase it every time when layout of `stat`, summary or snapshot of indicators is changed,
+so cache files written by older versions are not used."""
+
 # Simple internal jinja2 template for rendering static html-page with Google Candlestick chart. `GOOGLE_TEMPLATE_J2` may use with `j2template` variable.
 GOOGLE_TEMPLATE_J2 = """{# This template based on Jinja markup language: https://jinja.palletsprojects.com/en/latest/ #}
 <!DOCTYPE html>
@@ -152,11 +169,24 @@ GOOGLE_TEMPLATE_J2 = """{# This template based on Jinja markup language: https:/
             chart.draw(data, chartOptions);
         }
     }
+    function decodeColumn(column) {
+        // column is base64 of little-endian typed array, value = offset + data[i] * multiplier / divisor
+        var bytes = Uint8Array.from(atob(column.data), function (c) { return c.charCodeAt(0); });
+        var values = new {"int32": Int32Array, "float32": Float32Array, "float64": Float64Array}[column.dtype](bytes.buffer);
+        return Array.from(values, function (x) { return column.offset + x * column.multiplier / column.divisor; });
+    }
+    function decodeCandles(columns) {
+        var low = decodeColumn(columns.low), open = decodeColumn(columns.open), close = decodeColumn(columns.close), high = decodeColumn(columns.high);
+        return decodeColumn(columns.datetime).map(function (ms, i) {
+            return [new Date(ms).toISOString().slice(0, 19).replace("T", " "), low[i], open[i], close[i], high[i]];
+        });
+    }
+    var candlesColumns = {{ candlesColumns }};
     </script>
 </head>
 
 
-<body onload="drawChartCandlesticks({{ candlesData }})">
+<body onload="drawChartCandlesticks(decodeCandles(candlesColumns))">
 
 
 <!-- Preloader -->
@@ -209,6 +239,49 @@ GOOGLE_TEMPLATE_J2 = """{# This template based on Jinja markup language: https:/
 </html>
 """
 
+# Simple internal jinja2 template for index page of charts rendered by `RenderBatch()`.
+INDEX_TEMPLATE_J2 = """<!DOCTYPE html>
+<html>
+<head>
+    <title>{{ title }}</title>
+    <meta charset="utf-8">
+    <style type="text/css">
+    body { font-family: "Segoe UI", "Frutiger", "Frutiger Linotype", "Dejavu Sans", "Helvetica Neue", "Arial", sans-serif; font-size: 14px; }
+    li { padding: 2px; }
+    </style>
+</head>
+<body>
+<h3>{{ title }}</h3>
+<ol>
+{% for chart in charts %}    <li><a href="{{ chart.link }}">{{ chart.name }}</a></li>
+{% endfor %}</ol>
+{% if failed %}<h4>Not rendered: {{ failed | length }}</h4>
+<ul>
+{% for chart in failed %}    <li>{{ chart.name }}: {{ chart.error }}</li>
+{% endfor %}</ul>
+{% endif %}<p>Generated by <a href="https://github.com/Tim55667757/PriceGenerator">PriceGenerator</a></p>
+</body>
+</html>
+"""
+
+INDICATOR_LINES = {"bbands": ["lower", "mid", "upper"], "psar": ["long", "short"]}
+"""Columns of multi-column indicators drawn as lines on price charts, other columns (e.g. Bollinger bandwidth) have another scale."""
+
+RENDER_KINDS = ["bokeh", "google", "png"]
+"""Kinds of charts rendered by `RenderBatch()`: `RenderBokeh()`, `RenderGoogle()` or `RenderImage()` to PNG-files."""
+
+MARKER_COLUMNS = ["markersUpper", "markersCenter", "markersLower"]
+"""Columns of `markers` for `RenderBokeh()`: symbols placed above, in the center or below candles."""
+
+CHART_INDICATORS = [
+    "avg", "sma5", "sma20", "sma50", "sma200", "hma5", "hma20", "vwma5", "vwma20", "bbands", "psar",
+    "alligatorJaw", "alligatorTeeth", "alligatorLips", "zigzag",
+]
+"""Indicators drawn by `RenderBokeh()` with statistics on chart."""
+
+PAGE_PERIODS = {"year": "Y", "month": "M", "week": "W", "day": "D"}
+"""Periods of pages for `RenderPages()` and their Pandas codes."""
+
 
 class PriceGenerator:
     """
@@ -237,6 +310,9 @@ class PriceGenerator:
         self.j2model = None
         """Dictionary of variables for jinja2 template. If `None` then used default variables for internal `GOOGLE_TEMPLATE_J2`"""
 
+        self.j2cacheDir = None
+        """Directory to save compiled jinja2 templates as bytecode, so next runs skip compilation. Default: `None`, mean that templates are cached only in memory, see `Templates` module."""
+
         self._precision = 2
         """Signs after comma. Default: `2`."""
 
@@ -294,6 +370,9 @@ class PriceGenerator:
         self._zigZagDeviation = 0.03
         """Relative deviation to detection next points used by Zig-Zag indicator. Default: `0.03` (means 3% of price deviation)."""
 
+        self.deltaQuantiles = list(DEFAULT_QUANTILES)
+        """Quantiles of deltas `|high - low|` calculated in statistics. Default: `[0.99, 0.95, 0.80, 0.50]`."""
+
         self._stat = {
             "candles": 0,  # generated candlesticks count
             "precision": 2,  # generated candlesticks count
@@ -308,6 +387,8 @@ class PriceGenerator:
             "downCount": 0,  # count of down candles
             "upCountChainMax": 0,  # max chain count of up candles
             "downCountChainMax": 0,  # max chain count of down candles
+            "upChains": {},  # distribution of up candle chains: length -> count of chains
+            "downChains": {},  # distribution of down candle chains: length -> count of chains
             "deltas": {
                 "max": 0.,  # delta max = max(close_prices)
                 "min": 0.,  # delta min = min(close_prices)
@@ -316,11 +397,55 @@ class PriceGenerator:
                 "q95": 0.,  # 95 percentile
                 "q80": 0.,  # 80 percentile
                 "q50": 0.,  # 50 percentile
+                "mean": 0.,  # mean of deltas
+                "skew": 0.,  # skewness of deltas
+                "kurtosis": 0.,  # excess kurtosis of deltas
             },
-            "cumSumVolumes": 0  # cumulative sum of volumes
+            "cumSumVolumes": 0,  # cumulative sum of volumes
+            "patterns": {},  # counts of candlestick patterns: name -> count, see `pricegenerator.Patterns`
         }
         """Some statistics available after candles loaded or generated."""
 
+        self._indicators = None
+        """Lazy graph of indicators bound to current `prices`. Use `indicators` property to get it."""
+
+        self._customIndicators = {}
+        """Custom indicators registered for this instance with `RegisterIndicator()`."""
+
+        self.indicatorsDtype = None
+        """Storage type for float values of indicators, e.g. `"float32"` to halve memory used by indicators on long series. Default: `None` (means `float64`)."""
+
+        self.statCacheDir = None
+        """Directory to persist statistics and indicators between runs, so repeated renders of the same prices skip calculations. Default: `None` (means that only memory cache is used)."""
+
+        self.validation = None
+        """Opt-in validation of OHLCV-candles after every loading or generating: `"report"` (only log broken candles) or repair method
+        `"clip"`, `"drop"` or `"ffill"` (see `pricegenerator.Validation`). Default: `None` (means that candles are not validated)."""
+
+        self._statCache = {}
+        """Memory cache of statistics: key (see `_StatCacheKey()`) -> dictionary with summary, `stat`, chart title and precision."""
+
+        self._statFingerprint = None
+        """Fingerprint of prices used by the current graph of indicators."""
+
+        self._statKeys = []
+        """Keys of current statistics in `_statCache`: the same statistics are stored with keys before and after precision detection."""
+
+        self._statDumped = {}
+        """Statistics already saved to `statCacheDir`: key -> names of indicators saved together with them. New statistics are not here until they are saved."""
+
+        self._onlineStat = None
+        """Online statistics accumulator. Use `onlineStat` property to get it."""
+
+        self._precisionFingerprint = None
+        """Fingerprint of prices for which precision was already detected, e.g. at load time."""
+
+        self._timeIndex = None
+        """Time index of candles: tuple of fingerprint of prices and index, see `timeIndex` property."""
+
+        self._similarityFeatures = None
+        """Cached features of prices for `CompareDistributions()`: tuple of fingerprint, maximum lag and features."""
+
     @property
     def upCandlesProb(self):
         """Probability that next candle is up. Default: `0.5` (means 50% of probability)."""
@@ -387,6 +512,74 @@ class PriceGenerator:
         """Some statistics available after candles loaded or generated."""
         return self._stat
 
+    @property
+    def onlineStat(self) -> OnlineStatistics:
+        """
+        Online statistics of candles chain with O(1) updates per new candle. On the first request it is built from all `prices`,
+        and then it is updated incrementally by `Extend()`. Use `onlineStat.stat` and `onlineStat.Summary()`
+        to get the same statistics as `stat` and `GetStatistics()` at any point (percentiles are streaming estimations).
+        """
+        if self._onlineStat is None:
+            self._onlineStat = OnlineStatistics(trendDeviation=self.trendDeviation, precision=self.precision, quantiles=self.deltaQuantiles)
+
+            if self.prices is not None and not self.prices.empty:
+                self._onlineStat.UpdateMany(self.prices)
+
+        return self._onlineStat
+
+    @property
+    def indicators(self) -> IndicatorGraph:
+        """
+        Lazy graph of indicators for current `prices`, e.g. `indicators["sma5"]`, `indicators["hma20"]` or `indicators["bbands"]`.
+        Indicators are calculated only on the first request and every shared intermediate is calculated once per prices series.
+        Indicators are stored separately from `prices`, so the base OHLCV DataFrame stays lean and unchanged.
+        See also: `pricegenerator.Indicators` module and `GetIndicators()` method.
+        """
+        if self._indicators is None or self._indicators.prices is not self.prices:
+            self._indicators = IndicatorGraph(prices=self.prices, registry=self._customIndicators, dtype=self.indicatorsDtype)
+
+        self._indicators.SetDtype(self.indicatorsDtype)
+        self._indicators.SetParams(precision=self._precision, zigZagDeviation=self._zigZagDeviation)
+
+        return self._indicators
+
+    def GetIndicators(self, columns: Optional[list[str]] = None) -> pd.DataFrame:
+        """
+        Build separate Pandas DataFrame with indicators aligned with `prices`, `prices` itself is not changed.
+        Only requested indicators are calculated, their float values are stored with `indicatorsDtype` type (e.g. `"float32"`).
+
+        Example: `GetIndicators(["delta", "avg", "sma5", "hma20", "bbands"])`.
+
+        :param columns: list of indicator names. If `None`, then all already calculated indicators are used.
+        :return: Pandas DataFrame with indicators.
+        """
+        if self.prices is None or self.prices.empty:
+            raise Exception("Empty price data! Generate or load prices before calculating indicators!")
+
+        return self.indicators.Frame(columns)
+
+    def RegisterIndicator(self, name: str, inputs: list[str], func: Callable, params: Optional[list[str]] = None, description: str = "") -> Indicator:
+        """
+        Register custom indicator in the graph of indicators of this instance. Custom indicator can use base columns
+        (`datetime`, `open`, `high`, `low`, `close`, `volume`) and any other indicator as inputs.
+
+        Example: `RegisterIndicator(name="spread", inputs=["high", "low"], func=lambda high, low: high - low)`.
+
+        :param name: unique name of indicator.
+        :param inputs: list of base columns or names of other indicators, passed to `func` as positional arguments.
+        :param func: function that calculates indicator, it must return Pandas Series or Pandas DataFrame.
+        :param params: list of graph parameters names (`precision`, `zigZagDeviation`), passed to `func` as keyword arguments. `None` by default.
+        :param description: some human-readable description of indicator.
+        :return: registered `Indicator` object.
+        """
+        indicator = Indicator(name=name, inputs=inputs, func=func, params=params, description=description)
+        self._customIndicators[name] = indicator
+
+        if self._indicators is not None:
+            self._indicators.Register(name=name, inputs=inputs, func=func, params=params, description=description)
+
+        return indicator
+
     @property
     def precision(self):
         """Signs after comma."""
@@ -438,23 +631,14 @@ class PriceGenerator:
         Auto-detect precision from example values. E.g. `0.123 -> 3`, `0.12345 -> 5` and so on.
         This method change `precision` variable after detect precision.
 
-        See also about statistics.mode: https://docs.python.org/3.9/library/statistics.html#statistics.mode
-        Changed in Python version >= 3.8: Now mode() method handles multimodal datasets by returning the first mode encountered.
-        Previously, it raised StatisticsError when more than one mode was found.
+        Precision is the most common count of signs after comma (the first encountered one if there are several).
+        Detection is vectorized and uses sampling on huge inputs, see `pricegenerator.Statistics.DetectPrecision()`.
 
         :param examples: chain with examples of float values.
         """
         uLogger.debug("Detecting precision of data values...")
-        precision = 0
-        try:
-            precision = mode(list(map(lambda x: len(str(x).split('.')[-1]) if len(str(x).split('.')) > 1 else 0, examples))) if self.precision >= 0 else 0
-
-        except StatisticsError as e:
-            uLogger.debug("Statistic mode() method return an error! Precision is set to 2 (default). StatisticsError: '{}'".format(e))
-            precision = 2
-
-        finally:
-            uLogger.debug("Auto-detected precision: {}".format(precision))
+        precision = DetectPrecision(examples)
+        uLogger.debug("Auto-detected precision: {}".format(precision))
 
         self.precision = precision
 
@@ -462,18 +646,46 @@ class PriceGenerator:
 
     def DetectTimeframe(self) -> timedelta:
         """
-        Auto-detect time delta between last two neighbour candles.
+        Auto-detect timeframe as the most frequent time delta between neighbour candles over the whole series,
+        so missed candles or weekends do not change it. Index of gaps, duplicates and rows out of order is built
+        in the same pass and available as `timeIndex`. The index is reused while prices are not changed.
+        See also: `pricegenerator.Statistics.TimeIndex()`.
 
-        :return: timedelta object, also saved to `timeframe`.
+        :return: timedelta object, also saved to `timeframe`. Current `timeframe` is not changed if there are less than two candles.
         """
-        self.timeframe = min(
-            self.prices.iloc[-1].datetime - self.prices.iloc[-2].datetime,
-            self.prices.iloc[-2].datetime - self.prices.iloc[-3].datetime
-        )
+        fingerprint = self.Fingerprint()
+
+        if self._timeIndex is None or self._timeIndex[0] != fingerprint:
+            self._timeIndex = (fingerprint, TimeIndex(self.prices.datetime))
+
+            index = self._timeIndex[1]
+            if len(index["gaps"]) or len(index["duplicates"]) or len(index["outOfOrder"]):
+                uLogger.debug("Time index of candles: {} gaps ({} missed candles), {} duplicated timestamps, {} rows out of order".format(
+                    len(index["gaps"]), int(index["gapCandles"].sum()), len(index["duplicates"]), len(index["outOfOrder"]),
+                ))
+
+        if self._timeIndex[1]["timeframe"] is not None:
+            self.timeframe = self._timeIndex[1]["timeframe"]
+
         uLogger.debug("Auto-detected timeframe: {}".format(self.timeframe))
 
         return self.timeframe
 
+    @property
+    def timeIndex(self) -> dict:
+        """
+        Index of timestamps of candles: `timeframe`, positions of `gaps` (with counts of missed candles in `gapCandles`),
+        `duplicates` and `outOfOrder` rows. See also: `pricegenerator.Statistics.TimeIndex()`.
+        It is calculated once per prices, e.g. at load time or by renderers, with `DetectTimeframe()`.
+        """
+        if self.prices is None or self.prices.empty:
+            raise Exception("Empty price data! Generate or load prices before building time index!")
+
+        if self._timeIndex is None or self._timeIndex[0] != self.Fingerprint():
+            self.DetectTimeframe()
+
+        return self._timeIndex[1]
+
     def LoadFromFile(self, fileName: str) -> pd.DataFrame:
         """
         Create Pandas OHLCV-model from CSV-file.
@@ -493,8 +705,20 @@ class PriceGenerator:
             self.prices.index = range(self.horizon)  # ... and reindex
 
         self.ticker = os.path.basename(fileName)
+        self._ResetStatCache()  # new prices, so previous statistics and indicators are outdated
+        self._onlineStat = None
 
-        self.DetectTimeframe()  # auto-detect time delta between last two neighbour candles
+        if self.validation:
+            self.Validate(repair=None if self.validation == "report" else self.validation)  # opt-in validation of loaded candles
+
+        self.DetectPrecision(self.prices.close.values)  # auto-detect precision at load time
+        self._precisionFingerprint = self.Fingerprint()
+
+        self.DetectTimeframe()  # auto-detect the most frequent time delta between neighbour candles
+        if len(self.timeIndex["duplicates"]) or len(self.timeIndex["outOfOrder"]):
+            uLogger.warning("There are {} duplicated timestamps and {} rows out of order in [{}]! See `timeIndex` for its positions.".format(
+                len(self.timeIndex["duplicates"]), len(self.timeIndex["outOfOrder"]), os.path.abspath(fileName),
+            ))
 
         uLogger.info("It was read {} rows".format(self.horizon))
         uLogger.info("Showing last 5 rows as Pandas DataFrame:")
@@ -503,6 +727,68 @@ class PriceGenerator:
 
         return self.prices
 
+    def Validate(self, repair: Optional[str] = None) -> dict[str, np.ndarray]:
+        """
+        Check consistency of OHLCV-candles in `prices`: finite positive prices, `low ≤ min(open, close) ≤ max(open, close) ≤ high`
+        and `volume ≥ 0`. Broken candles can be repaired. See also: `pricegenerator.Validation` module.
+
+        :param repair: `None` (only check) or repair method: `"clip"`, `"drop"` or `"ffill"`. `None` by default.
+        :return: dictionary: invariant name -> numpy array with positions of broken candles (before repairing).
+        """
+        if self.prices is None or self.prices.empty:
+            raise Exception("Empty price data! Generate or load prices before validation!")
+
+        violations = ValidateOHLCV(self.prices)
+        counts = {name: len(positions) for name, positions in violations.items() if len(positions)}
+
+        if counts:
+            uLogger.warning("Broken candles found: {}".format(", ".join("{} ({}): {}".format(name, INVARIANTS[name], count) for name, count in counts.items())))
+
+            if repair is not None:
+                length = len(self.prices)
+                self.prices = RepairOHLCV(self.prices, method=repair, violations=violations)
+                self.horizon = len(self.prices)
+
+                if self.horizon != length:
+                    # "drop" removes broken candles, "ffill" removes only leading broken candles without previous correct candle:
+                    kept = ~BrokenCandles(violations, length) if repair == "drop" else np.arange(length) >= length - self.horizon
+                    self._ShrinkTrends(kept)
+                self._ResetStatCache()  # prices were changed, so previous statistics and indicators are outdated
+                self._onlineStat = None
+
+                uLogger.warning("Broken candles repaired with method: {}".format(repair))
+
+        else:
+            uLogger.debug("All candles are consistent")
+
+        return violations
+
+    def _ShrinkTrends(self, kept: np.ndarray) -> None:
+        """
+        Shrink `splitCount` (and `trendSplit`) to candles which are kept in `prices` after removing of some candles.
+        Trends without candles are removed. If trends do not describe all candles, then they are cleared.
+
+        :param kept: boolean mask of candles before removing, `True` for candles which are kept.
+        """
+        if not self.trendSplit or not self.splitCount:
+            return
+
+        trends = self.trendSplit.split("-")
+
+        if sum(self.splitCount) != len(kept) or len(trends) != len(self.splitCount):
+            uLogger.debug("Trends do not match candles after repairing, so they are cleared")
+            self.trendSplit = ""
+            self.splitCount = []
+
+            return
+
+        bounds = np.cumsum([0] + list(self.splitCount))
+        counts = [int(kept[left:right].sum()) for left, right in zip(bounds[:-1], bounds[1:])]
+
+        self.trendSplit = "-".join(trend for trend, count in zip(trends, counts) if count)
+        self.splitCount = [count for count in counts if count]
+        uLogger.debug("Candlesticks count in every mini-trend after repairing: {}".format(self.splitCount))
+
     def SaveToFile(self, fileName: str) -> None:
         """
         Save Pandas OHLCV model to CSV-file.
@@ -512,12 +798,12 @@ class PriceGenerator:
         if self.prices is not None and not self.prices.empty:
             uLogger.info("Saving [{}] rows of Pandas DataFrame with columns: {}...".format(len(self.prices), self.csvHeaders))
             uLogger.debug("Delimeter: {}".format(self.sep))
-            dataReplacedDateTime = self.prices.copy(deep=True)
-            dataReplacedDateTime["date"] = [d.date() for d in dataReplacedDateTime["datetime"]]
-            dataReplacedDateTime["time"] = [d.time() for d in dataReplacedDateTime["datetime"]]
-            del dataReplacedDateTime["datetime"]
-            dataReplacedDateTime = dataReplacedDateTime[self.csvHeaders]
-            dataReplacedDateTime.to_csv(fileName, sep=self.sep, index=False, header=False)
+            dataReplacedDateTime = pd.DataFrame({
+                "date": self.prices.datetime.dt.date,
+                "time": self.prices.datetime.dt.time,
+                **{column: self.prices[column] for column in self.csvHeaders if column not in ("date", "time")},
+            })  # only columns to save, without copy of all prices
+            dataReplacedDateTime[self.csvHeaders].to_csv(fileName, sep=self.sep, index=False, header=False)
             uLogger.info("Pandas DataFrame saved to .CSV-file [{}]".format(os.path.abspath(fileName)))
 
         else:
@@ -533,13 +819,7 @@ class PriceGenerator:
         :param trendDeviation: relative deviation for trend detection, 0.005 mean ±0.5% by default.
         :return: string with trend direction `"NO trend"`, `"UP trend"` or `"DOWN trend"`.
         """
-        if abs(firstClose - lastClose) / firstClose <= trendDeviation:
-            trend = "NO trend"
-
-        else:
-            trend = "UP trend" if firstClose <= lastClose else "DOWN trend"
-
-        return trend
+        return Trend(firstClose=firstClose, lastClose=lastClose, trendDeviation=trendDeviation)
 
     @staticmethod
     def ZigZagFilter(datetimes: pd.Series, values: Union[pd.Series, list], deviation: float) -> pd.DataFrame:
@@ -550,52 +830,167 @@ class PriceGenerator:
         :param datetimes: input Pandas Series with datetime values.
         :param values: input Pandas Series or list, e.g. list of closes values of candlesticks.
         :param deviation: float number in `[0, 1]` interval is a relative difference between `i` and `i + 1` values to set as Zig-Zag point.
+        See also `Indicators.ZigZagPivots()`: Zig-Zag with alternating swing highs and lows detected by high and low prices.
+
         :return: Pandas DataFrame with two Series of filtered data `"datetimes": filtered_datetimes` and `"filtered": filtered_values`.
         """
+        points = np.asarray(values, dtype=np.float64).tolist()  # sequential loop over plain list is much faster than indexing of Series
         filteredPoints = [True]
-        prev = values[0]
-        for i in range(1, len(values)):
-            difference = abs(values[i] - prev) / prev
+        prev = points[0]
+        for value in points[1:]:
+            difference = abs(value - prev) / prev
             if difference >= deviation:
                 filteredPoints.append(True)
-                prev = values[i]
+                prev = value
 
             else:
                 filteredPoints.append(False)
 
         return pd.DataFrame(data={"datetimes": datetimes[filteredPoints], "filtered": values[filteredPoints]}, columns=["datetimes", "filtered"])
 
+    def Fingerprint(self) -> str:
+        """
+        Cheap fingerprint of OHLCV-candlesticks in `prices`: length, sums of numeric columns, last candle and evenly spaced
+        sample of candles (no more than ~1000). Additional columns (not in `dfHeaders`) are not used. It is used as a key for statistics cache.
+
+        :return: string with hex-digest or empty string if there are no prices.
+        """
+        if self.prices is None or self.prices.empty:
+            return ""
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(len(self.prices)).encode())
+        step = max(1, len(self.prices) // 1024)
+
+        for column in self.dfHeaders:
+            if column in self.prices.columns:
+                series = self.prices[column]
+                digest.update(column.encode())
+                digest.update(pd.util.hash_pandas_object(series.iloc[::step], index=False).values.tobytes())
+                digest.update(pd.util.hash_pandas_object(series.iloc[-1:], index=False).values.tobytes())
+
+                if pd.api.types.is_numeric_dtype(series):
+                    digest.update(repr(series.sum()).encode())
+
+        return digest.hexdigest()
+
+    def _StatCacheKey(self, fingerprint: str) -> str:
+        """
+        Key for statistics cache: format of cache, fingerprint of prices and all parameters used by statistics and chart title.
+        Timeframe is used in nanoseconds, so the same `timedelta` and `pd.Timedelta` (e.g. after detection of timeframe) give the same key.
+        """
+        params = (STAT_CACHE_FORMAT, fingerprint, self.zigZagDeviation, self.trendDeviation, self.precision, self.ticker, pd.Timedelta(self.timeframe).value, self.horizon, tuple(self.deltaQuantiles), self.indicatorsDtype)
+
+        return hashlib.blake2b(repr(params).encode(), digest_size=16).hexdigest()
+
+    def _ResetStatCache(self) -> None:
+        """Drop memory cache of statistics and indicators. It is called every time when prices are generated, loaded or extended."""
+        self._statCache = {}
+        self._statFingerprint = None
+        self._statKeys = []
+        self._statDumped = {}
+        self._indicators = None
+
+    def _LoadStatCache(self, key: str) -> Optional[dict]:
+        """Search statistics in memory cache and then on disk in `statCacheDir`."""
+        if key in self._statCache:
+            return self._statCache[key]
+
+        if self.statCacheDir:
+            cacheFile = os.path.join(self.statCacheDir, "{}.pkl".format(key))
+
+            if os.path.exists(cacheFile):
+                try:
+                    with open(cacheFile, "rb") as fH:
+                        cached = pickle.load(fH)
+
+                    if "alias" in cached:
+                        cacheFile = os.path.join(self.statCacheDir, "{}.pkl".format(cached["alias"]))  # the same statistics saved with another key
+
+                        with open(cacheFile, "rb") as fH:
+                            cached = pickle.load(fH)
+
+                    self._statCache[key] = cached
+                    uLogger.debug("Statistics loaded from cache file [{}]".format(os.path.abspath(cacheFile)))
+
+                    return cached
+
+                except Exception as e:
+                    uLogger.warning("Can't load statistics from cache file [{}]! Error message: {}".format(os.path.abspath(cacheFile), e))
+
+        return None
+
+    def _DumpStatCache(self) -> None:
+        """
+        Persist current statistics and all already calculated indicators to `statCacheDir` (if it is set). Nothing is written
+        if they are already saved. Statistics are written to one file, other keys of the same statistics refer to it.
+        """
+        if not self.statCacheDir or not self._statKeys:
+            return
+
+        mainKey = self._statKeys[-1]
+        snapshot = self._indicators.Snapshot() if self._indicators is not None else {}
+        if mainKey in self._statDumped and set(snapshot) <= self._statDumped[mainKey]:
+            return  # no new statistics or indicators
+
+        os.makedirs(self.statCacheDir, exist_ok=True)
+        entries = [(mainKey, {**self._statCache[mainKey], "indicators": snapshot})]  # cached statistics are not changed
+        entries.extend((key, {"alias": mainKey}) for key in self._statKeys[:-1])
+
+        for key, entry in entries:
+            cacheFile = os.path.join(self.statCacheDir, "{}.pkl".format(key))
+
+            try:
+                with open(cacheFile, "wb") as fH:
+                    pickle.dump(entry, fH, protocol=pickle.HIGHEST_PROTOCOL)
+
+            except Exception as e:
+                uLogger.warning("Can't save statistics to cache file [{}]! Error message: {}".format(os.path.abspath(cacheFile), e))
+
+                return
+
+            uLogger.debug("Statistics saved to cache file [{}]".format(os.path.abspath(cacheFile)))
+
+        self._statDumped[mainKey] = set(snapshot)
+
     def GetStatistics(self) -> list[str]:
         """
-        Calculates statistics of candles chain.
+        Calculates statistics of candles chain. Technical analysis indicators are not calculated here,
+        they are available on demand through the lazy graph in `indicators` property.
+
+        Statistics are cached and keyed by `Fingerprint()` of prices and parameters `zigZagDeviation`, `trendDeviation`
+        and `precision`, so repeated calls (e.g. from `RenderBokeh()` and `RenderGoogle()`) skip all calculations.
 
         :return: list with text in Markdown format with statistics.
         """
-        uLogger.debug("Calculating column with deltas between high and low values...")
-        self.prices["delta"] = self.prices.high.values - self.prices.low.values
-
-        uLogger.debug("Calculating column with average values...")
-        self.prices["avg"] = round((self.prices.high + self.prices.low) / 2, self._precision)
-
-        uLogger.debug("Calculating some technical analysis indicators...")
-        self.prices["sma5"] = ta.sma(close=self.prices.close, length=5, offset=None)
-        self.prices["sma20"] = ta.sma(close=self.prices.close, length=20, offset=None)
-        self.prices["sma50"] = ta.sma(close=self.prices.close, length=50, offset=None)
-        self.prices["sma200"] = ta.sma(close=self.prices.close, length=200, offset=None)
-        self.prices["hma5"] = ta.hma(close=self.prices.close, length=5, offset=None)
-        self.prices["hma20"] = ta.hma(close=self.prices.close, length=20, offset=None)
-        self.prices["vwma5"] = ta.vwma(close=self.prices.close, volume=self.prices.volume, length=5, offset=None)
-        self.prices["vwma20"] = ta.vwma(close=self.prices.close, volume=self.prices.volume, length=20, offset=None)
-        bbands = ta.bbands(close=self.prices.close, length=None, std=None, mamode=None, offset=None)
-        bbands.columns = ["lower", "mid", "upper", "bandwidth", "percent"]
-        psar = ta.psar(high=self.prices.high, low=self.prices.low, close=self.prices.close, af=0.02, max_af=0.2, offset=None)
-        psar.columns = ["long", "short", "af", "reversal"]
-        self.prices["hma13"] = ta.hma(close=self.prices.close, length=13, offset=8)  # alligator Jaw
-        self.prices["hma8"] = ta.hma(close=self.prices.close, length=8, offset=5)  # alligator Teeth
-        self.prices["hma5"] = ta.hma(close=self.prices.close, length=5, offset=3)  # alligator Lips
-        zigzag = self.ZigZagFilter(datetimes=self.prices.datetime, values=self.prices.close, deviation=self.zigZagDeviation)  # ZigZag indicator
-
-        self.DetectPrecision(self.prices.close.values)  # auto-detect precision
+        fingerprint = self.Fingerprint()
+        if fingerprint != self._statFingerprint:
+            self._ResetStatCache()  # prices were changed in place, so all cached statistics and indicators are outdated
+            self._statFingerprint = fingerprint
+
+        keys = [self._StatCacheKey(fingerprint)]
+        cached = self._LoadStatCache(keys[0])
+
+        if cached is not None:
+            uLogger.debug("Statistics and indicators are taken from cache (key: {})".format(keys[0]))
+
+            self.precision = cached["precision"]
+            self._chartTitle = cached["chartTitle"]
+            self._stat = deepcopy(cached["stat"])
+            self.indicators.Restore(cached.get("indicators", {}))
+
+            keys.append(self._StatCacheKey(fingerprint))  # key with precision from cache
+            self._statCache[keys[-1]] = cached
+            self._statKeys = list(dict.fromkeys(keys))
+
+            if "indicators" in cached:
+                self._statDumped[keys[-1]] = set(cached["indicators"])  # statistics are loaded from disk, so they are saved already
+
+            return list(cached["summary"])
+
+        if fingerprint != self._precisionFingerprint:
+            self.DetectPrecision(self.prices.close.values)  # auto-detect precision
+            self._precisionFingerprint = fingerprint
 
         self._chartTitle = "Instrument: {}, timeframe: {}, horizon length: {} (from {} to {})".format(
             self.ticker,
@@ -618,69 +1013,195 @@ class PriceGenerator:
         self._stat["diapason"] = self._stat["closeMax"] - self._stat["closeMin"]
         self._stat["trend"] = self.GetTrend(firstClose=self._stat["closeFirst"], lastClose=self._stat["closeLast"], trendDeviation=self.trendDeviation)
 
-        self.prices["up"] = self.prices.close >= self.prices.open  # True mean that is up candle, and False mean down
-        upList = list(self.prices.up)
-        upChainsLengths = [len(list(chain)) for value, chain in groupby(upList) if value is True]
-        downChainsLengths = [len(list(chain)) for value, chain in groupby(upList) if value is False]
-
         self._stat["trendDev"] = self.trendDeviation
-        self._stat["upCount"] = len(self.prices.up[self.prices.up == True])
-        self._stat["downCount"] = len(self.prices.up[self.prices.up == False])
-        self._stat["upCountChainMax"] = max(upChainsLengths) if upChainsLengths else 1
-        self._stat["downCountChainMax"] = max(downChainsLengths) if downChainsLengths else 1
-        self._stat["deltas"]["max"] = max(self.prices.delta)
-        self._stat["deltas"]["min"] = min(self.prices.delta)
-        self._stat["deltas"]["stDev"] = round(pstdev(self.prices.delta), self._precision)
-        self._stat["deltas"]["q99"] = round(max(pd.DataFrame(self.prices.delta).quantile(q=0.99, interpolation='linear')), self._precision)
-        self._stat["deltas"]["q95"] = round(max(pd.DataFrame(self.prices.delta).quantile(q=0.95, interpolation='linear')), self._precision)
-        self._stat["deltas"]["q80"] = round(max(pd.DataFrame(self.prices.delta).quantile(q=0.80, interpolation='linear')), self._precision)
-        self._stat["deltas"]["q50"] = round(max(pd.DataFrame(self.prices.delta).quantile(q=0.50, interpolation='linear')), self._precision)
+        self._stat.update(ChainStatistics(self.indicators["up"].values))  # counts, maxima and distributions of up and down candle chains
+        deltas = DistributionSummary(self.indicators["delta"].values, quantiles=self.deltaQuantiles)  # all quantiles in one pass
+        self._stat["deltas"] = {
+            "max": deltas["max"],
+            "min": deltas["min"],
+            "stDev": round(deltas["stDev"], self._precision),
+            **{key: round(value, self._precision) for key, value in deltas.items() if key.startswith("q")},
+            "mean": deltas["mean"],
+            "skew": deltas["skew"],
+            "kurtosis": deltas["kurtosis"],
+        }
         self._stat["cumSumVolumes"] = self.prices.volume.sum()
+        self._stat["patterns"] = PatternCounts(self.indicators["patterns"].values)
 
-        self._stat["sma5"] = self.prices["sma5"]
-        self._stat["sma20"] = self.prices["sma20"]
-        self._stat["sma50"] = self.prices["sma50"]
-        self._stat["sma200"] = self.prices["sma200"]
-        self._stat["hma5"] = self.prices["hma5"]
-        self._stat["hma20"] = self.prices["hma20"]
-        self._stat["vwma5"] = self.prices["vwma5"]
-        self._stat["vwma20"] = self.prices["vwma20"]
-        self._stat["bbands"] = bbands
-        self._stat["psar"] = psar
-        self._stat["hma13"] = self.prices["hma13"]
-        self._stat["hma8"] = self.prices["hma8"]
-        self._stat["hma5"] = self.prices["hma5"]
-        self._stat["zigzag3"] = zigzag
-
-        summary = [
-            "# Summary",
-            "- Candles count: {}".format(self.stat["candles"]),
-            "- Timeframe: {}".format(self.timeframe),
-            "- Precision (signs after comma): {}".format(self.stat["precision"]),
-            "- Close, first: {}".format(round(self.stat["closeFirst"], self.precision)),
-            "- Close, last: {}".format(round(self.stat["closeLast"], self.precision)),
-            "- Close, max: {}".format(round(self.stat["closeMax"], self.precision)),
-            "- Close, min: {}".format(round(self.stat["closeMin"], self.precision)),
-            "- Diapason, |close_max - close_min|: {}".format(round(self.stat["diapason"], self.precision)),
-            "- Trend, |close_1st - close_last|: {}".format(self.stat["trend"]),
-            "",
-            "# Statistics",
-            "- Up candles count: {} ({}%)".format(self.stat["upCount"], round(100 * self.stat["upCount"] / self.stat["candles"], self.precision)),
-            "- Down candles count: {} ({}%)".format(self.stat["downCount"], round(100 * self.stat["downCount"] / self.stat["candles"], self.precision)),
-            "- Max of up / down candle chains: {} / {}".format(self.stat["upCountChainMax"], self.stat["downCountChainMax"]),
-            "- Max delta, |high - low|: {}".format(round(self.stat["deltas"]["max"], self.precision)),
-            "- Min delta, |high - low|: {}".format(round(self.stat["deltas"]["min"], self.precision)),
-            "- Delta's std. dev.: {}".format(round(self.stat["deltas"]["stDev"], self.precision)),
-            "  - 99 percentile: ≤ {}".format(round(self.stat["deltas"]["q99"], self.precision)),
-            "  - 95 percentile: ≤ {}".format(round(self.stat["deltas"]["q95"], self.precision)),
-            "  - 80 percentile: ≤ {}".format(round(self.stat["deltas"]["q80"], self.precision)),
-            "- Cumulative sum of volumes: {}".format(self.stat["cumSumVolumes"]),
-        ]
+        summary = SummaryMarkdown(stat=self._stat, timeframe=self.timeframe, precision=self.precision)
 
         uLogger.info("Some statistics:\n{}".format("\n".join(summary)))
 
+        keys.append(self._StatCacheKey(fingerprint))  # precision may be changed after auto-detection
+        cached = {"summary": list(summary), "stat": deepcopy(self._stat), "chartTitle": self._chartTitle, "precision": self.precision}
+        self._statKeys = list(dict.fromkeys(keys))
+        self._statDumped.pop(self._statKeys[-1], None)  # new statistics are not saved yet
+
+        for key in self._statKeys:
+            self._statCache[key] = cached
+
+        self._DumpStatCache()
+
         return summary
 
+    def GetDistribution(self, name: str = "delta", quantiles: Optional[list[float]] = None) -> dict:
+        """
+        Summary of distribution of any series from the graph of indicators in one pass: count, mean, std. dev., min, max,
+        skewness, excess kurtosis and quantiles. See also: `pricegenerator.Statistics.DistributionSummary()`.
+
+        Example: `GetDistribution("body")`, `GetDistribution("upperShadow")`, `GetDistribution("returns", quantiles=[0.01, 0.99])`.
+
+        :param name: base column (e.g. `volume`) or indicator name (e.g. `delta`, `body`, `upperShadow`, `lowerShadow`, `returns`). Default: `delta`.
+        :param quantiles: list of quantiles in `[0, 1]` interval. If `None`, then `deltaQuantiles` is used.
+        :return: dictionary with distribution summary.
+        """
+        if self.prices is None or self.prices.empty:
+            raise Exception("Empty price data! Generate or load prices before calculating distributions!")
+
+        return DistributionSummary(self.indicators[name].values, quantiles=self.deltaQuantiles if quantiles is None else quantiles)
+
+    def CompareDistributions(self, other: Union["PriceGenerator", pd.DataFrame], maxLag: int = 20) -> dict:
+        """
+        Report about statistical similarity of current prices (e.g. loaded history) and other prices (e.g. generated series):
+        Kolmogorov-Smirnov and Anderson-Darling statistics for log-returns, bodies and shadows, differences of autocorrelations
+        of returns and absolute returns (volatility clustering) and Hurst exponents. Features of current prices are cached
+        while prices are not changed, so one history can be compared with thousands of generated series quickly.
+        See also: `pricegenerator.Similarity` module.
+
+        :param other: another `PriceGenerator` object or Pandas DataFrame with candles.
+        :param maxLag: maximum lag of autocorrelations.
+        :return: dictionary with comparison report, see `pricegenerator.Similarity.CompareFeatures()`. Total `score` is `0` for the same series.
+        """
+        if self.prices is None or self.prices.empty:
+            raise Exception("Empty price data! Generate or load prices before comparing distributions!")
+
+        fingerprint = self.Fingerprint()
+        if self._similarityFeatures is None or self._similarityFeatures[:2] != (fingerprint, maxLag):
+            self._similarityFeatures = (fingerprint, maxLag, SeriesFeatures(self.prices, maxLag=maxLag))
+
+        otherPrices = other.prices if isinstance(other, PriceGenerator) else other
+        report = CompareFeatures(self._similarityFeatures[2], SeriesFeatures(otherPrices, maxLag=maxLag))
+
+        uLogger.debug("Comparison of distributions:\n{}".format("\n".join(ComparisonMarkdown(report))))
+
+        return report
+
+    def GetPathsStatistics(self, paths: list[Union["PriceGenerator", pd.DataFrame]], pathQuantiles: Optional[list[float]] = None) -> tuple[pd.DataFrame, dict]:
+        """
+        Statistics of many price paths with the same horizon (e.g. Monte Carlo simulations) calculated at once on stacked
+        `paths × horizon` arrays, without `GetStatistics()`, indicators and logging per path. Current `trendDeviation`
+        and `deltaQuantiles` are used. See also: `pricegenerator.Statistics.BatchStatistics()`.
+
+        Example:
+
+        ```python
+        paths = []
+        for _ in range(1000):
+            priceModel.Generate()
+            paths.append(priceModel.prices)
+
+        table, aggregate = priceModel.GetPathsStatistics(paths)
+        print(aggregate["trends"], aggregate["fields"]["upCountChainMax"]["q95"])
+        ```
+
+        :param paths: list of Pandas DataFrames with candles or `PriceGenerator` objects.
+        :param pathQuantiles: quantiles of every statistic across paths. If `None`, then `(0.05, 0.50, 0.95)` is used.
+        :return: tuple of Pandas DataFrame with one row of statistics per path and dictionary with aggregated statistics.
+        """
+        frames = [path.prices if isinstance(path, PriceGenerator) else path for path in paths]
+
+        if not frames or any(frame is None or frame.empty for frame in frames):
+            raise Exception("Empty price data! Expected list of not empty price paths!")
+
+        if len(set(len(frame) for frame in frames)) > 1:
+            raise Exception("All price paths must have the same horizon!")
+
+        arrays = {column: np.stack([frame[column].values for frame in frames]) for column in ["open", "high", "low", "close", "volume"]}
+        table, aggregate = BatchStatistics(
+            **arrays,
+            trendDeviation=self.trendDeviation,
+            quantiles=self.deltaQuantiles,
+            **({} if pathQuantiles is None else {"pathQuantiles": pathQuantiles}),
+        )
+
+        uLogger.debug("Statistics of {} paths, trends frequencies: {}".format(aggregate["paths"], aggregate["trends"]))
+
+        return table, aggregate
+
+    def GetPanelStatistics(self, panel: dict[str, Union["PriceGenerator", pd.DataFrame]]) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Cross-sectional statistics of many tickers in one vectorized call over `time × ticker` matrices: one row of statistics
+        per ticker and correlations of log-returns between tickers. Candles are aligned by datetime, only datetimes present
+        for all tickers are used. Current `trendDeviation` and `deltaQuantiles` are used. See also: `pricegenerator.Statistics.PanelStatistics()`.
+
+        Use `PanelSummary()` to get Markdown summary for every ticker.
+
+        :param panel: dictionary: ticker -> Pandas DataFrame with candles or `PriceGenerator` object.
+        :return: tuple of Pandas DataFrame with one row of statistics per ticker and Pandas DataFrame with correlation matrix.
+        """
+        frames = {ticker: item.prices if isinstance(item, PriceGenerator) else item for ticker, item in panel.items()}
+
+        if not frames or any(frame is None or frame.empty for frame in frames.values()):
+            raise Exception("Empty price data! Expected dictionary with not empty prices of tickers!")
+
+        columns = ["open", "high", "low", "close", "volume"]
+        aligned = pd.concat({ticker: frame.set_index("datetime")[columns] for ticker, frame in frames.items()}, axis=1, join="inner").sort_index()
+
+        if aligned.empty:
+            raise Exception("There are no common datetimes of candles for all tickers!")
+
+        table, correlations = PanelStatistics(
+            **{column: aligned.xs(column, axis=1, level=1).values for column in columns},
+            tickers=list(frames.keys()),
+            trendDeviation=self.trendDeviation,
+            quantiles=self.deltaQuantiles,
+        )
+
+        uLogger.debug("Statistics of {} tickers calculated for {} common candles".format(len(table), len(aligned)))
+
+        return table, correlations
+
+    def PanelSummary(self, table: pd.DataFrame) -> dict[str, list[str]]:
+        """
+        Markdown summary for every ticker from the table of cross-sectional statistics (see `GetPanelStatistics()`),
+        in the same format as `GetStatistics()` returns. Current `timeframe` and `precision` are used.
+
+        :param table: Pandas DataFrame with one row of statistics per ticker.
+        :return: dictionary: ticker -> list with text in Markdown format with statistics.
+        """
+        return PanelMarkdown(table, timeframe=self.timeframe, precision=self.precision)
+
+    def GetPatternMarkers(self) -> pd.DataFrame:
+        """
+        Markers of candlestick patterns (doji, hammer, engulfing, harami, morning and evening stars, gaps) for `markers`
+        parameter of `RenderBokeh()`. See also: `pricegenerator.Patterns` module.
+
+        Example: `priceModel.RenderBokeh(fileName="index.html", markers=priceModel.GetPatternMarkers())`.
+
+        :return: Pandas DataFrame with `datetime`, `markersUpper`, `markersCenter` and `markersLower` columns.
+        """
+        if self.prices is None or self.prices.empty:
+            raise Exception("Empty price data! Generate or load prices before searching candlestick patterns!")
+
+        return PatternMarkers(self.prices.datetime.values, self.indicators["patterns"].values)
+
+    def GetRollingStatistics(self, window: Union[int, str, timedelta] = 500, step: Optional[int] = None, expanding: bool = False) -> pd.DataFrame:
+        """
+        Main statistics (trend, up and down candles, deltas and volumes) for every window of candles, e.g. per 500 candles
+        or per trading day. It is useful to see how stationary the series is. See also: `pricegenerator.Statistics.RollingStatistics()`.
+
+        Example: `GetRollingStatistics(window=500)`, `GetRollingStatistics(window="1D")`, `GetRollingStatistics(window=100, step=10)`.
+
+        :param window: count of candles in window, or calendar period as Pandas frequency string or timedelta (e.g. `"1D"`). Default: `500`.
+        :param step: step between starts of windows in candles, equal to `window` by default (not overlapped windows).
+        :param expanding: if `True`, then every window starts from the first candle. Default: `False`.
+        :return: Pandas DataFrame with one row per window.
+        """
+        if self.prices is None or self.prices.empty:
+            raise Exception("Empty price data! Generate or load prices before calculating statistics!")
+
+        return RollingStatistics(self.prices, window=window, step=step, expanding=expanding, trendDeviation=self.trendDeviation, quantiles=self.deltaQuantiles)
+
     def _GenNextCandle(self, lastClose, lastVolume=0) -> dict:
         """
         Generator for creating 1 next candle based on global probability parameters.
@@ -737,6 +1258,16 @@ class PriceGenerator:
 
         return candle
 
+    def _InitCandleSizes(self) -> None:
+        """Set default sizes of outliers and candle bodies if they are not defined."""
+        # maximum of candle sizes: (high - low), if None then used (maxClose - minClose) / 10
+        if self.maxOutlier is None:
+            self.maxOutlier = abs(self.maxClose - self.minClose) / 10
+
+        # maximum of candle body sizes: abs(open - close), if None then used maxOutlier * 90%
+        if self.maxCandleBody is None:
+            self.maxCandleBody = 0.9 * self.maxOutlier
+
     def Generate(self) -> pd.DataFrame:
         """
         Main method to generating prices.
@@ -786,13 +1317,7 @@ class PriceGenerator:
         else:
             trends = []
 
-        # maximum of candle sizes: (high - low), if None then used (maxClose - minClose) / 10
-        if self.maxOutlier is None:
-            self.maxOutlier = abs(self.maxClose - self.minClose) / 10
-
-        # maximum of candle body sizes: abs(open - close), if None then used maxOutlier * 90%
-        if self.maxCandleBody is None:
-            self.maxCandleBody = 0.9 * self.maxOutlier
+        self._InitCandleSizes()
 
         # initClose is the last close price (left on chart or "before" 1st generated candle), 1st candle["open"] = initClose
         if self.initClose is None:
@@ -893,6 +1418,11 @@ class PriceGenerator:
         )
         self.prices = pd.DataFrame(data=candles, columns=self.dfHeaders)
         self.prices.datetime = indx
+        self._ResetStatCache()  # new prices, so previous statistics and indicators are outdated
+        self._onlineStat = None
+
+        if self.validation:
+            self.Validate(repair=None if self.validation == "report" else self.validation)  # opt-in validation of generated candles
 
         uLogger.info("Showing last 5 rows of Pandas generated dataframe object:")
         for line in pd.DataFrame.to_string(self.prices[self.dfHeaders][-5:], max_cols=20).split("\n"):
@@ -900,11 +1430,148 @@ class PriceGenerator:
 
         return self.prices
 
+    def Extend(self, horizon: int = 1, candles: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Append new candles to the end of current chain of `prices`, e.g. for live feeds. New candles are generated
+        with current probability parameters and continue from the last close price and volume,
+        or they can be given in `candles` parameter (e.g. received from a real feed).
+
+        Online statistics (see `onlineStat`) are updated incrementally with O(1) work per new candle,
+        cached statistics and indicators are invalidated.
+
+        :param horizon: count of new candles to generate. `1` by default. Not used if `candles` are given.
+        :param candles: Pandas DataFrame with new OHLCV-candlesticks (columns as in `dfHeaders`). `None` by default, mean that new candles will be generated.
+        :return: Pandas DataFrame with new candles only.
+        """
+        if self.prices is None or self.prices.empty:
+            raise Exception("Empty price data! Generate or load prices before extending!")
+
+        if candles is None:
+            self._InitCandleSizes()
+
+            newCandles = [self._GenNextCandle(self.prices.close.values[-1], self.prices.volume.values[-1])]
+            for _ in range(1, max(1, horizon)):
+                newCandles.append(self._GenNextCandle(newCandles[-1]["close"], newCandles[-1]["volume"]))
+
+            candles = pd.DataFrame(data=newCandles, columns=self.dfHeaders)
+            candles.datetime = pd.date_range(start=self.prices.datetime.iloc[-1] + self.timeframe, periods=len(candles), freq=self.timeframe)
+
+        else:
+            candles = candles[self.dfHeaders].reset_index(drop=True)
+
+        uLogger.debug("Extending chain of candles with {} new candles...".format(len(candles)))
+
+        if self._onlineStat is not None:
+            self._onlineStat.UpdateMany(candles)
+
+        self.prices = pd.concat([self.prices, candles], ignore_index=True)
+        self.horizon = len(self.prices)
+        self._ResetStatCache()  # prices were changed, so cached statistics and indicators are outdated
+
+        return candles
+
+    def Window(self, start: Optional[int] = None, stop: Optional[int] = None, indicators: Optional[list[str]] = None, customs: bool = True) -> "PriceGenerator":
+        """
+        Lightweight copy of generator with a slice of `prices`, e.g. the last candles of a live feed or one page of long history.
+        All parameters are the same, but statistics and indicators of the copy are calculated only for candles in the slice.
+        Current object is not changed.
+
+        :param start: index of the first candle in the slice, negative values count from the end. `None` by default (from the first candle).
+        :param stop: index after the last candle in the slice. `None` by default (up to the last candle).
+        :param indicators: names of indicators calculated for the whole chain and sliced for the copy, so moving averages have no
+                           warm-up gap at the beginning of the slice. `None` by default, mean that indicators are calculated for the slice.
+        :param customs: if `True` (by default), then custom indicators (see `RegisterIndicator()`) are registered for the copy too.
+                        Use `False` to send the copy to another process, because functions of custom indicators (e.g. lambdas) can't be pickled.
+        :return: new `PriceGenerator` object.
+        """
+        if self.prices is None or self.prices.empty:
+            raise Exception("Empty price data! Generate or load prices before slicing!")
+
+        window = copy(self)
+        window.prices = self.prices.iloc[start:stop].reset_index(drop=True)
+        window.horizon = len(window.prices)
+        window.j2model = None  # model of Google chart is built for candles of the copy
+        window._customIndicators = dict(self._customIndicators) if customs else {}
+        window._stat = deepcopy(self._stat)
+        window._ResetStatCache()  # new memory cache of statistics and new graph of indicators
+        window._onlineStat = None
+        window._precisionFingerprint = None
+        window._timeIndex = None
+        window._similarityFeatures = None
+
+        kept = np.zeros(len(self.prices), dtype=bool)
+        kept[start:stop] = True
+        window._ShrinkTrends(kept)  # trend lines only for candles of the copy
+
+        if indicators:
+            window._statFingerprint = window.Fingerprint()  # so sliced indicators are not dropped by `GetStatistics()`
+            first, last = window.prices.datetime.iloc[0], window.prices.datetime.iloc[-1]
+            sliced = {}
+
+            for name in indicators:
+                values = self.indicators[name]
+
+                if isinstance(values, pd.DataFrame) and "datetimes" in values.columns:  # sparse points, e.g. Zig-Zag
+                    sliced[name] = values[(values.datetimes >= first) & (values.datetimes <= last)].reset_index(drop=True)
+
+                else:
+                    sliced[name] = values.iloc[start:stop].reset_index(drop=True)
+
+            window.indicators.Restore(sliced)
+
+        return window
+
+    def CandlePositions(self, datetimes) -> np.ndarray:
+        """
+        Positions of candles containing given datetimes, found by binary search over sorted datetimes of candles: datetime is inside
+        candle from its open time up to open time of the next candle. Datetimes without time zone are in time zone of candles.
+
+        :param datetimes: datetimes of events: Pandas Series, DatetimeIndex, numpy array or list.
+        :return: numpy array of positions of candles in `prices`, `-1` for datetimes outside of candles chain.
+        """
+        if self.prices is None or self.prices.empty:
+            raise Exception("Empty price data! Generate or load prices before searching candles!")
+
+        stamps = pd.DatetimeIndex(datetimes)
+        candles = pd.DatetimeIndex(self.prices.datetime)
+
+        if candles.tz is not None and stamps.tz is None:
+            stamps = stamps.tz_localize(candles.tz, ambiguous="NaT", nonexistent="NaT")
+
+        elif candles.tz is None and stamps.tz is not None:
+            stamps = stamps.tz_localize(None)
+
+        stamps = stamps.values.astype("datetime64[ns]").view(np.int64)
+        candles = candles.values.astype("datetime64[ns]").view(np.int64)
+        positions = np.searchsorted(candles, stamps, side="right") - 1
+        step = self.timeIndex["timeframe"].value if self.timeIndex["timeframe"] is not None else 1
+        positions[(stamps < candles[0]) | (stamps >= candles[-1] + step)] = -1  # NaT is the smallest integer, so it is outside too
+
+        return positions
+
+    @staticmethod
+    def _EventFrame(events) -> Optional[pd.DataFrame]:
+        """
+        Convert markers or line of `RenderBokeh()` to Pandas DataFrame with `datetime` column: list of dictionaries (events),
+        Pandas Series or DataFrame with datetime index are supported. Other objects are returned as is.
+        """
+        if isinstance(events, list) and events and all(isinstance(event, dict) for event in events):
+            events = pd.DataFrame(events)
+
+        elif isinstance(events, pd.Series):
+            events = events.to_frame(name=events.name if events.name is not None else "line")
+
+        if isinstance(events, pd.DataFrame) and "datetime" not in events.columns and isinstance(events.index, pd.DatetimeIndex):
+            events = events.rename_axis("datetime").reset_index()
+
+        return events
+
     def RenderBokeh(
             self, fileName: Optional[str] = "index.html", viewInBrowser: bool = False,
             darkTheme: bool = False, markers: Optional[pd.DataFrame] = None, lines: Optional[list[pd.DataFrame]] = None,
             title: Optional[str] = None, width: Optional[int] = 1800, height: Optional[int] = 940,
             showControlsOnChart: bool = True, showStatOnChart: bool = True, inline: bool = False,
+            maxCandles: Optional[int] = None,
     ) -> Optional[gridplot]:
         """
         Rendering prices from Pandas DataFrame as OHLCV Bokeh chart of candlesticks and save it to HTML-file.
@@ -918,10 +1585,13 @@ class PriceGenerator:
         :param markers: Pandas DataFrame with additional markers that will be placed on main series. `None` by default.
                         Marker is a custom symbol, example: ×, ↓ or ↑. Dataframe with markers must contain at least two columns.
                         There are `datetime` with date and time and some markers columns (`markersUpper`, `markersCenter` or `markersLower`).
-                        Length of markers series must be equal to the length of main candles series.
+                        Markers may be sparse: only rows with events (DataFrame with `datetime` column or index, or list of dictionaries
+                        like `{"datetime": ..., "markersUpper": "↓"}`). Every marker is placed on candle containing its datetime
+                        (see `CandlePositions()`), and only not empty markers are drawn.
         :param lines: list with custom series, where additional chart-lines will place on main series. `None` by default.
                       Line data must contain at least two columns. There are `datetime` with date and time and
-                      `custom_line_name` with y-coordinates. Length of the chart-line dataframes must be equal to the length of main candle series.
+                      `custom_line_name` with y-coordinates. Lines may be sparse, e.g. a few points of signals, and Pandas Series
+                      with datetime index are also supported. Lines with the same datetimes as candles share data with candles.
         :param title: specific chart title. If `None`, then used auto-generated title. `None` by default.
         :param width: chart width. If `None`, then used auto-width. 1800 px by default.
         :param height: chart height. If `None`, then used auto-height. 940 px by default.
@@ -932,6 +1602,11 @@ class PriceGenerator:
                                 Warning! Calculate statistic takes more time. If you want to decrease chart rendering time,
                                 then set this parameter to `False`.
         :param inline: if `True`, then output chart in Jupyter Notebook cell. `False` by default.
+        :param maxCandles: level of detail: if count of candles is greater than `maxCandles`, then candles are aggregated into
+                           `maxCandles` OHLCV-buckets and indicator lines are downsampled with LTTB algorithm, see `Downsampling` module.
+                           If `None` (by default), then chart width in pixels is used. `0` mean that all candles are drawn.
+                           Statistics are always calculated for all candles. Charts with more than `WEBGL_THRESHOLD` candles
+                           are rendered with WebGL backend.
         :return: bokeh.layouts.gridplot with all layouts objects or None.
         """
         if self.prices is None or self.prices.empty:
@@ -940,7 +1615,7 @@ class PriceGenerator:
         else:
             uLogger.info("Rendering Pandas DataFrame as Bokeh chart...")
 
-            self.DetectTimeframe()  # auto-detect time delta between last two neighbour candles
+            self.DetectTimeframe()  # auto-detect the most frequent time delta between neighbour candles
             infoBlock = self.GetStatistics() if showStatOnChart else []  # calculating some indicators
 
             title = self._chartTitle if title is None or not title else title  # chart title
@@ -950,6 +1625,29 @@ class PriceGenerator:
             uLogger.debug("Preparing Bokeh chart configuration...")
             uLogger.debug("Title: {}".format(title))
 
+            # level of detail: it is impossible to see more candles than pixels, so long series are aggregated into buckets
+            maxCandles = width if maxCandles is None else maxCandles
+            downsampling = maxCandles > 0 and len(self.prices) > maxCandles
+            candles = OHLCVBuckets(self.prices, buckets=maxCandles) if downsampling else self.prices
+            backend = "webgl" if len(self.prices) > WEBGL_THRESHOLD else "canvas"
+
+            if downsampling:
+                uLogger.debug("Level of detail: {} candles aggregated into {} buckets".format(len(self.prices), len(candles)))
+
+            def LineData(name: str, x: pd.Series, y: pd.Series) -> dict:
+                """
+                Data arguments of line glyph. Series with the same datetimes as candles are added as column to the shared data source,
+                so datetimes are not serialized again. Other series are downsampled with LTTB algorithm if level of detail is reduced.
+                """
+                if len(y) == len(candles) and np.array_equal(np.asarray(x.values), np.asarray(candles.datetime.values)):
+                    source.data[name] = np.asarray(y.values, dtype=np.float32)  # lines are not shown in tooltips, so float32 is enough to draw them
+
+                    return {"x": "datetime", "y": name, "source": source}
+
+                selected = LTTB(x.values, y.values, threshold=maxCandles) if downsampling else slice(None)
+
+                return {"x": np.asarray(x.values)[selected], "y": np.asarray(y.values)[selected]}
+
             if inline:
                 output_notebook(resources=INLINE, verbose=False, hide_banner=True)  # set output to notebook cell
 
@@ -973,6 +1671,7 @@ class PriceGenerator:
                 min_border_top=0,
                 min_border_bottom=0,
                 y_range=Range1d(min(self.prices.low) - 3, max(self.prices.high) + 3),
+                output_backend=backend,
             )
             chart.toolbar.logo = None  # remove bokeh logo and link to https://bokeh.org/
             chart.xaxis.major_label_orientation = pi / 6
@@ -1007,9 +1706,9 @@ class PriceGenerator:
             )
             chart.add_layout(summaryInfo, "right")
 
-            # preparing data for candles:
-            inc = self.prices.open <= self.prices.close
-            dec = self.prices.open > self.prices.close
+            # preparing data for candles, all glyphs of both charts share one data source, and up and down candles are selected by views:
+            incFilter = BooleanFilter(booleans=candles.open.values <= candles.close.values)
+            decFilter = ~incFilter
             candleWidth = 108000  # as for 5 minutes by default
 
             if self.timeframe <= timedelta(days=31):
@@ -1039,19 +1738,20 @@ class PriceGenerator:
             if self.timeframe <= timedelta(minutes=1):
                 candleWidth = 21600  # 12 * 60 * 30   # for 1 minute
 
+            candleWidth *= len(self.prices) / len(candles)  # bucket of candles is wider than one candle
+
             disabledObjects = []  # bokeh objects to hide by default when page is loaded
 
-            # preparing data for hover tooltips:
-            source = {
-                "candle": [x + 1 for x in range(-len(self.prices.close), 0, 1)],
-                "datetime": self.prices.datetime,
-                "open": self.prices.open,
-                "high": self.prices.high,
-                "low": self.prices.low,
-                "close": self.prices.close,
-                "volume": self.prices.volume,
-            }
-            hoverData = ColumnDataSource(data=source)
+            # preparing data for candles and hover tooltips, numbers are embedded as typed arrays of the smallest exact types:
+            source = ColumnDataSource(data={
+                "candle": CompactArray(np.cumsum(candles.candles.values) - len(self.prices) if downsampling else np.arange(1 - len(self.prices), 1)),  # the last candle of every bucket
+                "datetime": candles.datetime.values,
+                "open": CompactArray(candles.open.values, self._precision),
+                "high": CompactArray(candles.high.values, self._precision),
+                "low": CompactArray(candles.low.values, self._precision),
+                "close": CompactArray(candles.close.values, self._precision),
+                "volume": CompactArray(candles.volume.values),
+            })
             hover = chart.select(dict(type=HoverTool))
             hover.name = "candle"
             hover.tooltips = [
@@ -1079,16 +1779,16 @@ class PriceGenerator:
             hoverOnCandles = chart.segment(
                 x0="datetime", y0="high", x1="datetime", y1="low",
                 color="#20ff00" if darkTheme else "black",
-                line_alpha=1, name="candle", source=hoverData,
+                line_alpha=1, name="candle", source=source,
             )
             hover.renderers = [hoverOnCandles]  # hover on only for candle bodies
             chart.vbar(
-                x=self.prices.datetime[inc], width=candleWidth, bottom=self.prices.open[inc], top=self.prices.close[inc],
+                x="datetime", width=candleWidth, bottom="open", top="close", source=source, view=CDSView(filter=incFilter),
                 fill_color="black" if darkTheme else "white", line_color="#20ff00" if darkTheme else "black",
                 line_width=1, fill_alpha=1, line_alpha=1,
             )
             chart.vbar(
-                x=self.prices.datetime[dec], width=candleWidth, bottom=self.prices.open[dec], top=self.prices.close[dec],
+                x="datetime", width=candleWidth, bottom="open", top="close", source=source, view=CDSView(filter=decFilter),
                 fill_color="white" if darkTheme else "#999999", line_color="#20ff00" if darkTheme else "black",
                 line_width=1, fill_alpha=1, line_alpha=1,
             )
@@ -1106,10 +1806,12 @@ class PriceGenerator:
                 legendNameAlligator = "Alligator (based on HMA: 13, 8, 5)"
                 legendNameZigZag = "Zig-Zag indicator (with {}% of difference)".format(self.zigZagDeviation * 100)
 
+                indicators = self.indicators  # lazy graph, every indicator below will be calculated on demand
+
                 # preparing for highest close line:
                 highestClose = round(max(self.prices.close.values), self._precision)
                 chart.line(
-                    self.prices.datetime, highestClose,
+                    self.prices.datetime.values[[0, -1]], [highestClose, highestClose],
                     line_width=2, line_color="yellow" if darkTheme else "#339933", line_alpha=1,
                     legend_label=legendNameMain if showControlsOnChart else "",
                 )
@@ -1122,7 +1824,7 @@ class PriceGenerator:
                 # preparing for lowest close line:
                 lowestClose = round(min(self.prices.close.values), self._precision)
                 chart.line(
-                    self.prices.datetime, lowestClose,
+                    self.prices.datetime.values[[0, -1]], [lowestClose, lowestClose],
                     line_width=2, line_color="yellow" if darkTheme else "#339933", line_alpha=1,
                     legend_label=legendNameMain if showControlsOnChart else "",
                 )
@@ -1137,6 +1839,9 @@ class PriceGenerator:
                     left = 0
                     for trendNum in range(len(self.splitCount)):
                         right = left + self.splitCount[trendNum] - 1
+                        if right >= len(self.prices):
+                            break  # trends describe more candles than there are in prices
+
                         chart.line(
                             [self.prices.datetime.values[left], self.prices.datetime.values[right]],
                             [self.prices.close.values[left], self.prices.close.values[right]],
@@ -1155,12 +1860,12 @@ class PriceGenerator:
 
                 # preparing candle's average points:
                 disabledObjects.append(chart.circle(
-                    self.prices.datetime, self.prices.avg,
+                    **LineData("avg", self.prices.datetime, indicators["avg"]),
                     size=3, color="red", alpha=1,
                     legend_label=legendNameAvg if showControlsOnChart else "",
                 ))
                 disabledObjects.append(chart.line(
-                    self.prices.datetime, self.prices.avg,
+                    **LineData("avg", self.prices.datetime, indicators["avg"]),
                     line_width=1, line_color="red", line_alpha=1,
                     legend_label=legendNameAvg if showControlsOnChart else "",
                 ))
@@ -1169,101 +1874,101 @@ class PriceGenerator:
 
                 # Simple Moving Averages (SMA) 5, 20
                 disabledObjects.append(chart.line(
-                    self.prices.datetime, self.stat["sma5"],
+                    **LineData("sma5", self.prices.datetime, indicators["sma5"]),
                     line_width=2, line_color="yellow" if darkTheme else "#999432", line_alpha=1,
                     legend_label=legendNameSMA if showControlsOnChart else "",
                 ))
                 disabledObjects.append(chart.line(
-                    self.prices.datetime, self.stat["sma20"],
+                    **LineData("sma20", self.prices.datetime, indicators["sma20"]),
                     line_width=3, line_color="red", line_alpha=1,
                     legend_label=legendNameSMA if showControlsOnChart else "",
                 ))
 
                 # Long Simple Moving Averages (SMA) 50, 200
                 disabledObjects.append(chart.line(
-                    self.prices.datetime, self.stat["sma50"],
+                    **LineData("sma50", self.prices.datetime, indicators["sma50"]),
                     line_width=2, line_color="#ffbf00", line_alpha=1,
                     legend_label=legendNameSMAlong if showControlsOnChart else "",
                 ))
                 disabledObjects.append(chart.line(
-                    self.prices.datetime, self.stat["sma200"],
+                    **LineData("sma200", self.prices.datetime, indicators["sma200"]),
                     line_width=3, line_color="#ff0040", line_alpha=1,
                     legend_label=legendNameSMAlong if showControlsOnChart else "",
                 ))
 
                 # Hull Moving Averages (HMA) 5, 20
                 disabledObjects.append(chart.line(
-                    self.prices.datetime, self.stat["hma5"],
+                    **LineData("hma5", self.prices.datetime, indicators["hma5"]),
                     line_width=2, line_color="#00ffff" if darkTheme else "#336633", line_alpha=1,
                     legend_label=legendNameHMA if showControlsOnChart else "",
                 ))
                 disabledObjects.append(chart.line(
-                    self.prices.datetime, self.stat["hma20"],
+                    **LineData("hma20", self.prices.datetime, indicators["hma20"]),
                     line_width=3, line_color="#ff00ff" if darkTheme else "#333333", line_alpha=1,
                     legend_label=legendNameHMA if showControlsOnChart else "",
                 ))
 
                 # Volume Weighted Moving Averages (VWMA) 5, 20
                 disabledObjects.append(chart.line(
-                    self.prices.datetime, self.stat["vwma5"],
+                    **LineData("vwma5", self.prices.datetime, indicators["vwma5"]),
                     line_width=2, line_color="blue" if darkTheme else "#666633", line_alpha=1,
                     legend_label=legendNameVWMA if showControlsOnChart else "",
                 ))
                 disabledObjects.append(chart.line(
-                    self.prices.datetime, self.stat["vwma20"],
+                    **LineData("vwma20", self.prices.datetime, indicators["vwma20"]),
                     line_width=3, line_color="#ff8000" if darkTheme else "#333333", line_alpha=1,
                     legend_label=legendNameVWMA if showControlsOnChart else "",
                 ))
 
                 # Bollinger Bands (BBands)
                 disabledObjects.append(chart.line(
-                    self.prices.datetime, self.stat["bbands"]["lower"],
+                    **LineData("bbandsLower", self.prices.datetime, indicators["bbands"]["lower"]),
                     line_width=1, line_color="#66ffff" if darkTheme else "#333333", line_alpha=1,
                     legend_label=legendNameBBANDS if showControlsOnChart else "",
                 ))
                 disabledObjects.append(chart.line(
-                    self.prices.datetime, self.stat["bbands"]["mid"],
+                    **LineData("bbandsMid", self.prices.datetime, indicators["bbands"]["mid"]),
                     line_width=1, line_color="#66ffff" if darkTheme else "#333333", line_alpha=1,
                     legend_label=legendNameBBANDS if showControlsOnChart else "",
                 ))
                 disabledObjects.append(chart.line(
-                    self.prices.datetime, self.stat["bbands"]["upper"],
+                    **LineData("bbandsUpper", self.prices.datetime, indicators["bbands"]["upper"]),
                     line_width=1, line_color="#66ffff" if darkTheme else "#333333", line_alpha=1,
                     legend_label=legendNameBBANDS if showControlsOnChart else "",
                 ))
 
                 # Parabolic Stop and Reverse (psar)
                 disabledObjects.append(chart.circle(
-                    self.prices.datetime, self.stat["psar"]["long"],
+                    **LineData("psarLong", self.prices.datetime, indicators["psar"]["long"]),
                     size=3, line_color="#00ffff" if darkTheme else "#336633", line_alpha=1,
                     legend_label=legendNamePsar if showControlsOnChart else "",
                 ))
                 disabledObjects.append(chart.circle(
-                    self.prices.datetime, self.stat["psar"]["short"],
+                    **LineData("psarShort", self.prices.datetime, indicators["psar"]["short"]),
                     size=3, line_color="#ff00ff" if darkTheme else "#663333", line_alpha=1,
                     legend_label=legendNamePsar if showControlsOnChart else "",
                 ))
 
                 # Alligator (based on HMA 13, 8, 5) for the Alligator indicator (Jaw, Teeth, and Lips)
                 disabledObjects.append(chart.line(
-                    self.prices.datetime, self.stat["hma13"],
+                    **LineData("alligatorJaw", self.prices.datetime, indicators["alligatorJaw"]),
                     line_width=2, line_color="#1a1aff" if darkTheme else "#2100A6", line_alpha=1,
                     legend_label=legendNameAlligator if showControlsOnChart else "",
                 ))
                 disabledObjects.append(chart.line(
-                    self.prices.datetime, self.stat["hma8"],
+                    **LineData("alligatorTeeth", self.prices.datetime, indicators["alligatorTeeth"]),
                     line_width=2, line_color="#ff1a1a" if darkTheme else "#A6000C", line_alpha=1,
                     legend_label=legendNameAlligator if showControlsOnChart else "",
                 ))
                 disabledObjects.append(chart.line(
-                    self.prices.datetime, self.stat["hma5"],
+                    **LineData("alligatorLips", self.prices.datetime, indicators["alligatorLips"]),
                     line_width=2, line_color="#40ff00" if darkTheme else "#17A600", line_alpha=1,
                     legend_label=legendNameAlligator if showControlsOnChart else "",
                 ))
 
                 # Zig-Zag indicator with self.zigZagDeviation of difference parameter
                 disabledObjects.append(chart.line(
-                    self.stat["zigzag3"]["datetimes"], self.stat["zigzag3"]["filtered"],
+                    indicators["zigzag"]["datetimes"], indicators["zigzag"]["filtered"],
                     line_width=3, line_color="cyan" if darkTheme else "#333333", line_alpha=1,
                     legend_label=legendNameZigZag if showControlsOnChart else "",
                 ))
@@ -1271,38 +1976,48 @@ class PriceGenerator:
                 for item in disabledObjects:
                     item.visible = False
 
-            # --- Preparing custom markers:
+                self._DumpStatCache()  # persist calculated indicators together with statistics if `statCacheDir` is set
 
-            if markers is not None and isinstance(markers, pd.DataFrame) and not markers.empty and len(markers.axes) >= 2 and "datetime" in markers.columns and ("markersUpper" in markers.columns or "markersCenter" in markers.columns or "markersLower" in markers.columns):
-                if "markersUpper" in markers.columns:
-                    chart.text(
-                        markers.datetime.values, self.prices.high + 0.5,
-                        text_align="center", text_baseline="bottom", text=markers.markersUpper.values,
-                        angle=0, text_color="lime" if darkTheme else "black", text_font_size="13pt",
-                        legend_label="Markers: upper ({})".format(len(markers.markersUpper[markers.markersUpper != ""])) if showControlsOnChart else "",
-                    )
+            # --- Preparing custom markers:
 
-                if "markersCenter" in markers.columns:
-                    if "avg" not in self.prices.columns:
-                        self.prices["avg"] = round((self.prices.high + self.prices.low) / 2, self._precision)
+            markers = self._EventFrame(markers)
+
+            if markers is not None and isinstance(markers, pd.DataFrame) and not markers.empty and "datetime" in markers.columns and any(column in markers.columns for column in MARKER_COLUMNS):
+                # only not empty markers are drawn, every marker is placed on candle containing its datetime:
+                positions = self.CandlePositions(markers.datetime)
+                markersStyle = {
+                    "markersUpper": {"y": dodge("high", 0.5), "text_baseline": "bottom", "text_color": "lime" if darkTheme else "black", "legend": "upper"},
+                    "markersCenter": {"y": "avg", "text_baseline": "middle", "text_color": "red" if darkTheme else "black", "legend": "center"},
+                    "markersLower": {"y": dodge("low", -0.5), "text_baseline": "top", "text_color": "lime" if darkTheme else "black", "legend": "lower"},
+                }
+
+                for column in [column for column in MARKER_COLUMNS if column in markers.columns]:
+                    texts = markers[column].values
+                    selected = (positions >= 0) & pd.notna(texts) & (texts.astype(str) != "")
+                    rows = positions[selected]
+                    style = markersStyle[column]
+
+                    markersSource = ColumnDataSource(data={
+                        "datetime": self.prices.datetime.values[rows],
+                        "high": self.prices.high.values[rows],
+                        "low": self.prices.low.values[rows],
+                        "text": texts[selected].astype(str),
+                    })
+
+                    if column == "markersCenter":
+                        markersSource.data["avg"] = self.indicators["avg"].values[rows]
 
                     chart.text(
-                        markers.datetime.values, self.prices.avg,
-                        text_align="center", text_baseline="middle", text=markers.markersCenter.values,
-                        angle=0, text_color="red" if darkTheme else "black", text_font_size="13pt",
-                        legend_label="Markers: center ({})".format(len(markers.markersCenter[markers.markersCenter != ""])) if showControlsOnChart else "",
+                        x="datetime", y=style["y"], source=markersSource,
+                        text_align="center", text_baseline=style["text_baseline"], text="text",
+                        angle=0, text_color=style["text_color"], text_font_size="13pt",
+                        legend_label="Markers: {} ({})".format(style["legend"], len(rows)) if showControlsOnChart else "",
                     )
 
-                if "markersLower" in markers.columns:
-                    chart.text(
-                        markers.datetime.values, self.prices.low - 0.5,
-                        text_align="center", text_baseline="top", text=markers.markersLower.values,
-                        angle=0, text_color="lime" if darkTheme else "black", text_font_size="13pt",
-                        legend_label="Markers: lower ({})".format(len(markers.markersLower[markers.markersLower != ""])) if showControlsOnChart else "",
-                    )
+                uLogger.debug("Markers drawn: {} of {} rows".format(int(np.sum(positions >= 0)), len(markers)))
 
             else:
-                uLogger.debug("Marker data must be the Pandas DataFrame object! Or `None` (by default). Marker is a custom symbol, example: ×, ↓ or ↑. Dataframe with markers must contain at least two columns. There are `datetime` with date and time and some markers columns (`markersUpper`, `markersCenter` or `markersLower`). Length of markers series must be equal to the length of main candles series.")
+                uLogger.debug("Marker data must be the Pandas DataFrame object, Pandas DataFrame with datetime index or list of dictionaries! Or `None` (by default). Marker is a custom symbol, example: ×, ↓ or ↑. Markers must contain `datetime` with date and time and some markers columns (`markersUpper`, `markersCenter` or `markersLower`).")
 
             if not (showControlsOnChart or showStatOnChart):
                 summaryInfo.visible = False
@@ -1310,16 +2025,22 @@ class PriceGenerator:
             # --- Preparing custom lines:
 
             if lines is not None and isinstance(lines, list) and lines:
-                for line in lines:
-                    if isinstance(line, pd.DataFrame) and len(line.axes) >= 2 and "datetime" in line.columns:
+                for line in map(self._EventFrame, lines):
+                    if isinstance(line, pd.DataFrame) and len(line.columns) >= 2 and "datetime" in line.columns:
+                        name = [column for column in line.columns if column != "datetime"][0]
+                        datetimes = pd.to_datetime(line.datetime)
+
+                        if datetimes.dt.tz is None and self.prices.datetime.dt.tz is not None:
+                            datetimes = datetimes.dt.tz_localize(self.prices.datetime.dt.tz, ambiguous="NaT", nonexistent="NaT")  # as for markers, see `CandlePositions()`
+
                         chart.line(
-                            line.datetime, line[line.columns[1]],
+                            **LineData("line_{}".format(name), datetimes, line[name]),
                             line_width=3, line_color="red" if darkTheme else "#666666", line_alpha=1,
-                            legend_label="Line: " + line.columns[1] if showControlsOnChart else "",
+                            legend_label="Line: {}".format(name) if showControlsOnChart else "",
                         )
 
                     else:
-                        uLogger.debug("Every custom line must be the Pandas DataFrame object! Line data must contain at least two columns: `datetime` with date and time and 2-nd column `custom_line_name` with y-coordinates. Length of the chart-line dataframes must be equal to the length of main candle series.")
+                        uLogger.debug("Every custom line must be the Pandas DataFrame object, Pandas Series with datetime index or list of dictionaries! Line data must contain at least two columns: `datetime` with date and time and 2-nd column `custom_line_name` with y-coordinates.")
 
             # --- Volume chart options:
             volumeChart = figure(
@@ -1339,7 +2060,8 @@ class PriceGenerator:
                 min_border_top=0,
                 min_border_bottom=0,
                 x_range=chart.x_range,
-                y_range=Range1d(0, max(self.prices.volume), bounds=(0, max(self.prices.volume))),
+                y_range=Range1d(0, max(candles.volume), bounds=(0, max(candles.volume))),
+                output_backend=backend,
             )
             volumeChart.toolbar.logo = None  # remove bokeh logo and link to https://bokeh.org/
             volumeChart.xaxis.major_label_orientation = pi / 6
@@ -1353,14 +2075,7 @@ class PriceGenerator:
             volumeChart.xgrid.minor_grid_line_alpha = 0.3
             volumeChart.xgrid.minor_grid_line_color = "white" if darkTheme else "gray"
 
-            # preparing data for hover tooltips:
-            volSource = {
-                "candle": [x + 1 for x in range(-len(self.prices.close), 0, 1)],
-                "datetime": self.prices.datetime,
-                "volume": self.prices.volume,
-                "zero": [0] * len(self.prices.volume),
-            }
-            volHoverData = ColumnDataSource(data=volSource)
+            # preparing hover tooltips:
             volHover = volumeChart.select(dict(type=HoverTool))
             volHover.name = "volumes"
             volHover.tooltips = [
@@ -1378,17 +2093,17 @@ class PriceGenerator:
 
             # preparing volume chart:
             hoverOnVolumes = volumeChart.segment(
-                x0="datetime", y0="volume", x1="datetime", y1="zero",
-                color="black", line_alpha=0, name="volumes", source=volHoverData,
+                x0="datetime", y0="volume", x1="datetime", y1=0,
+                color="black", line_alpha=0, name="volumes", source=source,
             )
             volHover.renderers = [hoverOnVolumes]  # hover on only for volume bars
             volumeChart.vbar(
-                x=self.prices.datetime[inc], width=candleWidth, bottom=0, top=self.prices.volume[inc],
+                x="datetime", width=candleWidth, bottom=0, top="volume", source=source, view=CDSView(filter=incFilter),
                 fill_color="black" if darkTheme else "white", line_color="#20ff00" if darkTheme else "black",
                 line_width=1, fill_alpha=1, line_alpha=1,
             )
             volumeChart.vbar(
-                x=self.prices.datetime[dec], width=candleWidth, bottom=0, top=self.prices.volume[dec],
+                x="datetime", width=candleWidth, bottom=0, top="volume", source=source, view=CDSView(filter=decFilter),
                 fill_color="white" if darkTheme else "#999999", line_color="#20ff00" if darkTheme else "black",
                 line_width=1, fill_alpha=1, line_alpha=1,
             )
@@ -1446,32 +2161,30 @@ class PriceGenerator:
         else:
             uLogger.info("Rendering Pandas DataFrame as Google Candlestick chart...")
 
-            self.DetectTimeframe()  # auto-detect time delta between last two neighbour candles
+            self.DetectTimeframe()  # auto-detect the most frequent time delta between neighbour candles
             infoBlock = self.GetStatistics()  # calculating some indicators
 
             title = self._chartTitle if title is None or not title else title  # chart title
 
+            renderedTemplate = GetTemplate(self.j2template, bytecodeCacheDir=self.j2cacheDir)  # compiled only once, see `Templates` module
+
             if self.j2model is None or not self.j2model:
                 uLogger.debug("Preparing Google Candlestick chart configuration...")
                 self.j2model = {"info": infoBlock, "title": title}
-                googleDates = [pd.to_datetime(date).strftime("%Y-%m-%d %H:%M:%S") for date in self.prices.datetime.values]
-                data = zip(googleDates, self.prices.low, self.prices.open, self.prices.close, self.prices.high)
-                self.j2model["candlesData"] = [list(x) for x in data]
+                self.j2model["candlesColumns"] = EncodeCandles(self.prices, self._precision)  # base64-encoded typed arrays, see `Encoding` module
+
+                if "candlesData" in TemplateVariables(renderedTemplate):  # templates with text list of candles are still supported
+                    googleDates = np.char.replace(np.datetime_as_string(self.prices.datetime.values, unit="s"), "T", " ")  # all dates are formatted at once
+                    data = zip(googleDates.tolist(), self.prices.low.tolist(), self.prices.open.tolist(), self.prices.close.tolist(), self.prices.high.tolist())
+                    self.j2model["candlesData"] = list(map(list, data))
 
             else:
                 uLogger.debug("Using custom chart model")
 
             # --- Rendering and saving chart as HTML-file and markdown-file with statistics:
-            if os.path.exists(self.j2template):
-                renderedTemplate = jinja2.Template(open(self.j2template, "r", encoding="UTF-8").read())
-
-            else:
-                renderedTemplate = jinja2.Template(self.j2template)
-
-            htmlMain = renderedTemplate.render(self.j2model)
-
             with open(fileName, "w", encoding="UTF-8") as fH:
-                fH.write(htmlMain)
+                for chunk in renderedTemplate.generate(self.j2model):  # template is rendered by parts directly into file
+                    fH.write(chunk)
             with open("{}.md".format(fileName), "w", encoding="UTF-8") as fH:
                 fH.write("\n".join(infoBlock))
 
@@ -1480,6 +2193,322 @@ class PriceGenerator:
 
             uLogger.info("Pandas DataFrame rendered as HTML-file [{}]".format(os.path.abspath(fileName)))
 
+    def RenderImage(
+            self, fileName: Optional[str] = "index.png", darkTheme: bool = False, title: Optional[str] = None,
+            width: int = 1800, height: int = 940, dpi: int = 100, indicators: Optional[list[str]] = None,
+            showStatOnChart: bool = False, maxCandles: Optional[int] = None,
+    ) -> Figure:
+        """
+        Rendering prices from Pandas DataFrame as static image of candlesticks with volumes (e.g. for thumbnails and CI artefacts)
+        and save it to PNG, SVG or other file supported by matplotlib. It is rendered without GUI by Agg backend.
+
+        All candles are drawn at once with matplotlib collections: shadows with one `LineCollection` and bodies and volumes
+        with `PolyCollection`, not with patch per candle. Long series are downsampled the same way as in `RenderBokeh()`.
+
+        :param fileName: image file path, format is defined by extension, e.g. `.png` or `.svg`. If `None`, then image is not saved. `index.png` by default.
+        :param darkTheme: chart theme. `False` by default, mean that will be used light theme, `True` mean dark theme.
+        :param title: specific chart title. If `None`, then used auto-generated title. `None` by default.
+        :param width: image width in pixels. 1800 px by default.
+        :param height: image height in pixels. 940 px by default.
+        :param dpi: dots per inch of image. 100 by default.
+        :param indicators: names of indicators to draw as lines, e.g. `["sma20", "bbands", "zigzag"]`, see `indicators` graph. `None` by default.
+        :param showStatOnChart: if `True`, then statistics are calculated, placed on the right side of image and saved to markdown file. `False` by default.
+        :param maxCandles: level of detail, see `RenderBokeh()`. If `None` (by default), then image width in pixels is used. `0` mean that all candles are drawn.
+        :return: `matplotlib.figure.Figure` object.
+        """
+        if self.prices is None or self.prices.empty:
+            raise Exception("Empty price data! Generate or load prices before render as image!")
+
+        uLogger.info("Rendering Pandas DataFrame as image...")
+
+        self.DetectTimeframe()  # auto-detect the most frequent time delta between neighbour candles
+        infoBlock = self.GetStatistics() if showStatOnChart else []  # statistics are shared with other renderers by cache
+
+        title = self._chartTitle if title is None or not title else title
+        maxCandles = width if maxCandles is None else maxCandles
+        downsampling = maxCandles > 0 and len(self.prices) > maxCandles
+        candles = OHLCVBuckets(self.prices, buckets=maxCandles) if downsampling else self.prices
+
+        background = "black" if darkTheme else "white"
+        foreground = "#20ff00" if darkTheme else "black"
+        incColor = "black" if darkTheme else "white"
+        decColor = "white" if darkTheme else "#999999"
+
+        figure_ = Figure(figsize=(width / dpi, height / dpi), dpi=dpi, facecolor=background)
+        FigureCanvasAgg(figure_)
+        grid = figure_.add_gridspec(2, 2 if showStatOnChart else 1, height_ratios=[5, 1], width_ratios=[4, 1] if showStatOnChart else None, hspace=0.05, wspace=0.02)
+        chart = figure_.add_subplot(grid[0, 0], facecolor=background)
+        volumeChart = figure_.add_subplot(grid[1, 0], facecolor=background, sharex=chart)
+
+        # x-coordinates are matplotlib dates: days since 1970-01-01 (UTC), as numbers of `datetime64` values
+        x = candles.datetime.values.astype("datetime64[ms]").astype(np.int64) / 86400000
+        candleWidth = 0.8 * (np.median(np.diff(x)) if len(x) > 1 else self.timeframe / timedelta(days=1))
+        left, right = x - candleWidth / 2, x + candleWidth / 2
+        inc = candles.open.values <= candles.close.values
+        colors = np.where(inc, incColor, decColor)
+
+        # shadows, bodies and volumes of all candles are drawn by three collections
+        chart.add_collection(LineCollection(np.stack([np.column_stack([x, candles.low.values]), np.column_stack([x, candles.high.values])], axis=1), colors=foreground, linewidths=0.8))
+        bottom, top = np.minimum(candles.open.values, candles.close.values), np.maximum(candles.open.values, candles.close.values)
+        chart.add_collection(PolyCollection(np.stack([np.column_stack(corner) for corner in [(left, bottom), (left, top), (right, top), (right, bottom)]], axis=1), facecolors=colors, edgecolors=foreground, linewidths=0.5))
+        volumes = candles.volume.values.astype(np.float64)
+        zeros = np.zeros(len(volumes))
+        volumeChart.add_collection(PolyCollection(np.stack([np.column_stack(corner) for corner in [(left, zeros), (left, volumes), (right, volumes), (right, zeros)]], axis=1), facecolors=colors, edgecolors=foreground, linewidths=0.5))
+
+        # optional indicator lines, downsampled with LTTB algorithm if level of detail is reduced
+        datetimes = self.prices.datetime.values.astype("datetime64[ms]").astype(np.int64) / 86400000
+        for name in indicators or []:
+            values = self.indicators[name]
+
+            if isinstance(values, pd.DataFrame) and "datetimes" in values.columns:  # sparse points, e.g. Zig-Zag
+                lines = {name: (values["datetimes"].values.astype("datetime64[ms]").astype(np.int64) / 86400000, values.drop(columns="datetimes").iloc[:, 0].values)}
+
+            else:
+                columns = values[INDICATOR_LINES.get(name, values.columns)].items() if isinstance(values, pd.DataFrame) else [(name, values)]
+                lines = {"{} {}".format(name, column) if column != name else name: (datetimes, series.values) for column, series in columns}
+
+            for label, (lineX, lineY) in lines.items():
+                selected = LTTB(lineX, lineY, threshold=maxCandles) if downsampling else slice(None)  # NaN breaks line
+                chart.plot(lineX[selected], lineY[selected], linewidth=1, label=label)
+
+        if indicators:
+            legend = chart.legend(loc="upper left", fontsize=8, facecolor=background)
+            for text in legend.get_texts():
+                text.set_color(foreground)  # `labelcolor` parameter is not available in matplotlib < 3.5
+
+        chart.set_xlim(left[0] - candleWidth, right[-1] + candleWidth)
+        chart.set_ylim(candles.low.min() - 3, candles.high.max() + 3)
+        volumeChart.set_ylim(0, max(volumes.max(), 1))
+        volumeChart.xaxis_date()
+        chart.set_title(title, fontsize=10, color=foreground)
+        chart.set_ylabel("Price", color=foreground)
+        volumeChart.set_ylabel("Volume", color=foreground)
+        chart.tick_params(labelbottom=False)
+
+        for axis in [chart, volumeChart]:
+            axis.grid(True, linestyle=(0, (6, 4)), alpha=0.4, color="white" if darkTheme else "gray")
+            axis.tick_params(colors=foreground, labelsize=8)
+
+        if showStatOnChart:
+            info = figure_.add_subplot(grid[:, 1], facecolor=background)
+            info.axis("off")
+            info.text(0, 1, "\n".join(infoBlock), va="top", ha="left", family="monospace", fontsize=6, color=foreground, wrap=True)
+
+        if fileName:
+            figure_.savefig(fileName, dpi=dpi, facecolor=background, bbox_inches="tight")
+            uLogger.info("Pandas DataFrame saved as image [{}]".format(os.path.abspath(fileName)))
+
+            if showStatOnChart:
+                mdFile = "{}.md".format(fileName)
+                with open(mdFile, "w", encoding="UTF-8") as fH:
+                    fH.write("\n".join(infoBlock))
+
+                uLogger.info("Statistics saved to [{}]".format(os.path.abspath(mdFile)))
+
+        return figure_
+
+    def PageBounds(self, period: Union[str, int] = "month") -> list[tuple[int, int]]:
+        """
+        Split chain of candles into pages by calendar period or by fixed count of candles, see `RenderPages()`.
+
+        :param period: one of `PAGE_PERIODS` (`"year"`, `"month"`, `"week"` or `"day"`) or count of candles on every page. `"month"` by default.
+        :return: list of tuples `(start, stop)` with indexes of the first candle and after the last candle of every page.
+        """
+        if self.prices is None or self.prices.empty:
+            raise Exception("Empty price data! Generate or load prices before split them into pages!")
+
+        if isinstance(period, str) and period.isdigit():
+            period = int(period)
+
+        if isinstance(period, int):
+            if period <= 0:
+                raise Exception("Count of candles on page must be positive!")
+
+            return [(start, min(start + period, len(self.prices))) for start in range(0, len(self.prices), period)]
+
+        if period not in PAGE_PERIODS:
+            raise Exception("Unknown period of pages: {}! Use one of: {} or count of candles".format(period, ", ".join(PAGE_PERIODS)))
+
+        datetimes = self.prices.datetime.dt.tz_localize(None) if self.prices.datetime.dt.tz is not None else self.prices.datetime  # periods in local time of candles
+        ordinals = datetimes.dt.to_period(PAGE_PERIODS[period]).array.asi8
+        starts = [0] + list(np.flatnonzero(np.diff(ordinals)) + 1)
+
+        return list(zip(starts, starts[1:] + [len(self.prices)]))
+
+    def RenderPages(
+            self, outputDir: str = "pages", period: Union[str, int] = "month", kind: str = "bokeh", workers: Optional[int] = None,
+            indexFile: Optional[str] = "index.html", **renderArgs,
+    ) -> dict:
+        """
+        Render very long chain of candles as many small charts (pages) in parallel processes and write index page with links to all pages,
+        so every single page stays small and fast to open.
+
+        Indicators are calculated only once for the whole chain and then sliced for every page (see `Window()`), so moving averages
+        at the beginning of every page are the same as on the whole chart. Pages are rendered by `RenderBatch()`.
+
+        :param outputDir: directory for pages. Default: `pages`.
+        :param period: one of `PAGE_PERIODS` (`"year"`, `"month"`, `"week"` or `"day"`) or count of candles on every page. `"month"` by default.
+        :param kind: one of `RENDER_KINDS`: `"bokeh"` (by default), `"google"` or `"png"`.
+        :param workers: count of worker processes. If `None` (by default), then count of CPU is used. `1` mean rendering in current process.
+        :param indexFile: name of index page in `outputDir`. If `None`, then index page is not written. Default: `index.html`.
+        :param renderArgs: other parameters of render method, e.g. `darkTheme=True`.
+        :return: report dictionary of `RenderBatch()`, every rendered chart also has `start`, `stop`, `first` and `last` keys with indexes and datetimes of candles.
+        """
+        bounds = self.PageBounds(period)
+
+        if kind == "bokeh" and renderArgs.get("showStatOnChart", True):
+            names = CHART_INDICATORS
+
+        else:
+            names = (renderArgs.get("indicators") or []) if kind == "png" else []
+
+        for name in names:
+            self.indicators.Get(name)  # shared frame of indicators, calculated once for the whole chain
+
+        uLogger.info("Splitting {} candles into {} pages (period: {})...".format(len(self.prices), len(bounds), period))
+
+        pages = {"page{:05d}".format(number + 1): self.Window(start, stop, indicators=names, customs=False) for number, (start, stop) in enumerate(bounds)}
+        pageBounds = dict(zip(pages.keys(), bounds))
+        report = RenderBatch(items=pages, workers=workers, kind=kind, outputDir=outputDir, indexFile=None, **renderArgs)
+
+        for chart in report["charts"] + report["failed"]:
+            chart["start"], chart["stop"] = pageBounds[chart["name"]]
+            chart["first"] = pd.to_datetime(self.prices.datetime.values[chart["start"]]).strftime("%Y-%m-%d %H:%M:%S")
+            chart["last"] = pd.to_datetime(self.prices.datetime.values[chart["stop"] - 1]).strftime("%Y-%m-%d %H:%M:%S")
+
+        if indexFile:
+            report["index"] = os.path.join(outputDir, indexFile)
+            links = [{
+                "name": "{} — {} ({} candles)".format(chart["first"], chart["last"], chart["stop"] - chart["start"]),
+                "link": os.path.basename(chart["file"]),
+            } for chart in report["charts"]]
+
+            with open(report["index"], "w", encoding="UTF-8") as fH:
+                for chunk in GetTemplate(INDEX_TEMPLATE_J2).generate(title="{}: {} pages".format(self.ticker, len(links)), charts=links, failed=report["failed"]):
+                    fH.write(chunk)
+
+            uLogger.info("Index of pages saved to [{}]".format(os.path.abspath(report["index"])))
+
+        return report
+
+
+def _RenderBatchItem(task: tuple) -> dict:
+    """
+    Render one chart of batch in worker process, see `RenderBatch()`. Errors are returned, not raised, so one broken item does not stop all batch.
+
+    :param task: tuple `(name, prices, fileName, kind, options, renderArgs)`, where `prices` is Pandas DataFrame, path to .CSV-file
+                 or prepared `PriceGenerator` object (`options` are not used for it).
+    :return: dictionary with `name`, `file` and `error` (`None` if chart is rendered) keys.
+    """
+    name, prices, fileName, kind, options, renderArgs = task
+
+    if isinstance(prices, PriceGenerator):
+        priceModel = prices
+
+    else:
+        priceModel = PriceGenerator()
+        priceModel.ticker = name
+
+        for option, value in options.items():
+            setattr(priceModel, option, value)
+
+    try:
+        if isinstance(prices, str):
+            priceModel.LoadFromFile(fileName=prices)
+
+        elif not isinstance(prices, PriceGenerator):
+            priceModel.prices = prices
+
+        if kind == "bokeh":
+            priceModel.RenderBokeh(fileName=fileName, **renderArgs)
+
+        elif kind == "google":
+            priceModel.RenderGoogle(fileName=fileName, **renderArgs)
+
+        else:
+            priceModel.RenderImage(fileName=fileName, **renderArgs)
+
+    except Exception as e:
+        uLogger.warning("Chart [{}] is not rendered! Error message: {}".format(name, e))
+
+        return {"name": name, "file": fileName, "error": str(e)}
+
+    return {"name": name, "file": fileName, "error": None}
+
+
+def RenderBatch(
+        items: Union[list[str], dict[str, pd.DataFrame]], workers: Optional[int] = None, kind: str = "bokeh",
+        outputDir: str = "charts", indexFile: Optional[str] = "index.html", options: Optional[dict] = None, **renderArgs,
+) -> dict:
+    """
+    Render many charts in parallel processes without opening browser, e.g. one chart per ticker for review, and write index page with links to all charts.
+
+    Every chart is rendered by its own `PriceGenerator()` object in process pool. Set `statCacheDir` and `j2cacheDir` in `options`
+    to share calculated statistics and compiled templates between processes and runs. Bokeh charts use CDN resources, so they are not embedded in every file.
+
+    :param items: list of paths to .CSV-files (chart name is file name without extension) or dictionary: chart name -> Pandas DataFrame with prices
+                  or prepared `PriceGenerator` object, e.g. page of long chain (see `RenderPages()`).
+    :param workers: count of worker processes. If `None` (by default), then count of CPU is used. `1` mean rendering in current process.
+    :param kind: one of `RENDER_KINDS`: `"bokeh"` (by default) for `RenderBokeh()`, `"google"` for `RenderGoogle()` or `"png"` for `RenderImage()`.
+    :param outputDir: directory for rendered charts. Default: `charts`.
+    :param indexFile: name of index page in `outputDir`. If `None`, then index page is not written. Default: `index.html`.
+    :param options: dictionary with attributes of `PriceGenerator()` objects, e.g. `{"statCacheDir": "cache", "precision": 2}`.
+    :param renderArgs: other parameters of render method, e.g. `darkTheme=True`. Parameter `viewInBrowser` is always `False` for HTML-charts.
+    :return: report dictionary with `charts` (list of rendered charts with `name` and `file`), `failed` (list of not rendered charts
+             with `name` and `error`), `index` (path to index page), `seconds` and `chartsPerSecond` keys.
+    """
+    if kind not in RENDER_KINDS:
+        raise Exception("Unknown kind of charts: {}! Use one of: {}".format(kind, ", ".join(RENDER_KINDS)))
+
+    workers = (os.cpu_count() or 1) if workers is None or workers <= 0 else workers
+    options = {} if options is None else options
+    renderArgs = renderArgs if kind == "png" else {**renderArgs, "viewInBrowser": False}
+    extension = "png" if kind == "png" else "html"
+    os.makedirs(outputDir, exist_ok=True)
+
+    tasks = []
+    names = set()
+    for name, prices in items.items() if isinstance(items, dict) else [(os.path.splitext(os.path.basename(item))[0], item) for item in items]:
+        uniqueName = name if name not in names else "{}_{}".format(name, len(tasks))  # e.g. the same file names in different directories
+        names.add(uniqueName)
+        tasks.append((uniqueName, prices, os.path.join(outputDir, "{}.{}".format(uniqueName, extension)), kind, options, renderArgs))
+
+    uLogger.info("Rendering {} charts of kind [{}] in {} process(es)...".format(len(tasks), kind, workers))
+    started = time.perf_counter()
+
+    if workers == 1 or len(tasks) <= 1:
+        results = [_RenderBatchItem(task) for task in tasks]
+
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_RenderBatchItem, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+    seconds = time.perf_counter() - started
+    charts = [result for result in results if result["error"] is None]
+    failed = [result for result in results if result["error"] is not None]
+
+    report = {
+        "charts": charts,
+        "failed": failed,
+        "index": None,
+        "seconds": seconds,
+        "chartsPerSecond": len(charts) / seconds if seconds > 0 else float("inf"),
+    }
+
+    if indexFile:
+        report["index"] = os.path.join(outputDir, indexFile)
+        links = [{"name": chart["name"], "link": os.path.basename(chart["file"])} for chart in charts]
+
+        with open(report["index"], "w", encoding="UTF-8") as fH:
+            for chunk in GetTemplate(INDEX_TEMPLATE_J2).generate(title="Charts: {}".format(len(charts)), charts=links, failed=failed):
+                fH.write(chunk)
+
+        uLogger.info("Index of charts saved to [{}]".format(os.path.abspath(report["index"])))
+
+    uLogger.info("Rendered {} of {} charts in {:.2f} sec ({:.2f} charts/sec)".format(len(charts), len(tasks), seconds, report["chartsPerSecond"]))
+
+    return report
+
 
 def ParseArgs():
     """This function get and parse command line keys."""
@@ -1507,6 +2536,11 @@ def ParseArgs():
     parser.add_argument("--trend-deviation", type=float, default=0.005, help="Option: relative deviation for trend detection, 0.005 mean ±0.005 by default. No trend if (1st_close - last_close) / 1st_close <= trend_deviation.")
     parser.add_argument("--zigzag", type=float, default=0.03, help="Option: relative deviation to detection points of Zig-Zag indicator, 0.03 by default.")
     parser.add_argument("--sep", type=str, default=None, help="Option: separator in CSV-file, if None then auto-detecting enable.")
+    parser.add_argument("--validate", type=str, choices=["report"] + REPAIR_METHODS, default=None, help="Option: validate OHLCV-candles after loading or generating: `report` only logs broken candles, `clip`, `drop` or `ffill` also repair them. Not used by default.")
+    parser.add_argument("--stat-cache", type=str, default=None, help="Option: directory to persist statistics and indicators between runs, so repeated renders of the same prices skip calculations. Not used by default.")
+    parser.add_argument("--workers", type=int, default=None, help="Option: count of worker processes for the `--render-batch` key. Count of CPU by default.")
+    parser.add_argument("--batch-kind", type=str, choices=RENDER_KINDS, default="bokeh", help="Option: kind of charts for the `--render-batch` key, `bokeh` by default.")
+    parser.add_argument("--page-period", type=str, default="month", help="Option: period of pages for the `--render-pages` key: year, month, week, day or count of candles on every page. `month` by default.")
     parser.add_argument("--dark", action="store_true", default=False, help="Option: if key present, then will be used dark theme for the `--render-bokeh` key. `False` by default for light theme.")
     parser.add_argument("--debug-level", type=int, default=20, help="Option: showing STDOUT messages of minimal debug level, e.g., 10 = DEBUG, 20 = INFO, 30 = WARNING, 40 = ERROR, 50 = CRITICAL.")
 
@@ -1516,6 +2550,10 @@ def ParseArgs():
     parser.add_argument("--save-to", type=str, help="Command: save generated or loaded dataframe to .CSV-file. You can draw chart in additional with `--render-bokeh` or `--render-google` keys.")
     parser.add_argument("--render-bokeh", type=str, help="Command: show chain of candlesticks as interactive Bokeh chart. Used only together with `--load-from` or `--generate` keys.")
     parser.add_argument("--render-google", type=str, help="Command: show chain of candlesticks as non-interactive Google Candlestick chart. Used only together with `--load-from` or `--generate` keys.")
+    parser.add_argument("--render-image", type=str, help="Command: save chain of candlesticks as static image, e.g. PNG or SVG file. Used only together with `--load-from` or `--generate` keys.")
+    parser.add_argument("--render-pages", type=str, help="Command: split long chain of candlesticks into pages by `--page-period` and render them in parallel processes into directory, e.g. `--render-pages pages`, with `index.html` to navigate between pages. Used only together with `--load-from` or `--generate` keys.")
+    parser.add_argument("--render-live", type=int, help="Command: serve live-updating Bokeh chart on local port, e.g. `--render-live 5006`. New candle is generated every second. Used only together with `--load-from` or `--generate` keys.")
+    parser.add_argument("--render-batch", type=str, nargs="+", help="Command: render charts of many .CSV-files in parallel processes, e.g. `--render-batch charts *.csv`. The first value is output directory, where charts and `index.html` with links to all charts are saved. Browser is not opened.")
 
     cmdArgs = parser.parse_args()
     return cmdArgs
@@ -1602,9 +2640,15 @@ def Main():
         if args.zigzag:
             priceModel.zigZagDeviation = args.zigzag  # relative deviation to detection points of ZigZag indicator, 0.03 by default
 
+        if args.validate:
+            priceModel.validation = args.validate  # opt-in validation of candles after loading or generating
+
+        if args.stat_cache:
+            priceModel.statCacheDir = args.stat_cache  # directory to persist statistics and indicators between runs
+
         # --- do one or more commands:
 
-        if not args.load_from and not args.generate and not args.save_to and not args.render_bokeh:
+        if not args.load_from and not args.generate and not args.save_to and not args.render_bokeh and not args.render_image and not args.render_batch and not args.render_pages and not args.render_live:
             raise Exception("At least one command must be selected! See: python PriceGenerator.py --help")
 
         if args.load_from:
@@ -1634,6 +2678,43 @@ def Main():
                 viewInBrowser=True,
             )
 
+        if args.render_image:
+            priceModel.RenderImage(
+                fileName=args.render_image,
+                darkTheme=args.dark,
+            )
+
+        if args.render_batch:
+            if len(args.render_batch) < 2:
+                raise Exception("Output directory and at least one .CSV-file must be set for `--render-batch` key!")
+
+            options = {"sep": priceModel.sep, "zigZagDeviation": priceModel.zigZagDeviation, "trendDeviation": priceModel.trendDeviation}
+            options.update({"statCacheDir": priceModel.statCacheDir} if priceModel.statCacheDir else {})
+            options.update({"validation": priceModel.validation} if priceModel.validation else {})
+
+            RenderBatch(
+                items=args.render_batch[1:],
+                workers=args.workers,
+                kind=args.batch_kind,
+                outputDir=args.render_batch[0],
+                options=options,
+                **({"darkTheme": args.dark} if args.batch_kind in ["bokeh", "png"] else {}),
+            )
+
+        if args.render_pages:
+            priceModel.RenderPages(
+                outputDir=args.render_pages,
+                period=args.page_period,
+                kind=args.batch_kind,
+                workers=args.workers,
+                **({"darkTheme": args.dark} if args.batch_kind in ["bokeh", "png"] else {}),
+            )
+
+        if args.render_live:
+            from pricegenerator.LiveChart import ServeLive  # LiveChart module imports this module, so it is imported only here
+
+            ServeLive(priceModel, port=args.render_live, darkTheme=args.dark)
+
     except Exception as e:
         uLogger.error(e)
         exc = tb.format_exc().split("\n")
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+# Author: Timur Gilmullin
+
+"""
+This module measures how statistically similar two series of candles are, e.g. generated prices and real history.
+
+Distributions of log-returns, candle bodies and shadows are compared with two-sample Kolmogorov-Smirnov and Anderson-Darling
+statistics, temporal structure is compared with autocorrelations of returns and absolute returns (calculated with FFT)
+and Hurst exponents. Bodies and shadows are relative to close prices, so series with different price levels are comparable.
+
+Features of one series (sorted samples, autocorrelations, Hurst exponent) can be calculated once with `SeriesFeatures()`
+and then compared with features of many other series, e.g. to score thousands of generated paths against loaded history:
+
+```python
+from pricegenerator.PriceGenerator import PriceGenerator
+from pricegenerator.Similarity import SeriesFeatures, CompareFeatures
+
+history = PriceGenerator()
+history.LoadFromFile("history.csv")
+reference = SeriesFeatures(history.prices)
+
+model = PriceGenerator()
+scores = []
+for _ in range(1000):
+    model.Generate()
+    scores.append(CompareFeatures(reference, SeriesFeatures(model.prices))["score"])
+```
+"""
+
+# Copyright (c) 2022 Gilmillin Timur Mansurovich
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import numpy as np
+import pandas as pd
+
+
+SAMPLES = ["returns", "body", "upperShadow", "lowerShadow"]
+"""Names of compared distributions: log-returns of close prices, candle bodies and upper and lower shadows (relative to close prices)."""
+
+
+def KSDistance(a: np.ndarray, b: np.ndarray, isSorted: bool = False) -> float:
+    """
+    Two-sample Kolmogorov-Smirnov statistic: maximum distance between empirical distribution functions of two samples.
+
+    :param a: the first sample.
+    :param b: the second sample.
+    :param isSorted: `True` if both samples are already sorted.
+    :return: statistic in `[0, 1]` interval, `0` mean the same empirical distributions. NaN if one of samples is empty.
+    """
+    a = np.asarray(a, dtype=np.float64) if isSorted else np.sort(np.asarray(a, dtype=np.float64))
+    b = np.asarray(b, dtype=np.float64) if isSorted else np.sort(np.asarray(b, dtype=np.float64))
+
+    if not len(a) or not len(b):
+        return float("nan")
+
+    if len(a) < len(b):
+        a, b = b, a
+
+    # distribution function of the smaller sample `b` changes only at its points, so maximum distance is reached
+    # at one of points of `b` or just before it: only points of the smaller sample are searched in the bigger one
+    distances = np.concatenate((
+        np.searchsorted(a, b, side="right") / len(a) - np.searchsorted(b, b, side="right") / len(b),
+        np.searchsorted(a, b, side="left") / len(a) - np.searchsorted(b, b, side="left") / len(b),
+    ))
+
+    return float(np.abs(distances).max())
+
+
+def ADDistance(a: np.ndarray, b: np.ndarray, isSorted: bool = False) -> float:
+    """
+    Two-sample Anderson-Darling statistic (Scholz and Stephens, 1987), version for samples with ties. It is more sensitive to tails of distributions than
+    Kolmogorov-Smirnov statistic, which is important for outliers of prices.
+
+    :param a: the first sample.
+    :param b: the second sample.
+    :param isSorted: `True` if both samples are already sorted.
+    :return: non-negative statistic, `0` mean the same empirical distributions. NaN if one of samples is empty.
+    """
+    a = np.asarray(a, dtype=np.float64) if isSorted else np.sort(np.asarray(a, dtype=np.float64))
+    b = np.asarray(b, dtype=np.float64) if isSorted else np.sort(np.asarray(b, dtype=np.float64))
+    n, m = len(a), len(b)
+
+    if not n or not m:
+        return float("nan")
+
+    total = n + m
+
+    # linear merge of sorted samples instead of sorting of pooled sample
+    positions = np.searchsorted(a, b, side="right")
+    pooled = np.insert(a, positions, b)
+    isA = np.ones(total, dtype=bool)
+    isA[positions + np.arange(m)] = False  # positions of points of `b` in pooled sample
+    lasts = np.flatnonzero(pooled[1:] != pooled[:-1])  # the last position of every distinct point except the last one
+    countPooled = (lasts + 1).astype(np.float64)
+    ties = np.diff(np.concatenate(([0], countPooled)))
+    weights = ties / (countPooled * (total - countPooled))
+    countA = np.cumsum(isA)[lasts]
+    countB = countPooled - countA
+
+    return float((
+        (weights * (total * countA - n * countPooled) ** 2).sum() / n + (weights * (total * countB - m * countPooled) ** 2).sum() / m
+    ) / total)
+
+
+def Autocorrelation(values, maxLag: int = 20) -> np.ndarray:
+    """
+    Autocorrelation function for lags `1..maxLag` calculated with FFT in O(N log N), not finite values are ignored.
+
+    :param values: numpy array, Pandas Series or list.
+    :param maxLag: maximum lag.
+    :return: numpy array with `maxLag` autocorrelations (NaN if series is constant or shorter than lags).
+    """
+    x = np.asarray(values, dtype=np.float64)
+    x = x[np.isfinite(x)]
+    x = x - x.mean() if len(x) else x
+
+    if len(x) <= maxLag or not np.any(x):
+        return np.full(maxLag, np.nan)
+
+    size = 1 << int(2 * len(x) - 1).bit_length()  # zero padding to avoid circular correlation
+    spectrum = np.fft.rfft(x, n=size)
+    acf = np.fft.irfft(spectrum * np.conj(spectrum), n=size)[:maxLag + 1]
+
+    return acf[1:] / acf[0]
+
+
+def HurstExponent(values, minSize: int = 8) -> float:
+    """
+    Hurst exponent estimated with rescaled range (R/S) analysis of increments (e.g. log-returns). R/S is calculated for
+    all chunks of every size at once with reshaped arrays, sizes are log-spaced from `minSize` to a half of series.
+    Exponent about 0.5 mean random walk, more than 0.5 mean trending (persistent) series and less than 0.5 mean mean-reverting series.
+
+    :param values: increments of series, e.g. log-returns of close prices. Not finite values are ignored.
+    :param minSize: minimal size of chunks.
+    :return: Hurst exponent, NaN if series is too short.
+    """
+    x = np.asarray(values, dtype=np.float64)
+    x = x[np.isfinite(x)]
+
+    if len(x) < 4 * minSize:
+        return float("nan")
+
+    sizes = np.unique(np.logspace(np.log10(minSize), np.log10(len(x) // 2), num=20).astype(np.int64))
+    logSizes, logRS = [], []
+
+    for size in sizes:
+        chunks = x[:len(x) // size * size].reshape(-1, size)
+        deviations = np.cumsum(chunks - chunks.mean(axis=1, keepdims=True), axis=1)
+        ranges = deviations.max(axis=1) - deviations.min(axis=1)
+        stDevs = chunks.std(axis=1)
+        valid = stDevs > 0
+
+        if np.any(valid):
+            logSizes.append(np.log(size))
+            logRS.append(np.log((ranges[valid] / stDevs[valid]).mean()))
+
+    if len(logSizes) < 2:
+        return float("nan")
+
+    return float(np.polyfit(logSizes, logRS, 1)[0])
+
+
+def SeriesFeatures(prices: pd.DataFrame, maxLag: int = 20) -> dict:
+    """
+    Features of candles series used for comparison: sorted samples of log-returns, relative bodies and shadows,
+    autocorrelations of returns and absolute returns (volatility clustering signature) and Hurst exponent of returns.
+
+    :param prices: Pandas DataFrame with `open`, `high`, `low` and `close` columns.
+    :param maxLag: maximum lag of autocorrelations.
+    :return: dictionary with features, see `SAMPLES` for names of samples and `acfReturns`, `acfAbsReturns`, `hurst` keys.
+    """
+    open_ = prices.open.values.astype(np.float64)
+    high = prices.high.values.astype(np.float64)
+    low = prices.low.values.astype(np.float64)
+    close = prices.close.values.astype(np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(np.log(close))
+        samples = {
+            "returns": returns,
+            "body": np.abs(close - open_) / close,
+            "upperShadow": (high - np.maximum(open_, close)) / close,
+            "lowerShadow": (np.minimum(open_, close) - low) / close,
+        }
+
+    features = {name: np.sort(sample[np.isfinite(sample)]) for name, sample in samples.items()}
+    features["acfReturns"] = Autocorrelation(returns, maxLag=maxLag)
+    features["acfAbsReturns"] = Autocorrelation(np.abs(returns), maxLag=maxLag)
+    features["hurst"] = HurstExponent(returns)
+
+    return features
+
+
+def CompareFeatures(features: dict, otherFeatures: dict) -> dict:
+    """
+    Compare features of two series, see `SeriesFeatures()`.
+
+    :param features: features of the first (e.g. reference) series.
+    :param otherFeatures: features of the second (e.g. generated) series.
+    :return: dictionary with `ks` and `ad` statistics for every sample (e.g. `{"returns": {"ks": 0.05, "ad": 1.2}, ...}`),
+             `acfReturns` and `acfAbsReturns` (root mean square differences of autocorrelations), `hurst` (absolute difference
+             of Hurst exponents) and total `score`: sum of KS statistics, differences of autocorrelations and Hurst exponents.
+             All values are `0` for the same series, less is more similar.
+    """
+    report = {
+        name: {
+            "ks": KSDistance(features[name], otherFeatures[name], isSorted=True),
+            "ad": ADDistance(features[name], otherFeatures[name], isSorted=True),
+        } for name in SAMPLES
+    }
+
+    for name in ["acfReturns", "acfAbsReturns"]:
+        report[name] = float(np.sqrt(np.nanmean((features[name] - otherFeatures[name]) ** 2))) if np.any(np.isfinite(features[name] - otherFeatures[name])) else float("nan")
+
+    report["hurst"] = abs(features["hurst"] - otherFeatures["hurst"])
+    report["score"] = float(np.nansum([report[name]["ks"] for name in SAMPLES] + [report["acfReturns"], report["acfAbsReturns"], report["hurst"]]))
+
+    return report
+
+
+def ComparisonMarkdown(report: dict) -> list[str]:
+    """
+    Prepare text with comparison report in Markdown format.
+
+    :param report: dictionary with comparison report, see `CompareFeatures()`.
+    :return: list with text in Markdown format.
+    """
+    return [
+        "# Similarity",
+        "- Total score (less is more similar): {:.4f}".format(report["score"]),
+    ] + [
+        "- {}: KS = {:.4f}, AD = {:.4f}".format(name, report[name]["ks"], report[name]["ad"]) for name in SAMPLES
+    ] + [
+        "- Autocorrelation of returns, RMS difference: {:.4f}".format(report["acfReturns"]),
+        "- Volatility clustering (autocorrelation of |returns|), RMS difference: {:.4f}".format(report["acfAbsReturns"]),
+        "- Hurst exponent, difference: {:.4f}".format(report["hurst"]),
+    ]
@@ -0,0 +1,939 @@
+# -*- coding: utf-8 -*-
+# Author: Timur Gilmullin
+
+"""
+This module contains statistical routines used by PriceGenerator: trend detection, precision detection, Markdown summary of statistics
+online (streaming) statistics with O(1) updates per candle for live feeds and appended chains of candles,
+and statistics per rolling, expanding or calendar windows of candles.
+Vectorized routines (e.g. run-length encoding of candles directions) work on numpy arrays without Python loops, so they are fast on 10M-candle series.
+"""
+
+# Copyright (c) 2022 Gilmillin Timur Mansurovich
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from collections import deque
+from math import sqrt
+from datetime import timedelta
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from pricegenerator.Patterns import PATTERNS, ScanPatterns, ScanLastCandle, PatternCounts, PatternCountsByRows
+
+
+DEFAULT_QUANTILES = (0.99, 0.95, 0.80, 0.50)
+"""Default quantiles of deltas `|high - low|` calculated in statistics."""
+
+
+def QuantileKey(q: float) -> str:
+    """
+    Key of quantile in dictionaries with statistics, e.g. `0.99 -> "q99"`, `0.5 -> "q50"`, `0.995 -> "q99.5"`.
+
+    :param q: quantile in `[0, 1]` interval.
+    :return: string key.
+    """
+    return "q{:g}".format(round(q * 100, 6))
+
+
+def Trend(firstClose: float, lastClose: float, trendDeviation: float = 0.005) -> str:
+    """
+    Get string with trend: `"UP trend"`, `"DOWN trend"` or `"NO trend"`.
+
+    :param firstClose: close of first candle.
+    :param lastClose: close of last candle.
+    :param trendDeviation: relative deviation for trend detection, 0.005 mean ±0.5% by default.
+    :return: string with trend direction `"NO trend"`, `"UP trend"` or `"DOWN trend"`.
+    """
+    if abs(firstClose - lastClose) / firstClose <= trendDeviation:
+        trend = "NO trend"
+
+    else:
+        trend = "UP trend" if firstClose <= lastClose else "DOWN trend"
+
+    return trend
+
+
+def Trends(firstCloses, lastCloses, trendDeviation: float = 0.005) -> np.ndarray:
+    """
+    Vectorized version of `Trend()` for arrays of first and last closes.
+
+    :param firstCloses: closes of first candles.
+    :param lastCloses: closes of last candles.
+    :param trendDeviation: relative deviation for trend detection, 0.005 mean ±0.5% by default.
+    :return: numpy array of strings `"NO trend"`, `"UP trend"` or `"DOWN trend"`.
+    """
+    firstCloses = np.asarray(firstCloses, dtype=np.float64)
+    lastCloses = np.asarray(lastCloses, dtype=np.float64)
+
+    return np.where(
+        np.abs(firstCloses - lastCloses) / firstCloses <= trendDeviation, "NO trend",
+        np.where(firstCloses <= lastCloses, "UP trend", "DOWN trend"),
+    )
+
+
+def SummaryMarkdown(stat: dict, timeframe: Optional[timedelta], precision: int) -> list[str]:
+    """
+    Prepare text with statistics in Markdown format.
+
+    :param stat: dictionary with statistics in the same format as `PriceGenerator.stat`. Counts of candlestick patterns
+                 are added only if `patterns` key is present and not empty.
+    :param timeframe: time delta between two neighbour candles.
+    :param precision: signs after comma.
+    :return: list with text in Markdown format with statistics.
+    """
+    return [
+        "# Summary",
+        "- Candles count: {}".format(stat["candles"]),
+        "- Timeframe: {}".format(timeframe),
+        "- Precision (signs after comma): {}".format(stat["precision"]),
+        "- Close, first: {}".format(round(stat["closeFirst"], precision)),
+        "- Close, last: {}".format(round(stat["closeLast"], precision)),
+        "- Close, max: {}".format(round(stat["closeMax"], precision)),
+        "- Close, min: {}".format(round(stat["closeMin"], precision)),
+        "- Diapason, |close_max - close_min|: {}".format(round(stat["diapason"], precision)),
+        "- Trend, |close_1st - close_last|: {}".format(stat["trend"]),
+        "",
+        "# Statistics",
+        "- Up candles count: {} ({}%)".format(stat["upCount"], round(100 * stat["upCount"] / stat["candles"], precision)),
+        "- Down candles count: {} ({}%)".format(stat["downCount"], round(100 * stat["downCount"] / stat["candles"], precision)),
+        "- Max of up / down candle chains: {} / {}".format(stat["upCountChainMax"], stat["downCountChainMax"]),
+        "- Max delta, |high - low|: {}".format(round(stat["deltas"]["max"], precision)),
+        "- Min delta, |high - low|: {}".format(round(stat["deltas"]["min"], precision)),
+        "- Delta's std. dev.: {}".format(round(stat["deltas"]["stDev"], precision)),
+    ] + [
+        "  - {} percentile: ≤ {}".format(key[1:], round(value, precision)) for key, value in stat["deltas"].items() if key.startswith("q") and key != "q50"
+    ] + [
+        "- Cumulative sum of volumes: {}".format(stat["cumSumVolumes"]),
+    ] + ([
+        "- Candlestick patterns: {}".format(", ".join("{}: {}".format(name, count) for name, count in stat["patterns"].items())),
+    ] if stat.get("patterns") else [])
+
+
+def DistributionSummary(values, quantiles: Union[list[float], tuple[float, ...]] = DEFAULT_QUANTILES) -> dict:
+    """
+    Summary of distribution of values in one pass over numpy array: count, mean, population standard deviation, min, max,
+    skewness, excess kurtosis and all requested quantiles. All quantiles are calculated with one partitioning pass
+    (linear interpolation, the same as Pandas uses by default). Not finite values (NaN, inf) are ignored.
+
+    It can be used for any series: deltas, bodies, shadows, returns, volumes and so on.
+
+    :param values: numpy array, Pandas Series or list.
+    :param quantiles: list of quantiles in `[0, 1]` interval. Default: `(0.99, 0.95, 0.80, 0.50)`.
+    :return: dictionary with `count`, `mean`, `stDev`, `min`, `max`, `skew`, `kurtosis` and quantiles (see `QuantileKey()`, e.g. `q99`).
+    """
+    x = np.asarray(values, dtype=np.float64)
+    x = x[np.isfinite(x)]
+    summary = {"count": len(x)}
+
+    if not len(x):
+        summary.update({key: float("nan") for key in ["mean", "stDev", "min", "max", "skew", "kurtosis"]})
+        summary.update({QuantileKey(q): float("nan") for q in quantiles})
+
+        return summary
+
+    mean = x.mean()
+    centered = x - mean
+    squared = centered * centered
+    m2 = squared.mean()
+    m3 = (squared * centered).mean()
+    m4 = (squared * squared).mean()
+
+    summary["mean"] = float(mean)
+    summary["stDev"] = float(sqrt(m2))
+    summary["min"] = float(x.min())
+    summary["max"] = float(x.max())
+    summary["skew"] = float(m3 / m2 ** 1.5) if m2 > 0 else 0.
+    summary["kurtosis"] = float(m4 / m2 ** 2 - 3) if m2 > 0 else 0.
+
+    if len(quantiles):
+        summary.update(zip([QuantileKey(q) for q in quantiles], np.quantile(x, quantiles).tolist()))
+
+    return summary
+
+
+def PrecisionOfValues(values: np.ndarray, maxPrecision: int = 15) -> np.ndarray:
+    """
+    Vectorized count of signs after comma for every value: the smallest precision `p` for which `value * 10^p`
+    is an integer (within float rounding errors). So float artefacts, e.g. `0.1 + 0.2 = 0.30000000000000004`, are handled as `0.3`.
+    Integer values of float type have precision 1 (`2.0 -> 1`), values of integer types have precision 0.
+
+    :param values: numpy array with values.
+    :param maxPrecision: maximal precision to test, values with more signs after comma get this precision. 15 by default.
+    :return: numpy array of `int8` with precision of every value.
+    """
+    values = np.asarray(values)
+
+    if values.dtype.kind in "iub":
+        return np.zeros(len(values), dtype=np.int8)
+
+    values = np.abs(values.astype(np.float64))
+    result = np.full(len(values), maxPrecision, dtype=np.int8)
+    unresolved = np.arange(len(values))
+    tolerance = 16 * np.finfo(np.float64).eps
+
+    for precision in range(maxPrecision + 1):
+        if not len(unresolved):
+            break
+
+        scaled = values[unresolved] * 10. ** precision
+        isInteger = np.abs(scaled - np.rint(scaled)) <= tolerance * np.maximum(scaled, 1.)
+        result[unresolved[isInteger]] = precision
+        unresolved = unresolved[~isInteger]
+
+    result[result == 0] = 1  # float values always have one sign after comma, e.g. "2.0"
+
+    return result
+
+
+def DetectPrecision(examples, maxPrecision: int = 15, sampleSize: int = 100000, confidence: float = 0.999) -> int:
+    """
+    Auto-detect precision from example values as the most common count of signs after comma. E.g. `0.123 -> 3`, `0.12345 -> 5` and so on.
+    If there are several most common values, then the first encountered one is used (the same as `statistics.mode()` does).
+
+    Values are tested against integer grids of candidate precisions without converting to strings (see `PrecisionOfValues()`).
+    On huge inputs only random sample of values is tested. The sample grows (up to all values) while the lower confidence bound
+    of the most common precision frequency is not above the upper bound of the second one (Hoeffding's inequality).
+
+    :param examples: chain with examples of float values: numpy array, Pandas Series or list.
+    :param maxPrecision: maximal precision to test. 15 by default.
+    :param sampleSize: initial size of sample for huge inputs. 100000 by default.
+    :param confidence: confidence level for sampling. 0.999 by default.
+    :return: detected precision, never negative (e.g. 0 for integer prices). Precision is 2 (default) if there are no finite values.
+    """
+    values = np.asarray(examples)
+    maxPrecision = max(0, maxPrecision)
+
+    if values.dtype.kind not in "iubf":
+        values = values.astype(np.float64)
+
+    if values.dtype.kind == "f":
+        values = values[np.isfinite(values)]
+
+    if not len(values):
+        return 2
+
+    rng = np.random.default_rng(seed=len(values))
+    size = sampleSize
+
+    while True:
+        if size >= len(values):
+            digits = PrecisionOfValues(values, maxPrecision)
+
+        else:
+            digits = PrecisionOfValues(values[np.sort(rng.choice(len(values), size=size, replace=False))], maxPrecision)
+
+        counts = np.bincount(digits, minlength=maxPrecision + 1)
+        modes = np.flatnonzero(counts == counts.max())
+
+        if size >= len(values):
+            return max(0, int(modes[0]) if len(modes) == 1 else int(digits[np.argmax(np.isin(digits, modes))]))  # first encountered mode
+
+        if len(modes) == 1:
+            frequencies = np.sort(counts)[::-1] / size
+            bound = sqrt(np.log(2 / (1 - confidence)) / (2 * size))  # Hoeffding's bound for frequency
+
+            if frequencies[0] - bound > frequencies[1] + bound:
+                return max(0, int(modes[0]))
+
+        size *= 4
+
+
+def RunLengths(values) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized run-length encoding: change points are found with one comparison of shifted arrays, without Python loops.
+
+    Example: `RunLengths([True, True, False, True]) -> ([True, False, True], [2, 1, 1], [0, 2, 3])`.
+
+    :param values: numpy array, Pandas Series or list.
+    :return: tuple of numpy arrays: value of every run, length of every run and index of the first element of every run.
+    """
+    values = np.asarray(values)
+
+    if not len(values):
+        return values[:0], np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    starts = np.concatenate(([0], np.flatnonzero(values[1:] != values[:-1]) + 1))
+    lengths = np.diff(np.append(starts, len(values)))
+
+    return values[starts], lengths, starts
+
+
+def ChainStatistics(up) -> dict:
+    """
+    Statistics of candles directions in one pass of run-length encoding: counts of up and down candles,
+    maxima and distributions of lengths of up and down candle chains.
+
+    :param up: boolean array, `True` mean that is up candle, and `False` mean down.
+    :return: dictionary with `upCount`, `downCount`, `upCountChainMax`, `downCountChainMax` (1 if there are no chains),
+             `upChains` and `downChains` (distributions as dictionaries: chain length -> count of chains).
+    """
+    up = np.asarray(up, dtype=bool)
+    runValues, runLengths, _ = RunLengths(up)
+    upLengths = runLengths[runValues]
+    downLengths = runLengths[~runValues]
+    upCount = int(np.count_nonzero(up))
+
+    return {
+        "upCount": upCount,
+        "downCount": len(up) - upCount,
+        "upCountChainMax": int(upLengths.max()) if len(upLengths) else 1,
+        "downCountChainMax": int(downLengths.max()) if len(downLengths) else 1,
+        "upChains": _Distribution(upLengths),
+        "downChains": _Distribution(downLengths),
+    }
+
+
+def _Distribution(lengths: np.ndarray) -> dict:
+    """Distribution of lengths: length -> count, only for lengths with non-zero count."""
+    counts = np.bincount(lengths) if len(lengths) else np.zeros(0, dtype=np.int64)
+    nonZero = np.flatnonzero(counts)
+
+    return dict(zip(nonZero.tolist(), counts[nonZero].tolist()))
+
+
+def TimeIndex(datetimes) -> dict:
+    """
+    Index of timestamps of candles in one vectorized pass over differences of neighbour timestamps: timeframe is the most
+    frequent positive difference (the smallest one if there are several), so missed candles, weekends or holidays do not change it.
+    Positions of gaps (a candle after missed candles), duplicated timestamps and rows out of order are also found.
+
+    :param datetimes: datetimes of candles: Pandas Series, DatetimeIndex, numpy array or list.
+    :return: dictionary with `timeframe` (Pandas Timedelta or `None` if there are no positive differences), `gaps` (positions
+             of candles after gaps), `gapCandles` (count of missed candles in every gap), `duplicates` (positions of candles with
+             the same timestamp as previous one) and `outOfOrder` (positions of candles with timestamp earlier than previous one).
+    """
+    stamps = pd.DatetimeIndex(datetimes).values.astype("datetime64[ns]").view(np.int64)  # UTC nanoseconds for time zone aware datetimes too
+    diffs = np.diff(stamps)
+    positive = diffs[diffs > 0]
+    index = {"timeframe": None}
+
+    if len(positive):
+        values, counts = np.unique(positive, return_counts=True)
+        index["timeframe"] = pd.Timedelta(int(values[np.argmax(counts)]), unit="ns")
+
+    step = index["timeframe"].value if index["timeframe"] is not None else 0
+    gaps = np.flatnonzero(diffs > step) + 1 if step else np.zeros(0, dtype=np.int64)
+    index["gaps"] = gaps
+    index["gapCandles"] = diffs[gaps - 1] // step - 1 if step else np.zeros(0, dtype=np.int64)
+    index["duplicates"] = np.flatnonzero(diffs == 0) + 1
+    index["outOfOrder"] = np.flatnonzero(diffs < 0) + 1
+
+    return index
+
+
+def WindowBounds(prices: pd.DataFrame, window: Union[int, str, timedelta], step: Optional[int] = None, expanding: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Bounds of windows over candles: `[start, end)` positions of every window.
+
+    :param prices: Pandas DataFrame with candles (`datetime` column is used for calendar windows only).
+    :param window: count of candles in window (e.g. `500`), or calendar period as Pandas frequency string or timedelta (e.g. `"1D"`).
+                   Calendar windows are not overlapped and contain candles with the same floored datetime.
+    :param step: step between starts of windows in candles, equal to `window` by default (not overlapped windows). Only for windows in candles.
+    :param expanding: if `True`, then every window starts from the first candle and ends after every `step` candles
+                      (the first window contains `window` candles).
+    :return: tuple of numpy arrays with start and end positions of windows.
+    """
+    count = len(prices)
+
+    if isinstance(window, (str, timedelta, pd.Timedelta)):
+        periods = pd.to_datetime(prices.datetime).dt.floor(pd.Timedelta(window) if isinstance(window, timedelta) else window).values
+        _, _, starts = RunLengths(periods)
+        ends = np.append(starts[1:], count)
+
+        if expanding:
+            starts = np.zeros_like(starts)
+
+        return starts, ends
+
+    if window < 1:
+        raise Exception("Window must be positive count of candles!")
+
+    step = window if step is None else step
+    if step < 1:
+        raise Exception("Step must be positive count of candles!")
+
+    ends = np.arange(window, count + 1, step, dtype=np.int64)
+    starts = np.zeros_like(ends) if expanding else ends - window
+
+    return starts, ends
+
+
+def WindowExtremes(values, starts: np.ndarray, ends: np.ndarray, quantiles: Union[list[float], tuple[float, ...]] = ()) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Minimums, maximums and quantiles of values in every window without slicing of series per window:
+    not overlapped windows are sorted all at once (one sort by window number and value), overlapped windows of the same length
+    are reduced over strided views by chunks, and expanding windows use cumulative maxima and minima.
+    Any other windows are reduced slice by slice.
+
+    :param values: numpy array, Pandas Series or list.
+    :param starts: start positions of windows, see `WindowBounds()`.
+    :param ends: end positions of windows (not included), see `WindowBounds()`.
+    :param quantiles: list of quantiles in `[0, 1]` interval (linear interpolation, the same as Pandas uses by default).
+    :return: tuple of numpy arrays: minimums, maximums and quantiles (matrix windows × quantiles).
+    """
+    x = np.asarray(values, dtype=np.float64)
+    lengths = ends - starts
+    qs = np.asarray(quantiles, dtype=np.float64)
+
+    if not len(starts):
+        return np.zeros(0), np.zeros(0), np.zeros((0, len(qs)))
+
+    if np.all(starts[1:] >= ends[:-1]):
+        # not overlapped windows: one sort of all values by (window number, value)
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        positions = np.arange(lengths.sum()) - np.repeat(offsets - starts, lengths)
+        numbers = np.repeat(np.arange(len(starts)), lengths)
+        ordered = x[positions][np.lexsort((x[positions], numbers))]
+        exact = offsets[:, None] + qs[None, :] * (lengths[:, None] - 1)
+        lower = np.floor(exact).astype(np.int64)
+        upper = np.ceil(exact).astype(np.int64)
+
+        return ordered[offsets], ordered[offsets + lengths - 1], ordered[lower] + (ordered[upper] - ordered[lower]) * (exact - lower)
+
+    if np.all(lengths == lengths[0]):
+        # overlapped windows of the same length: reductions over strided views, by chunks to limit memory
+        views = np.lib.stride_tricks.sliding_window_view(x, lengths[0])
+        chunk = max(1, (1 << 22) // lengths[0])
+        parts = [(views[starts[i:i + chunk]]) for i in range(0, len(starts), chunk)]
+
+        return (
+            np.concatenate([part.min(axis=1) for part in parts]),
+            np.concatenate([part.max(axis=1) for part in parts]),
+            np.concatenate([np.quantile(part, qs, axis=1).T for part in parts]) if len(qs) else np.zeros((len(starts), 0)),
+        )
+
+    if np.any(starts):
+        # any other windows: reduction of every slice
+        parts = [x[start:end] for start, end in zip(starts, ends)]
+
+        return (
+            np.array([part.min() for part in parts]),
+            np.array([part.max() for part in parts]),
+            np.array([np.quantile(part, qs) for part in parts]).reshape(len(parts), len(qs)),
+        )
+
+    # expanding windows: all windows start from the first value
+    return (
+        np.minimum.accumulate(x)[ends - 1],
+        np.maximum.accumulate(x)[ends - 1],
+        np.array([np.quantile(x[:end], qs) for end in ends]).reshape(len(ends), len(qs)),
+    )
+
+
+def RollingStatistics(
+        prices: pd.DataFrame,
+        window: Union[int, str, timedelta] = 500,
+        step: Optional[int] = None,
+        expanding: bool = False,
+        trendDeviation: float = 0.005,
+        quantiles: Union[list[float], tuple[float, ...]] = DEFAULT_QUANTILES,
+) -> pd.DataFrame:
+    """
+    Main statistics of candles (the same as in `PriceGenerator.GetStatistics()`: trend, up and down candles, deltas and volumes)
+    for every rolling, expanding or calendar window, e.g. per 500 candles or per day. Sums are calculated with cumulative sums
+    and extremes and quantiles with `WindowExtremes()`, so statistics are not recalculated for every slice of candles.
+    Chains of candles are not calculated per window.
+
+    :param prices: Pandas DataFrame with candles: `datetime`, `open`, `high`, `low`, `close` and `volume` columns.
+    :param window: count of candles in window, or calendar period as Pandas frequency string or timedelta (e.g. `"1D"`), see `WindowBounds()`.
+    :param step: step between starts of windows in candles, equal to `window` by default.
+    :param expanding: if `True`, then every window starts from the first candle.
+    :param trendDeviation: relative deviation for trend detection, 0.005 mean ±0.5% by default.
+    :param quantiles: quantiles of deltas `|high - low|`. Default: `(0.99, 0.95, 0.80, 0.50)`.
+    :return: Pandas DataFrame with one row per window: `start`, `end` (datetimes of the first and last candles), `candles`,
+             `closeFirst`, `closeLast`, `closeMax`, `closeMin`, `diapason`, `trend`, `upCount`, `downCount`, `upRatio`,
+             `delta_min`, `delta_max`, `delta_mean`, `delta_stDev`, deltas quantiles (e.g. `delta_q99`) and `cumSumVolumes`.
+    """
+    starts, ends = WindowBounds(prices, window=window, step=step, expanding=expanding)
+    candles = ends - starts
+
+    close = prices.close.values.astype(np.float64)
+    delta = prices.high.values.astype(np.float64) - prices.low.values.astype(np.float64)
+    up = prices.close.values >= prices.open.values
+
+    def WindowSums(values: np.ndarray) -> np.ndarray:
+        cumulative = np.concatenate(([0], np.cumsum(values)))
+
+        return cumulative[ends] - cumulative[starts]
+
+    closeMin, closeMax, _ = WindowExtremes(close, starts, ends)
+    deltaMin, deltaMax, deltaQuantiles = WindowExtremes(delta, starts, ends, quantiles)
+
+    shifted = delta - (delta.mean() if len(delta) else 0)  # shift by global mean to reduce cancellation in sums of squares
+    shiftedMean = WindowSums(shifted) / candles
+    deltaVariance = np.maximum(WindowSums(shifted * shifted) / candles - shiftedMean * shiftedMean, 0)
+
+    closeFirst = close[starts]
+    closeLast = close[ends - 1]
+    upCount = WindowSums(up.astype(np.int64))
+    trend = Trends(closeFirst, closeLast, trendDeviation=trendDeviation)
+    datetimes = prices.datetime.values
+
+    table = pd.DataFrame({
+        "start": datetimes[starts],
+        "end": datetimes[ends - 1],
+        "candles": candles,
+        "closeFirst": closeFirst,
+        "closeLast": closeLast,
+        "closeMax": closeMax,
+        "closeMin": closeMin,
+        "diapason": closeMax - closeMin,
+        "trend": trend,
+        "upCount": upCount,
+        "downCount": candles - upCount,
+        "upRatio": upCount / candles,
+        "delta_min": deltaMin,
+        "delta_max": deltaMax,
+        "delta_mean": shiftedMean + (delta.mean() if len(delta) else 0),
+        "delta_stDev": np.sqrt(deltaVariance),
+    })
+
+    for i, q in enumerate(quantiles):
+        table["delta_" + QuantileKey(q)] = deltaQuantiles[:, i]
+
+    table["cumSumVolumes"] = WindowSums(prices.volume.values)
+
+    return table
+
+
+def BatchStatistics(
+        open,
+        high,
+        low,
+        close,
+        volume=None,
+        trendDeviation: float = 0.005,
+        quantiles: Union[list[float], tuple[float, ...]] = DEFAULT_QUANTILES,
+        pathQuantiles: Union[list[float], tuple[float, ...]] = (0.05, 0.50, 0.95),
+) -> tuple[pd.DataFrame, dict]:
+    """
+    Statistics of many price paths at once (e.g. Monte Carlo simulations) on 2D arrays `paths × horizon` with reductions
+    along axis of candles: no DataFrames, indicators or logging per path. Maxima of up and down candle chains are calculated
+    with one run-length encoding of all paths.
+
+    :param open: 2D array of open prices, one row per path.
+    :param high: 2D array of high prices.
+    :param low: 2D array of low prices.
+    :param close: 2D array of close prices.
+    :param volume: 2D array of volumes or `None`.
+    :param trendDeviation: relative deviation for trend detection, 0.005 mean ±0.5% by default.
+    :param quantiles: quantiles of deltas `|high - low|` calculated for every path. Default: `(0.99, 0.95, 0.80, 0.50)`.
+    :param pathQuantiles: quantiles of every statistic across paths in aggregated summary. Default: `(0.05, 0.50, 0.95)`.
+    :return: tuple of Pandas DataFrame with one row of statistics per path (`closeFirst`, `closeLast`, `closeMax`, `closeMin`,
+             `diapason`, `trend`, `upCount`, `downCount`, `upCountChainMax`, `downCountChainMax`, `delta_min`, `delta_max`,
+             `delta_mean`, `delta_stDev`, deltas quantiles, e.g. `delta_q99`, `cumSumVolumes` and counts of candlestick patterns,
+             e.g. `patterns_doji`, see `pricegenerator.Patterns`) and dictionary with aggregated
+             statistics: `paths`, `trends` (frequencies of trends) and `fields` (distribution summary of every numeric statistic
+             across paths, see `DistributionSummary()`).
+    """
+    open_ = np.atleast_2d(np.asarray(open, dtype=np.float64))
+    close = np.atleast_2d(np.asarray(close, dtype=np.float64))
+    delta = np.atleast_2d(np.asarray(high, dtype=np.float64)) - np.atleast_2d(np.asarray(low, dtype=np.float64))
+    paths, horizon = close.shape
+
+    if not paths or not horizon:
+        raise Exception("Empty price paths! Expected 2D arrays with shape `paths × horizon`!")
+
+    up = close >= open_
+    upCount = np.count_nonzero(up, axis=1)
+
+    # run-length encoding of all paths at once: every path starts a new run
+    isStart = np.ones_like(up)
+    isStart[:, 1:] = up[:, 1:] != up[:, :-1]
+    starts = np.flatnonzero(isStart)
+    lengths = np.diff(np.append(starts, up.size))
+    runValues = up.ravel()[starts]
+    firstRuns = np.searchsorted(starts, np.arange(paths) * horizon)
+    upChainMax = np.maximum.reduceat(np.where(runValues, lengths, 0), firstRuns)
+    downChainMax = np.maximum.reduceat(np.where(runValues, 0, lengths), firstRuns)
+
+    closeMax = close.max(axis=1)
+    closeMin = close.min(axis=1)
+    table = pd.DataFrame({
+        "closeFirst": close[:, 0],
+        "closeLast": close[:, -1],
+        "closeMax": closeMax,
+        "closeMin": closeMin,
+        "diapason": closeMax - closeMin,
+        "trend": Trends(close[:, 0], close[:, -1], trendDeviation=trendDeviation),
+        "upCount": upCount,
+        "downCount": horizon - upCount,
+        "upCountChainMax": np.maximum(upChainMax, 1),  # 1 if there are no chains, the same as in `ChainStatistics()`
+        "downCountChainMax": np.maximum(downChainMax, 1),
+        "delta_min": delta.min(axis=1),
+        "delta_max": delta.max(axis=1),
+        "delta_mean": delta.mean(axis=1),
+        "delta_stDev": delta.std(axis=1),
+    })
+
+    if len(quantiles):
+        deltaQuantiles = np.quantile(delta, quantiles, axis=1)
+        for i, q in enumerate(quantiles):
+            table["delta_" + QuantileKey(q)] = deltaQuantiles[i]
+
+    table["cumSumVolumes"] = np.atleast_2d(np.asarray(volume)).sum(axis=1) if volume is not None else 0
+
+    for name, counts in PatternCountsByRows(open_, high, low, close).items():
+        table["patterns_" + name] = counts
+
+    trends, counts = np.unique(table.trend.values, return_counts=True)
+    aggregate = {
+        "paths": paths,
+        "trends": {trend: 0. for trend in ["UP trend", "DOWN trend", "NO trend"]} | dict(zip(trends.tolist(), (counts / paths).tolist())),
+        "fields": {name: DistributionSummary(table[name].values, quantiles=pathQuantiles) for name in table.columns if name != "trend"},
+    }
+
+    return table, aggregate
+
+
+def PanelStatistics(
+        open,
+        high,
+        low,
+        close,
+        volume=None,
+        tickers: Optional[list[str]] = None,
+        trendDeviation: float = 0.005,
+        quantiles: Union[list[float], tuple[float, ...]] = DEFAULT_QUANTILES,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Cross-sectional statistics of many instruments at once on 2D arrays `time × ticker` (one column per ticker, aligned by time):
+    the same statistics as `BatchStatistics()` for every ticker and correlations of log-returns of close prices between tickers.
+
+    :param open: 2D array of open prices, one column per ticker.
+    :param high: 2D array of high prices.
+    :param low: 2D array of low prices.
+    :param close: 2D array of close prices.
+    :param volume: 2D array of volumes or `None`.
+    :param tickers: names of tickers (columns). Default: `None` (means column numbers).
+    :param trendDeviation: relative deviation for trend detection, 0.005 mean ±0.5% by default.
+    :param quantiles: quantiles of deltas `|high - low|`. Default: `(0.99, 0.95, 0.80, 0.50)`.
+    :return: tuple of Pandas DataFrame with one row of statistics per ticker (see `BatchStatistics()`, and `candles` column)
+             and Pandas DataFrame with correlation matrix of log-returns (tickers × tickers).
+    """
+    close = np.atleast_2d(np.asarray(close, dtype=np.float64))
+    table, _ = BatchStatistics(
+        np.asarray(open).T, np.asarray(high).T, np.asarray(low).T, close.T,
+        volume=None if volume is None else np.asarray(volume).T,
+        trendDeviation=trendDeviation, quantiles=quantiles, pathQuantiles=(),
+    )
+    table.insert(0, "candles", close.shape[0])
+    table.index = pd.Index(range(close.shape[1]) if tickers is None else list(tickers), name="ticker")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(np.log(close), axis=0)
+        correlations = np.corrcoef(returns, rowvar=False) if returns.shape[0] > 1 else np.full((close.shape[1], close.shape[1]), np.nan)
+
+    return table, pd.DataFrame(np.atleast_2d(correlations), index=table.index, columns=table.index)
+
+
+def PanelMarkdown(table: pd.DataFrame, timeframe: Optional[timedelta], precision: int) -> dict[str, list[str]]:
+    """
+    Prepare Markdown summary for every ticker from the table of cross-sectional statistics, see `PanelStatistics()`.
+
+    :param table: Pandas DataFrame with one row of statistics per ticker.
+    :param timeframe: time delta between two neighbour candles.
+    :param precision: signs after comma.
+    :return: dictionary: ticker -> list with text in Markdown format with statistics (the same as `SummaryMarkdown()`).
+    """
+    summaries = {}
+    for ticker, row in table.iterrows():
+        stat = row.to_dict()
+        stat["precision"] = precision
+        stat["deltas"] = {
+            "max": stat["delta_max"],
+            "min": stat["delta_min"],
+            "stDev": stat["delta_stDev"],
+            **{key[6:]: value for key, value in stat.items() if key.startswith("delta_q")},
+        }
+        stat["patterns"] = {key[9:]: value for key, value in stat.items() if key.startswith("patterns_")}
+        summaries[ticker] = SummaryMarkdown(stat=stat, timeframe=timeframe, precision=precision)
+
+    return summaries
+
+
+class P2Quantile:
+    """
+    Streaming estimation of one quantile with P² algorithm (R. Jain, I. Chlamtac, 1985): O(1) memory and time per value.
+    For the first 5 values result is exact and equal to linear interpolation used by Pandas.
+    """
+
+    def __init__(self, q: float):
+        """
+        :param q: quantile in `[0, 1]` interval, e.g. `0.95`.
+        """
+        self.q = q
+        """Quantile to estimate."""
+
+        self.count = 0
+        """Count of processed values."""
+
+        self._heights = []  # marker heights
+        self._positions = [0., 1., 2., 3., 4.]  # actual marker positions
+        self._desired = [0., 2 * q, 4 * q, 2 + 2 * q, 4.]  # desired marker positions
+        self._increments = [0., q / 2, q, (1 + q) / 2, 1.]  # increments of desired positions
+
+    def Update(self, x: float) -> None:
+        """
+        Add next value to the sketch.
+
+        :param x: new value.
+        """
+        self.count += 1
+        h = self._heights
+
+        if self.count <= 5:
+            h.append(x)
+            h.sort()
+
+            return
+
+        n = self._positions
+
+        if x < h[0]:
+            h[0] = x
+            k = 0
+
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+
+        else:
+            k = 0
+            while x >= h[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        for i in range(1, 4):
+            d = self._desired[i] - n[i]
+
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+
+                # piecewise-parabolic prediction:
+                hp = h[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i]) +
+                    (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+                )
+
+                if not h[i - 1] < hp < h[i + 1]:
+                    hp = h[i] + d * (h[i + d] - h[i]) / (n[i + d] - n[i])  # linear prediction
+
+                h[i] = hp
+                n[i] += d
+
+    @property
+    def value(self) -> float:
+        """Current estimation of quantile, or `nan` if there are no values yet."""
+        if self.count == 0:
+            return float("nan")
+
+        if self.count <= 5:
+            return float(np.quantile(self._heights, self.q))
+
+        return self._heights[2]
+
+
+class OnlineStatistics:
+    """
+    Online accumulator of candles statistics: O(1) work and memory per new candle. It tracks running extremes,
+    Welford variance of deltas, lengths of up and down candle chains, P² sketches for deltas percentiles and counts of candlestick patterns,
+    and produces the same `stat` dictionary and Markdown summary as `PriceGenerator.GetStatistics()` at any point.
+
+    Quantiles are estimations, all other values are exact.
+    """
+
+    def __init__(self, trendDeviation: float = 0.005, precision: int = 2, quantiles: Union[list[float], tuple[float, ...]] = DEFAULT_QUANTILES):
+        """
+        :param trendDeviation: relative deviation for trend detection, 0.005 mean ±0.5% by default.
+        :param precision: signs after comma, used for rounding of deltas statistics. 2 by default.
+        :param quantiles: list of quantiles of deltas to estimate. Default: `(0.99, 0.95, 0.80, 0.50)`.
+        """
+        self.trendDeviation = trendDeviation
+        """Relative deviation for trend detection."""
+
+        self.precision = precision
+        """Signs after comma."""
+
+        self.candles = 0
+        """Count of processed candles."""
+
+        self._closeFirst = None
+        self._closeLast = None
+        self._closeMax = float("-inf")
+        self._closeMin = float("inf")
+        self._upCount = 0
+        self._lastUp = None  # direction of the last candle
+        self._chain = 0  # length of the current chain of candles with the same direction
+        self._upChainMax = 0
+        self._downChainMax = 0
+        self._chains = {True: {}, False: {}}  # distributions of lengths of finished up and down chains
+        self._deltaMax = float("-inf")
+        self._deltaMin = float("inf")
+        self._deltaMean = 0.
+        self._deltaM2 = 0.  # sums of powers of differences from the current mean (Welford's algorithm with Pébay's higher moments)
+        self._deltaM3 = 0.
+        self._deltaM4 = 0.
+        self._cumSumVolumes = 0
+        self._quantiles = {QuantileKey(q): P2Quantile(q) for q in quantiles}
+        self._lastCandles = deque(maxlen=3)  # the last candles used to detect candlestick patterns
+        self._patterns = {name: 0 for name in PATTERNS}
+
+    def Update(self, open: float, high: float, low: float, close: float, volume: float = 0) -> None:
+        """
+        Add next candle to statistics.
+
+        :param open: open price.
+        :param high: high price.
+        :param low: low price.
+        :param close: close price.
+        :param volume: trade volume.
+        """
+        self._UpdateCandle(open, high, low, close, volume)
+
+        self._lastCandles.append((open, high, low, close))
+        mask = ScanLastCandle(self._lastCandles)  # patterns ending on the new candle
+        if mask:
+            for name, pattern in PATTERNS.items():
+                if mask & pattern["bit"]:
+                    self._patterns[name] += 1
+
+    def _UpdateCandle(self, open: float, high: float, low: float, close: float, volume: float) -> None:
+        """Add next candle to all statistics except counts of candlestick patterns."""
+        self.candles += 1
+
+        if self._closeFirst is None:
+            self._closeFirst = close
+
+        self._closeLast = close
+        self._closeMax = max(self._closeMax, close)
+        self._closeMin = min(self._closeMin, close)
+
+        up = close >= open
+        self._upCount += up
+
+        if up == self._lastUp:
+            self._chain += 1
+
+        else:
+            if self._lastUp is not None:
+                finished = self._chains[self._lastUp]
+                finished[self._chain] = finished.get(self._chain, 0) + 1
+
+            self._chain = 1
+
+        self._lastUp = up
+
+        if up:
+            self._upChainMax = max(self._upChainMax, self._chain)
+
+        else:
+            self._downChainMax = max(self._downChainMax, self._chain)
+
+        delta = high - low
+        self._deltaMax = max(self._deltaMax, delta)
+        self._deltaMin = min(self._deltaMin, delta)
+        n = self.candles
+        diff = delta - self._deltaMean
+        diffN = diff / n
+        term = diff * diffN * (n - 1)
+        self._deltaMean += diffN
+        self._deltaM4 += term * diffN * diffN * (n * n - 3 * n + 3) + 6 * diffN * diffN * self._deltaM2 - 4 * diffN * self._deltaM3
+        self._deltaM3 += term * diffN * (n - 2) - 3 * diffN * self._deltaM2
+        self._deltaM2 += term
+
+        for sketch in self._quantiles.values():
+            sketch.Update(delta)
+
+        self._cumSumVolumes += volume
+
+    def UpdateMany(self, prices: pd.DataFrame) -> None:
+        """
+        Add all candles from Pandas DataFrame with `open`, `high`, `low`, `close` and `volume` columns.
+
+        :param prices: Pandas DataFrame with OHLCV-candlesticks.
+        """
+        columns = [prices[name].tolist() for name in ["open", "high", "low", "close"]]
+
+        for row in zip(*columns, prices.volume.tolist()):
+            self._UpdateCandle(*row)
+
+        # patterns of all candles are detected at once, previous candles are added to find patterns crossing the border:
+        previous = list(self._lastCandles)[-2:]
+        mask = ScanPatterns(*[[candle[i] for candle in previous] + column for i, column in enumerate(columns)])[len(previous):]
+
+        for name, count in PatternCounts(mask).items():
+            self._patterns[name] += count
+
+        self._lastCandles.extend(zip(*[column[-3:] for column in columns]))
+
+    @property
+    def stat(self) -> dict:
+        """Statistics in the same format as `PriceGenerator.stat`."""
+        if self.candles == 0:
+            raise Exception("There are no candles in online statistics yet!")
+
+        return {
+            "candles": self.candles,
+            "precision": self.precision,
+            "closeFirst": self._closeFirst,
+            "closeLast": self._closeLast,
+            "closeMax": self._closeMax,
+            "closeMin": self._closeMin,
+            "diapason": self._closeMax - self._closeMin,
+            "trend": Trend(firstClose=self._closeFirst, lastClose=self._closeLast, trendDeviation=self.trendDeviation),
+            "trendDev": self.trendDeviation,
+            "upCount": self._upCount,
+            "downCount": self.candles - self._upCount,
+            "upCountChainMax": self._upChainMax if self._upChainMax else 1,
+            "downCountChainMax": self._downChainMax if self._downChainMax else 1,
+            "upChains": self._ChainsWithCurrent(True),
+            "downChains": self._ChainsWithCurrent(False),
+            "deltas": {
+                "max": self._deltaMax,
+                "min": self._deltaMin,
+                "stDev": round(sqrt(self._deltaM2 / self.candles), self.precision),
+                **{key: round(sketch.value, self.precision) for key, sketch in self._quantiles.items()},
+                "mean": self._deltaMean,
+                "skew": sqrt(self.candles) * self._deltaM3 / self._deltaM2 ** 1.5 if self._deltaM2 > 0 else 0.,
+                "kurtosis": self.candles * self._deltaM4 / self._deltaM2 ** 2 - 3 if self._deltaM2 > 0 else 0.,
+            },
+            "cumSumVolumes": self._cumSumVolumes,
+            "patterns": dict(self._patterns),
+        }
+
+    def _ChainsWithCurrent(self, up: bool) -> dict:
+        """Distribution of chains lengths, including the current unfinished chain."""
+        chains = dict(self._chains[up])
+
+        if self._lastUp == up:
+            chains[self._chain] = chains.get(self._chain, 0) + 1
+
+        return dict(sorted(chains.items()))
+
+    def Summary(self, timeframe: Optional[timedelta] = None) -> list[str]:
+        """
+        Statistics in Markdown format, the same as returned by `PriceGenerator.GetStatistics()`.
+
+        :param timeframe: time delta between two neighbour candles.
+        :return: list with text in Markdown format with statistics.
+        """
+        return SummaryMarkdown(stat=self.stat, timeframe=timeframe, precision=self.precision)
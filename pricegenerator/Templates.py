@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+# Author: Timur Gilmullin
+
+"""
+This module loads and caches jinja2-templates of charts. All templates are compiled by one module-level environment
+`J2_ENVIRONMENT`, so repeated rendering with the same template (e.g. thousands of charts in batch) skips parsing
+and compilation:
+
+- template files are cached by absolute path and reloaded only if modification time of file is changed;
+- inline templates (multi-string variables) are cached by SHA-1 hash of their text;
+- optionally, compiled templates are saved as bytecode on disk, so other processes and next runs skip compilation too.
+
+Example:
+
+```python
+from pricegenerator.Templates import GetTemplate
+
+template = GetTemplate("google_template_example.j2", bytecodeCacheDir="j2cache")  # compiled once
+html = template.render({"title": "Chart", "info": [], "candlesColumns": "{}"})
+```
+"""
+
+# Copyright (c) 2022 Gilmillin Timur Mansurovich
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import hashlib
+import weakref
+from collections import OrderedDict
+from typing import Optional
+
+import jinja2
+import jinja2.meta
+
+
+INLINE_PREFIX = "inline:"
+"""Prefix of names of inline templates in environment, the rest of the name is SHA-1 hash of template text."""
+
+TEMPLATES_CACHE_SIZE = 400
+"""Maximal count of compiled templates and texts of inline templates kept in memory, the least recently used are dropped."""
+
+_inlineTemplates = OrderedDict()
+"""Texts of inline templates by their names, no more than `TEMPLATES_CACHE_SIZE` recently used texts."""
+
+_templateVariables = weakref.WeakKeyDictionary()
+"""Names of variables used by every compiled template, see `TemplateVariables()`."""
+
+
+def _TemplateSource(name: str) -> tuple:
+    """
+    Source of template for jinja2 loader: text, file name and function checking that cached template is up-to-date.
+
+    :param name: absolute path to template file or name of inline template.
+    :return: tuple `(source, filename, uptodate)`.
+    """
+    if name.startswith(INLINE_PREFIX):
+        if name not in _inlineTemplates:
+            raise jinja2.TemplateNotFound(name)
+
+        return _inlineTemplates[name], None, lambda: name in _inlineTemplates  # the same text always has the same hash
+
+    mtime = os.path.getmtime(name)
+    with open(name, "r", encoding="UTF-8") as fH:
+        source = fH.read()
+
+    return source, name, lambda: os.path.exists(name) and os.path.getmtime(name) == mtime
+
+
+J2_ENVIRONMENT = jinja2.Environment(loader=jinja2.FunctionLoader(_TemplateSource), cache_size=TEMPLATES_CACHE_SIZE, auto_reload=True)
+"""Module-level jinja2 environment with cache of compiled templates, see `GetTemplate()`."""
+
+
+def TemplateName(template: str) -> str:
+    """
+    Name of template in environment: absolute path for template files and `inline:<SHA-1 of text>` for inline templates.
+    Text of inline template is kept in memory until it is one of `TEMPLATES_CACHE_SIZE` recently used texts.
+
+    :param template: path to template file or template text.
+    :return: name of template.
+    """
+    if os.path.exists(template):
+        return os.path.abspath(template)
+
+    name = INLINE_PREFIX + hashlib.sha1(template.encode("UTF-8")).hexdigest()
+    _inlineTemplates[name] = template
+    _inlineTemplates.move_to_end(name)
+
+    while len(_inlineTemplates) > TEMPLATES_CACHE_SIZE:
+        _inlineTemplates.popitem(last=False)  # the least recently used text
+
+    return name
+
+
+def GetTemplate(template: str, bytecodeCacheDir: Optional[str] = None) -> jinja2.Template:
+    """
+    Compiled jinja2-template from cache. Template is compiled only at the first call, or if template file was changed.
+
+    :param template: path to template file or template text.
+    :param bytecodeCacheDir: directory to save compiled templates as bytecode. If `None` (by default), then bytecode is not saved.
+    :return: compiled `jinja2.Template` object.
+    """
+    if bytecodeCacheDir:
+        if J2_ENVIRONMENT.bytecode_cache is None or J2_ENVIRONMENT.bytecode_cache.directory != bytecodeCacheDir:
+            os.makedirs(bytecodeCacheDir, exist_ok=True)
+            J2_ENVIRONMENT.bytecode_cache = jinja2.FileSystemBytecodeCache(bytecodeCacheDir)
+
+    else:
+        J2_ENVIRONMENT.bytecode_cache = None
+
+    return J2_ENVIRONMENT.get_template(TemplateName(template))
+
+
+def TemplateVariables(template: jinja2.Template) -> set[str]:
+    """
+    Names of variables used by template, e.g. to prepare only necessary data of chart model. Calculated once for every compiled template.
+
+    :param template: compiled template, see `GetTemplate()`.
+    :return: set of variable names.
+    """
+    if template not in _templateVariables:
+        source = J2_ENVIRONMENT.loader.get_source(J2_ENVIRONMENT, template.name)[0]
+        _templateVariables[template] = jinja2.meta.find_undeclared_variables(J2_ENVIRONMENT.parse(source))
+
+    return _templateVariables[template]
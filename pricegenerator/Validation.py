@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+# Author: Timur Gilmullin
+
+"""
+This module checks consistency of OHLCV-candles and repairs broken candles. All invariants are checked at once
+with vectorized comparisons of numpy arrays, so multi-million-row series are validated quickly:
+
+- all prices are finite numbers (not NaN or inf) and greater than zero;
+- `low ≤ min(open, close)` and `max(open, close) ≤ high`;
+- `volume ≥ 0`.
+
+Broken candles can be repaired with one of methods (see `REPAIR_METHODS`): clipping of high and low prices to cover
+candle bodies (and negative volumes to zero), dropping of broken candles or forward filling of broken candles with previous ones.
+
+Example:
+
+```python
+from pricegenerator.PriceGenerator import PriceGenerator
+
+priceModel = PriceGenerator()
+priceModel.validation = "clip"  # check and repair prices after every loading or generating
+priceModel.LoadFromFile("history.csv")
+
+print(priceModel.Validate())  # positions of broken candles for every invariant
+```
+"""
+
+# Copyright (c) 2022 Gilmillin Timur Mansurovich
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+INVARIANTS = {
+    "notFinite": "open, high, low or close is NaN or inf",
+    "notPositive": "open, high, low or close is not greater than zero",
+    "lowAboveBody": "low > min(open, close)",
+    "highBelowBody": "high < max(open, close)",
+    "negativeVolume": "volume < 0",
+}
+"""Names and descriptions of checked invariants of OHLCV-candles."""
+
+REPAIR_METHODS = ["clip", "drop", "ffill"]
+"""Methods to repair broken candles:
+- `clip`: set high to `max(open, high, low, close)`, low to `min(open, high, low, close)` and negative volumes to zero;
+  candles with not finite or not positive prices are not changed by clipping;
+- `drop`: remove all broken candles;
+- `ffill`: replace broken candles with the previous correct candle (broken candles at the beginning are removed)."""
+
+
+def ValidateOHLCV(prices: pd.DataFrame) -> dict[str, np.ndarray]:
+    """
+    Check all invariants of OHLCV-candles, see `INVARIANTS`.
+
+    :param prices: Pandas DataFrame with `open`, `high`, `low`, `close` and `volume` (optional) columns.
+    :return: dictionary: invariant name -> numpy array with positions of candles (not index labels) violating this invariant.
+    """
+    o, h, lo, c = [prices[column].values.astype(np.float64) for column in ["open", "high", "low", "close"]]
+
+    with np.errstate(invalid="ignore"):
+        checks = {
+            "notFinite": ~(np.isfinite(o) & np.isfinite(h) & np.isfinite(lo) & np.isfinite(c)),
+            "notPositive": (o <= 0) | (h <= 0) | (lo <= 0) | (c <= 0),
+            "lowAboveBody": lo > np.minimum(o, c),
+            "highBelowBody": h < np.maximum(o, c),
+            "negativeVolume": prices["volume"].values < 0 if "volume" in prices.columns else np.zeros(len(prices), dtype=bool),
+        }
+
+    return {name: np.flatnonzero(found) for name, found in checks.items()}
+
+
+def BrokenCandles(violations: dict[str, np.ndarray], count: int) -> np.ndarray:
+    """
+    Boolean mask of candles violating at least one invariant.
+
+    :param violations: dictionary with positions of broken candles, see `ValidateOHLCV()`.
+    :param count: count of candles.
+    :return: numpy array of booleans, `True` for broken candles.
+    """
+    broken = np.zeros(count, dtype=bool)
+    for positions in violations.values():
+        broken[positions] = True
+
+    return broken
+
+
+def RepairOHLCV(prices: pd.DataFrame, method: str = "clip", violations: Optional[dict[str, np.ndarray]] = None) -> pd.DataFrame:
+    """
+    Repair broken OHLCV-candles, see `REPAIR_METHODS`. Input DataFrame is not changed.
+
+    :param prices: Pandas DataFrame with `open`, `high`, `low`, `close` and `volume` (optional) columns.
+    :param method: one of `REPAIR_METHODS`: `"clip"`, `"drop"` or `"ffill"`. Default: `"clip"`.
+    :param violations: positions of broken candles, if they are already found with `ValidateOHLCV()`.
+    :return: new Pandas DataFrame with repaired candles. Index is reset if candles were removed.
+    """
+    if method not in REPAIR_METHODS:
+        raise Exception("Unknown repair method: {}! Use one of: {}".format(method, ", ".join(REPAIR_METHODS)))
+
+    violations = ValidateOHLCV(prices) if violations is None else violations
+    broken = BrokenCandles(violations, len(prices))
+    repaired = prices.copy()
+
+    if not broken.any():
+        return repaired
+
+    if method == "clip":
+        columns = ["open", "high", "low", "close"]
+        values = repaired[columns].values.astype(np.float64)
+        repaired["high"] = np.maximum(repaired["high"].values, values.max(axis=1))  # NaN stay NaN, so such candles are still broken
+        repaired["low"] = np.minimum(repaired["low"].values, values.min(axis=1))
+
+        if "volume" in repaired.columns:
+            repaired["volume"] = repaired["volume"].clip(lower=0)
+
+    elif method == "drop":
+        repaired = repaired[~broken].reset_index(drop=True)
+
+    else:
+        columns = [column for column in ["open", "high", "low", "close", "volume"] if column in repaired.columns]
+        values = repaired[columns].astype(np.float64)
+        values.loc[broken] = np.nan
+        repaired[columns] = values.ffill()
+        repaired = repaired[repaired[columns].notna().all(axis=1)].reset_index(drop=True)  # no previous correct candle
+
+        if "volume" in prices.columns:
+            repaired["volume"] = repaired["volume"].astype(prices["volume"].dtype)
+
+    return repaired
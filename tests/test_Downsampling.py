@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+import os
+import random
+import pytest
+import numpy as np
+import pandas as pd
+
+from pricegenerator import PriceGenerator
+from pricegenerator.Downsampling import BucketBounds, OHLCVBuckets, LTTB
+
+
+class TestFeatures:
+
+    @pytest.fixture(scope='function', autouse=True)
+    def init(self):
+        PriceGenerator.uLogger.level = 50  # Disable debug logging while test, logger CRITICAL = 50
+        PriceGenerator.uLogger.handlers[0].level = 50  # Disable debug logging for STDOUT
+
+        self.model = PriceGenerator.PriceGenerator()  # init generator for the next tests
+
+    def test_BucketBounds(self):
+        testData = [
+            (10, 5, [0, 2, 4, 6, 8]),
+            (10, 3, [0, 3, 6]),
+            (3, 5, [0, 1, 2]),
+            (5, 5, [0, 1, 2, 3, 4]),
+        ]
+
+        for count, buckets, expected in testData:
+            result = BucketBounds(count, buckets).tolist()
+            assert result == expected, "Expected bounds {} of {} items in {} buckets but {} returned!".format(expected, count, buckets, result)
+
+    def test_OHLCVBuckets(self):
+        self.model.horizon = 100
+        self.model.Generate()
+        prices = self.model.prices
+
+        buckets = OHLCVBuckets(prices, buckets=7)
+        assert len(buckets) == 7, "Expected 7 buckets but {} returned!".format(len(buckets))
+        assert buckets.candles.sum() == len(prices), "Expected all candles in buckets!"
+
+        start = 0
+        for row in buckets.itertuples():
+            part = prices.iloc[start:start + row.candles]
+            assert row.datetime == part.datetime.iloc[0], "Expected datetime of the first candle in bucket!"
+            assert row.open == part.open.iloc[0], "Expected open of the first candle in bucket!"
+            assert row.high == part.high.max(), "Expected the highest high in bucket!"
+            assert row.low == part.low.min(), "Expected the lowest low in bucket!"
+            assert row.close == part.close.iloc[-1], "Expected close of the last candle in bucket!"
+            assert row.volume == part.volume.sum(), "Expected sum of volumes in bucket!"
+            start += row.candles
+
+    def test_LTTB(self):
+        x = np.arange(1000)
+        y = np.sin(x / 50) + np.random.normal(0, 0.01, 1000)
+        y[500] = 10  # spike must be kept
+        y[:5] = np.nan
+
+        selected = LTTB(x, y, threshold=100)
+        assert len(selected) == 100, "Expected 100 points but {} returned!".format(len(selected))
+        assert selected[0] == 5 and selected[-1] == 999, "Expected the first and the last finite points!"
+        assert np.all(np.diff(selected) > 0), "Expected sorted positions of points!"
+        assert 500 in selected, "Expected spike in downsampled line!"
+
+        datetimes = pd.date_range("2022-01-01", periods=1000, freq="min")
+        assert LTTB(datetimes, y, threshold=100).tolist() == selected.tolist(), "Expected the same points for datetime x-coordinates!"
+        assert LTTB(x, y, threshold=2000).tolist() == list(range(5, 1000)), "Expected all finite points if threshold is greater than count of points!"
+
+    def test_RenderBokehWithDownsampling(self):
+        self.model.horizon = 500
+        self.model.Generate()
+        name = "test_render_bokeh_lod{}.html".format(random.uniform(0, 1000000000))
+
+        chart = self.model.RenderBokeh(fileName=name, viewInBrowser=False, maxCandles=100)
+        assert os.path.exists(name), "Expected .html-file '{}' after saving but it is not exist!".format(name)
+
+        main = chart.children[0][0]
+        candles = [renderer.data_source.data for renderer in main.renderers if renderer.name == "candle"][0]
+        assert len(candles["datetime"]) == 100, "Expected 100 buckets of candles on chart but {} drawn!".format(len(candles["datetime"]))
+        assert candles["candle"][-1] == 0, "Expected number of the last candle in the last bucket!"
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import random
+import pytest
+import numpy as np
+import pandas as pd
+
+from pricegenerator import PriceGenerator
+from pricegenerator.Encoding import CompactArray, EncodeArray, EncodeDatetimes, EncodeCandles, DecodeArray
+
+
+class TestFeatures:
+
+    @pytest.fixture(scope='function', autouse=True)
+    def init(self):
+        PriceGenerator.uLogger.level = 50  # Disable debug logging while test, logger CRITICAL = 50
+        PriceGenerator.uLogger.handlers[0].level = 50  # Disable debug logging for STDOUT
+
+        self.model = PriceGenerator.PriceGenerator()  # init generator for the next tests
+
+    def test_CompactArray(self):
+        testData = [
+            (np.array([1, 2, 3], dtype=np.int64), None, np.int32),
+            (np.array([1, 2 ** 40], dtype=np.int64), None, np.int64),
+            (np.array([70.07, 100.5, np.nan]), 2, np.float32),
+            (np.array([70.07, 100.5]), None, np.float64),
+            (np.array([1234567.891]), 3, np.float64),
+        ]
+
+        for values, precision, expected in testData:
+            result = CompactArray(values, precision)
+            assert result.dtype == expected, "Expected {} for {} with precision {} but {} returned!".format(expected, values, precision, result.dtype)
+
+    def test_EncodeArray(self):
+        prices = np.round(np.random.uniform(1, 100000, 1000), 2)
+        testData = [
+            (prices, 2, "int32", 100),
+            (prices + 0.001, 2, "float32", 1),  # more digits than precision, so only rounded prices are the same
+            (prices, None, "float64", 1),
+            (np.array([10, 20, 30]), None, "int32", 1),
+        ]
+
+        for values, precision, dtype, divisor in testData:
+            column = EncodeArray(values, precision)
+            assert column["dtype"] == dtype, "Expected {} typed array but {} returned!".format(dtype, column["dtype"])
+            assert column["divisor"] == divisor, "Expected divisor {} but {} returned!".format(divisor, column["divisor"])
+            decoded = DecodeArray(column) if precision is None else np.round(DecodeArray(column), precision)
+            assert np.array_equal(decoded, values if precision is None else np.round(values, precision)), "Expected the same values after decoding!"
+
+    def test_EncodeDatetimes(self):
+        testData = [
+            (pd.Series(pd.date_range("2022-01-01", periods=100, freq="h", tz="UTC")), "int32", 1000),
+            (pd.Series(pd.date_range("2022-01-01", periods=100, freq="10ms")), "int32", 1),
+            (pd.Series(pd.to_datetime(["1970-01-01 00:00:00.000", "2022-01-01 00:00:00.001"])), "float64", 1),
+        ]
+
+        for datetimes, dtype, multiplier in testData:
+            column = EncodeDatetimes(datetimes)
+            expected = datetimes.values.astype("datetime64[ms]").astype(np.int64)
+            assert column["dtype"] == dtype and column["multiplier"] == multiplier, "Expected {} offsets with multiplier {}!".format(dtype, multiplier)
+            assert np.array_equal(DecodeArray(column), expected), "Expected milliseconds since epoch after decoding!"
+
+    def test_EncodeCandles(self):
+        self.model.horizon = 100
+        self.model.Generate()
+
+        columns = json.loads(EncodeCandles(self.model.prices, self.model.precision))
+        assert list(columns.keys()) == ["datetime", "open", "high", "low", "close", "volume"], "Unexpected encoded columns!"
+
+        for name in ["open", "high", "low", "close", "volume"]:
+            assert np.array_equal(DecodeArray(columns[name]), self.model.prices[name].values), "Expected the same '{}' after decoding!".format(name)
+
+    def test_RenderGoogleEncodedModel(self):
+        self.model.horizon = 30
+        self.model.Generate()
+        name = "test_render_google_encoded{}.html".format(random.uniform(0, 1000000000))
+
+        self.model.RenderGoogle(fileName=name, viewInBrowser=False)
+        assert os.path.exists(name), "Expected .html-file '{}' after saving but it is not exist!".format(name)
+        assert "candlesColumns" in self.model.j2model, "Expected encoded candles in chart model!"
+        assert "candlesData" not in self.model.j2model, "Expected no text list of candles for default template!"
+
+        self.model.j2model = None
+        self.model.j2template = os.path.join("tests", "test_template.j2")  # old template with text list of candles
+        self.model.RenderGoogle(fileName=name, viewInBrowser=False)
+        assert len(self.model.j2model["candlesData"]) == 30, "Expected text list of candles for template with `candlesData` variable!"
+
+        expected = [pd.to_datetime(date).strftime("%Y-%m-%d %H:%M:%S") for date in self.model.prices.datetime.values]
+        assert [candle[0] for candle in self.model.j2model["candlesData"]] == expected, "Expected dates of candles as 'YYYY-MM-DD hh:mm:ss' strings!"
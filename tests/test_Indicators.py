@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import pandas as pd
+
+from pricegenerator import PriceGenerator
+from pricegenerator.Indicators import IndicatorGraph, ZigZagPivots
+
+
+class TestFeatures:
+
+    @pytest.fixture(scope='function', autouse=True)
+    def init(self):
+        PriceGenerator.uLogger.level = 50  # Disable debug logging while test, logger CRITICAL = 50
+        PriceGenerator.uLogger.handlers[0].level = 50  # Disable debug logging for STDOUT
+
+        self.model = PriceGenerator.PriceGenerator()  # init generator for the next tests
+        self.model.horizon = 50
+        self.model.Generate()
+
+    def test_Dependencies(self):
+        graph = IndicatorGraph(prices=self.model.prices)
+        assert graph.Dependencies("hma20") == ["wma10", "wma20", "hmaRaw20", "hma20"], "Expected HMA(20) depends on WMA(10), WMA(20) and intermediate series!"
+        assert graph.Dependencies("alligatorLips") == ["wma2", "wma5", "hmaRaw5", "hma5", "alligatorLips"], "Expected Alligator Lips is based on HMA(5)!"
+
+    def test_SharedIntermediates(self):
+        graph = IndicatorGraph(prices=self.model.prices)
+        hma5 = graph["hma5"]
+        lips = graph["alligatorLips"]
+        assert graph.computed == ["wma2", "wma5", "hmaRaw5", "hma5", "alligatorLips"], "Expected every intermediate is calculated only once!"
+        assert list(lips.dropna()) == list(hma5.shift(3).dropna()), "Expected Alligator Lips is HMA(5) with offset 3!"
+
+    def test_LazyStatistics(self):
+        self.model.GetStatistics()
+        assert "sma5" not in self.model.indicators.computed, "Expected indicators are not calculated by GetStatistics()!"
+        assert isinstance(self.model.indicators["sma5"], pd.Series), "Expected Pandas Series for SMA(5) indicator!"
+        assert "sma5" in self.model.indicators.computed, "Expected SMA(5) is calculated on demand!"
+
+    def test_RegisterIndicator(self):
+        self.model.RegisterIndicator(name="spread", inputs=["high", "low"], func=lambda high, low: high - low)
+        self.model.RegisterIndicator(name="spreadSma", inputs=["spread"], func=lambda spread: spread.rolling(5).mean())
+        assert list(self.model.indicators["spread"]) == list(self.model.prices.high - self.model.prices.low), "Expected custom indicator values!"
+        assert self.model.indicators.Dependencies("spreadSma") == ["spread", "spreadSma"], "Expected custom indicator uses another custom indicator as input!"
+
+    def test_SetParams(self):
+        graph = self.model.indicators
+        graph["avg"]
+        graph["sma5"]
+        graph.SetParams(precision=0)
+        assert "avg" not in graph.computed, "Expected indicator depending on changed parameter is removed from cache!"
+        assert "sma5" in graph.computed, "Expected indicator without changed parameters stays in cache!"
+
+    def test_PricesStayLean(self):
+        headers = list(self.model.prices.columns)
+        self.model.GetStatistics()
+        self.model.indicators["sma5"]
+        assert list(self.model.prices.columns) == headers, "Expected prices are not changed by statistics and indicators!"
+
+    def test_GetIndicators(self):
+        self.model.indicatorsDtype = "float32"
+        frame = self.model.GetIndicators(["delta", "sma5", "up", "bbands"])
+        assert list(frame.columns) == ["delta", "sma5", "up", "bbands_lower", "bbands_mid", "bbands_upper", "bbands_bandwidth", "bbands_percent"], "Expected selected indicators only!"
+        assert frame.delta.dtype == "float32" and frame.sma5.dtype == "float32", "Expected compact float32 storage of indicators!"
+        assert frame.up.dtype == bool, "Expected boolean indicators are not converted!"
+        assert len(frame) == len(self.model.prices), "Expected indicators aligned with prices!"
+        assert "hma20" not in self.model.indicators.computed, "Expected not requested indicators are not calculated!"
+
+    def test_ZigZagPivots(self):
+        highs = [10, 11, 12, 11, 10, 9, 10, 11, 12, 13]
+        lows = [9, 10, 11, 10, 9, 8, 9, 10, 11, 12]
+        pivots = ZigZagPivots(high=highs, low=lows, deviations=[0.1, 0.4])
+        assert list(pivots[0.1][0]) == [0, 2, 5, 9], "Expected swing points for 10% deviation!"
+        assert list(pivots[0.1][1]) == [-1, 1, -1, 1], "Expected alternating swing lows and highs!"
+        assert list(pivots[0.4][0]) == [5, 9], "Expected swing points for 40% deviation!"
+        assert list(pivots[0.4][1]) == [-1, 1], "Expected small swings are skipped for 40% deviation!"
+        assert len(ZigZagPivots(high=[10, 10.1], low=[9.9, 10], deviations=0.5)[0.5][0]) == 0, "Expected no pivots for flat prices!"
+
+    def test_ZigZagIndicator(self):
+        zigzag = self.model.indicators["zigzag"]
+        assert list(zigzag.columns) == ["datetimes", "filtered"], "Expected Zig-Zag points with datetimes!"
+        prices = self.model.prices.loc[zigzag.index]
+        isHigh = (zigzag.filtered == prices.high).tolist()
+        assert all(isHigh[i] != isHigh[i + 1] for i in range(len(isHigh) - 1)), "Expected swing highs and lows are alternating!"
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+from bokeh.document import Document
+
+from pricegenerator import PriceGenerator
+from pricegenerator.LiveChart import LiveChart, ServeLive
+
+
+class TestFeatures:
+
+    @pytest.fixture(scope='function', autouse=True)
+    def init(self):
+        PriceGenerator.uLogger.level = 50  # Disable debug logging while test, logger CRITICAL = 50
+        PriceGenerator.uLogger.handlers[0].level = 50  # Disable debug logging for STDOUT
+
+        self.model = PriceGenerator.PriceGenerator()  # init generator for the next tests
+        self.model.horizon = 100
+        self.model.Generate()
+
+    def test_Window(self):
+        window = self.model.Window(-30)
+        assert len(window.prices) == 30 and window.horizon == 30, "Expected 30 last candles in window!"
+        assert np.array_equal(window.prices.close.values, self.model.prices.close.values[-30:]), "Expected the same prices in window!"
+        assert len(window.indicators["sma5"]) == 30 and len(self.model.indicators["sma5"]) == 100, "Expected separate indicators for window!"
+
+        self.model.trendSplit, self.model.splitCount = "up-down", [50, 50]
+        window = self.model.Window(40, 70)
+        assert window.splitCount == [10, 20] and self.model.splitCount == [50, 50], "Expected trends shrunk to candles of window!"
+
+    def test_LiveChartUpdate(self):
+        live = LiveChart(self.model, rollover=50, lookback=100, indicators=["sma5", "bbands"])
+        live.Layout()
+        assert len(live.source.data["close"]) == 50, "Expected only last 50 candles on live chart!"
+
+        for _ in range(3):
+            data = live.Update(horizon=10)
+            assert len(data["close"]) == 10, "Expected only 10 new candles streamed!"
+
+        assert len(self.model.prices) == 100 and live.candles == 130, "Expected only the last max(rollover, lookback) candles kept in prices!"
+        assert self.model.prices.datetime.is_monotonic_increasing and self.model.prices.index[0] == 0, "Expected the oldest candles removed from prices!"
+        assert all(len(values) == 50 for values in live.source.data.values()), "Expected the oldest candles dropped by rollover!"
+        assert np.array_equal(np.round(live.source.data["close"].astype(np.float64), self.model.precision), self.model.prices.close.values[-50:]), "Expected the last candles on live chart!"
+        assert np.array_equal(live.source.data["candle"], np.arange(80, 130)), "Expected numbers of candles in the whole chain!"
+
+        for column, expected in [("sma5", self.model.indicators["sma5"]), ("bbands_upper", self.model.indicators["bbands"]["upper"])]:
+            assert np.allclose(live.source.data[column][-30:], expected.values[-30:]), "Expected incremental '{}' equal to full calculation!".format(column)
+
+        assert live.chart.y_range.start < live.source.data["low"].min() and live.chart.y_range.end > live.source.data["high"].max(), "Expected price range fitted to candles!"
+
+    def test_LiveChartDocument(self):
+        live = LiveChart(self.model, rollover=50)
+        doc = live.MakeDocument(Document(), period=100)
+        assert doc.roots == [live.layout], "Expected live chart in document!"
+        assert len(doc.session_callbacks) == 1, "Expected periodic callback with new candles!"
+
+    def test_ServeLive(self):
+        server = ServeLive(self.model, port=0, show=False, block=False, rollover=50)
+
+        try:
+            assert server.port > 0, "Expected server started on free local port!"
+
+        finally:
+            server.stop()
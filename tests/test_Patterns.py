@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+
+from pricegenerator import PriceGenerator
+from pricegenerator import Patterns
+from pricegenerator.Patterns import PATTERNS, ScanPatterns, ScanLastCandle, PatternCounts, PatternCountsByRows
+
+
+class TestFeatures:
+
+    @pytest.fixture(scope='function', autouse=True)
+    def init(self):
+        PriceGenerator.uLogger.level = 50  # Disable debug logging while test, logger CRITICAL = 50
+        PriceGenerator.uLogger.handlers[0].level = 50  # Disable debug logging for STDOUT
+
+        self.model = PriceGenerator.PriceGenerator()  # init generator for the next tests
+
+    @staticmethod
+    def Names(mask: int) -> set:
+        return {name for name, pattern in PATTERNS.items() if mask & pattern["bit"]}
+
+    def test_ScanPatterns(self):
+        testData = [
+            {"candles": [(100, 101, 99, 100.05)], "expected": [{"doji"}]},
+            {"candles": [(100, 100.6, 97, 100.5)], "expected": [{"hammer"}]},
+            {"candles": [(102, 102.5, 100.5, 101), (100.8, 103, 100.5, 102.5)], "expected": [set(), {"bullishEngulfing"}]},
+            {"candles": [(101, 102.5, 100.5, 102), (102.2, 102.5, 100, 100.8)], "expected": [set(), {"bearishEngulfing"}]},
+            {"candles": [(104, 104.5, 99.5, 100), (101, 103.5, 100.5, 103)], "expected": [set(), {"bullishHarami"}]},
+            {"candles": [(100, 104.5, 99.5, 104), (103, 103.5, 100.5, 101)], "expected": [set(), {"bearishHarami"}]},
+            {"candles": [(105, 105.5, 99.5, 100), (100, 100.2, 98.8, 99), (99.5, 104, 99.4, 103.5)], "expected": [set(), set(), {"morningStar"}]},
+            {"candles": [(100, 105.5, 99.5, 105), (105, 106.2, 104.8, 106), (105.5, 105.6, 101, 101.5)], "expected": [set(), set(), {"eveningStar"}]},
+            {"candles": [(100, 101, 99.5, 100.5), (102, 103, 101.5, 102.5), (99, 100, 98, 98.5)], "expected": [set(), {"gapUp"}, {"gapDown"}]},
+        ]
+        for test in testData:
+            o, h, lo, c = zip(*test["candles"])
+            actual = [self.Names(int(mask)) for mask in ScanPatterns(o, h, lo, c)]
+            assert actual == test["expected"], "Expected patterns {}, but {} given for candles: {}".format(test["expected"], actual, test["candles"])
+
+    def test_ScanLastCandle(self):
+        self.model.horizon = 500
+        self.model.precision = 0  # many equal prices, so borders of rules are checked too
+        self.model.Generate()
+        candles = list(zip(*[self.model.prices[column].tolist() for column in ["open", "high", "low", "close"]]))
+        expected = ScanPatterns(*zip(*candles))
+
+        actual = [ScanLastCandle(candles[max(0, i - 2):i + 1]) for i in range(len(candles))]
+        assert actual == list(expected), "Expected the same patterns as in vectorized scanning!"
+
+    def test_ScanPatternsByChunks(self, monkeypatch):
+        self.model.horizon = 300
+        self.model.Generate()
+        prices = self.model.prices
+        expected = ScanPatterns(prices.open, prices.high, prices.low, prices.close)
+        monkeypatch.setattr(Patterns, "CHUNK_SIZE", 7)
+        assert list(ScanPatterns(prices.open, prices.high, prices.low, prices.close)) == list(expected), "Expected the same patterns on borders of chunks!"
+
+        rows = PatternCountsByRows(*[prices[column].values.reshape(3, 100) for column in ["open", "high", "low", "close"]])
+        for i in range(3):
+            part = prices.iloc[i * 100:(i + 1) * 100]
+            counts = PatternCounts(ScanPatterns(part.open, part.high, part.low, part.close))
+            assert {name: values[i] for name, values in rows.items()} == counts, "Expected the same counts of patterns in row {}!".format(i)
+
+    def test_PatternsInStatistics(self):
+        self.model.horizon = 200
+        self.model.Generate()
+        summary = self.model.GetStatistics()
+        assert self.model.stat["patterns"] == PatternCounts(self.model.indicators["patterns"]), "Expected counts of patterns in statistics!"
+        assert any(line.startswith("- Candlestick patterns: doji:") for line in summary), "Expected counts of patterns in summary!"
+
+        markers = self.model.GetPatternMarkers()
+        assert list(markers.columns) == ["datetime", "markersUpper", "markersCenter", "markersLower"], "Expected markers for RenderBokeh()!"
+        assert (markers.markersCenter == "+").sum() == self.model.stat["patterns"]["doji"], "Expected doji markers in the center of candles!"
+        assert self.model.indicators["patterns"].dtype == np.uint16, "Expected compact bitmask of patterns!"
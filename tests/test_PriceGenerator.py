@@ -74,6 +74,82 @@ class TestFeatures:
         assert os.path.exists(name), "Expected .html-file '{}' after saving but it is not exist!".format(name)
         assert os.path.exists(nameMD), "Expected markdown file '{}' after saving but it is not exist!".format(nameMD)
 
+    def test_RenderBokehSharedSource(self):
+        self.model.horizon = 50
+        self.model.Generate()
+        name = "test_render_bokeh_source{}.html".format(random.uniform(0, 1000000000))
+        chart = self.model.RenderBokeh(fileName=name, viewInBrowser=False, markers=self.model.GetPatternMarkers())
+        main, volumes = chart.children[0][0], chart.children[1][0]
+
+        shared = [renderer for renderer in main.renderers + volumes.renderers if "datetime" in renderer.data_source.data and len(renderer.data_source.data["datetime"]) == 50]
+        sources = {id(renderer.data_source) for renderer in shared}
+        assert len(sources) == 1, "Expected one data source for all candles, volumes and indicators but {} found!".format(len(sources))
+        assert len(shared) >= 20, "Expected candles, volumes and indicators glyphs on shared data source but only {} found!".format(len(shared))
+
+        for column in ["open", "close", "volume", "sma5", "bbandsUpper"]:
+            assert column in shared[0].data_source.data, "Expected '{}' column in shared data source!".format(column)
+
+    def test_RenderBokehSparseEvents(self):
+        self.model.horizon = 100
+        self.model.timeframe = timedelta(hours=1)
+        self.model.Generate()
+        datetimes = self.model.prices.datetime
+
+        testData = [
+            pd.DataFrame({"datetime": datetimes[[10, 20, 30]].values, "markersUpper": ["↓", "↓", "↓"]}),
+            pd.DataFrame({"markersUpper": ["↓", "↓", "↓"]}, index=pd.DatetimeIndex(datetimes[[10, 20, 30]])),
+            [{"datetime": datetimes[10], "markersUpper": "↓"}, {"datetime": datetimes[20] + timedelta(minutes=30), "markersUpper": "↓"}, {"datetime": datetimes[30], "markersUpper": "↓"}],
+        ]
+
+        for markers in testData:
+            markers = markers + [{"datetime": datetimes[0] - timedelta(days=1), "markersUpper": "↓"}] if isinstance(markers, list) else markers
+            chart = self.model.RenderBokeh(fileName=None, markers=markers, lines=[pd.Series([70.0, 71.0], index=pd.DatetimeIndex(datetimes[[10, 30]]), name="signal")], showStatOnChart=False)
+            texts = [renderer.data_source.data for renderer in chart.children[0][0].renderers if "text" in renderer.data_source.data]
+            assert len(texts) == 1 and len(texts[0]["text"]) == 3, "Expected only 3 not empty markers on chart!"
+            assert np.array_equal(texts[0]["datetime"], datetimes[[10, 20, 30]].values), "Expected markers placed on candles containing their datetimes!"
+            assert np.array_equal(texts[0]["high"], self.model.prices.high.values[[10, 20, 30]]), "Expected markers placed above candles!"
+
+            lines = [renderer.data_source.data for renderer in chart.children[0][0].renderers if renderer.glyph.__class__.__name__ == "Line"]
+            assert len(lines) == 1 and list(lines[0]["y"]) == [70.0, 71.0], "Expected sparse line with 2 points!"
+            assert np.array_equal(pd.DatetimeIndex(lines[0]["x"]).values, datetimes[[10, 30]].values), "Expected points of line on the same datetimes as candles!"
+
+        full = self.model.GetPatternMarkers()
+        full["markersUpper"] = ""
+        full.loc[[5, 50], "markersUpper"] = "↓"
+        chart = self.model.RenderBokeh(fileName=None, markers=full[["datetime", "markersUpper"]], showStatOnChart=False)
+        texts = [renderer.data_source.data for renderer in chart.children[0][0].renderers if "text" in renderer.data_source.data]
+        assert len(texts[0]["text"]) == 2, "Expected only not empty markers of full-length markers!"
+
+    def test_CandlePositions(self):
+        self.model.horizon = 10
+        self.model.timeframe = timedelta(hours=1)
+        self.model.timeStart = datetime(2022, 1, 1, 0, 0)
+        self.model.Generate()
+
+        events = [datetime(2022, 1, 1, 0, 0), datetime(2022, 1, 1, 3, 30), datetime(2022, 1, 1, 9, 59), datetime(2022, 1, 1, 10, 0), datetime(2021, 12, 31, 23, 0)]
+        assert list(self.model.CandlePositions(events)) == [0, 3, 9, -1, -1], "Unexpected positions of candles!"
+
+    def test_RenderImage(self):
+        self.model.horizon = 300
+        self.model.Generate()
+
+        for extension in ["png", "svg"]:
+            name = "test_render_image{}.{}".format(random.uniform(0, 1000000000), extension)
+            figure = self.model.RenderImage(fileName=name, indicators=["sma5", "bbands", "zigzag"], showStatOnChart=True)
+            assert os.path.exists(name), "Expected image file '{}' after saving but it is not exist!".format(name)
+            assert os.path.exists("{}.md".format(name)), "Expected markdown file with statistics for image '{}'!".format(name)
+
+            chart, volumeChart = figure.axes[0], figure.axes[1]
+            assert len(chart.collections) == 2 and len(volumeChart.collections) == 1, "Expected candles and volumes drawn by collections!"
+            assert len(chart.collections[1].get_paths()) == 300, "Expected 300 candle bodies in one collection!"
+            assert [line.get_label() for line in chart.lines] == ["sma5", "bbands lower", "bbands mid", "bbands upper", "zigzag"], "Unexpected indicator lines!"
+
+        figure = self.model.RenderImage(fileName=None, darkTheme=True, indicators=["sma5"])
+        assert figure.axes[0].get_legend().get_texts()[0].get_color() == "#20ff00", "Expected legend text in color of dark theme!"
+
+        figure = self.model.RenderImage(fileName=None, maxCandles=100)
+        assert len(figure.axes[0].collections[1].get_paths()) == 100, "Expected 100 buckets of candles on downsampled image!"
+
     def test_RenderGoogleDefault(self):
         self.model.horizon = 30
         self.model.Generate()
@@ -335,3 +411,175 @@ class TestFeatures:
             self.model.maxVolume = test[0]  # set test data as "maxVolume" field in PriceGenerator() class
             self.model.Generate()
             assert self.model.prices.volume.max() <= test[1], "All candles volumes must be less than maxVolume = {}, but there are some values more than maxVolume!\nList of volumes: {}".format(test[1], list(self.model.prices.volume))
+
+    def test_StatisticsCache(self):
+        self.model.horizon = 30
+        self.model.Generate()
+        summary = self.model.GetStatistics()
+        key = self.model._StatCacheKey(self.model.Fingerprint())
+        assert key in self.model._statCache, "Expected statistics are saved to cache after GetStatistics()!"
+        assert summary == self.model.GetStatistics(), "Expected the same statistics from cache!"
+
+        self.model.prices.loc[0, "close"] += 1  # change prices in place
+        assert self.model.Fingerprint() != self.model._statFingerprint, "Expected fingerprint is changed after prices changed!"
+        self.model.GetStatistics()
+        assert self.model.stat["closeFirst"] == self.model.prices.close[0], "Expected recalculated statistics after prices changed!"
+
+        self.model.Generate()
+        assert not self.model._statCache, "Expected statistics cache is cleared after Generate()!"
+
+    def test_StatisticsCacheOnDisk(self, tmp_path):
+        self.model.horizon = 30
+        self.model.statCacheDir = str(tmp_path)
+        self.model.Generate()
+        summary = self.model.GetStatistics()
+        self.model.indicators["sma5"]
+        self.model._DumpStatCache()
+        assert os.listdir(tmp_path), "Expected cache files in statCacheDir!"
+
+        prices = self.model.prices.copy(deep=True)
+        newModel = PriceGenerator.PriceGenerator()
+        newModel.statCacheDir = str(tmp_path)
+        newModel.prices = prices[newModel.dfHeaders].copy()
+        newModel.horizon = 30
+        newModel.ticker = self.model.ticker
+        newModel.timeframe = self.model.timeframe
+        newModel.zigZagDeviation = self.model.zigZagDeviation
+        newModel.trendDeviation = self.model.trendDeviation
+        assert summary == newModel.GetStatistics(), "Expected the same statistics loaded from disk cache!"
+        assert "sma5" in newModel.indicators.computed, "Expected indicators restored from disk cache without calculation!"
+
+    def test_StatisticsCacheFormat(self, tmp_path, monkeypatch):
+        self.model.horizon = 30
+        self.model.statCacheDir = str(tmp_path)
+        self.model.Generate()
+        self.model.GetStatistics()
+        key = self.model._StatCacheKey(self.model.Fingerprint())
+        assert os.path.exists(os.path.join(str(tmp_path), "{}.pkl".format(key))), "Expected cache file with statistics!"
+
+        monkeypatch.setattr(PriceGenerator, "STAT_CACHE_FORMAT", PriceGenerator.STAT_CACHE_FORMAT + 1)  # e.g. new fields in `stat`
+        assert self.model._StatCacheKey(self.model.Fingerprint()) != key, "Expected another cache key for another format of cache!"
+
+    def test_StatisticsCacheDump(self, tmp_path, monkeypatch):
+        dumps = []
+        pickleDump = PriceGenerator.pickle.dump
+        monkeypatch.setattr(PriceGenerator.pickle, "dump", lambda obj, *args, **kwargs: dumps.append(obj) or pickleDump(obj, *args, **kwargs))
+
+        self.model.horizon = 30
+        self.model.statCacheDir = str(tmp_path)
+        self.model.Generate()
+        self.model.precision = 8  # precision is changed by auto-detection, so statistics have two keys
+        self.model.GetStatistics()
+        assert len(self.model._statKeys) == 2, "Expected keys before and after precision detection!"
+        assert sum("alias" not in entry for entry in dumps) == 1, "Expected only one file with statistics for both keys!"
+
+        self.model.RenderBokeh(fileName=None, viewInBrowser=False)
+        count = len(dumps)
+        assert "sma5" in dumps[-1]["indicators"], "Expected calculated indicators saved to cache!"
+        assert all("indicators" not in cached for cached in self.model._statCache.values()), "Expected cached statistics are not changed while saving!"
+
+        self.model.RenderBokeh(fileName=None, viewInBrowser=False)
+        assert len(dumps) == count, "Expected nothing saved without new statistics or indicators!"
+
+        newModel = PriceGenerator.PriceGenerator()
+        newModel.statCacheDir = str(tmp_path)
+        newModel.prices = self.model.prices[newModel.dfHeaders].copy()
+        newModel.horizon = 30
+        newModel.ticker = self.model.ticker
+        newModel.timeframe = self.model.timeframe
+        newModel.precision = 8
+        assert newModel.GetStatistics() == self.model.GetStatistics(), "Expected the same statistics loaded by key before precision detection!"
+
+        newModel.RenderBokeh(fileName=None, viewInBrowser=False)
+        assert len(dumps) == count, "Expected nothing saved for statistics and indicators loaded from disk!"
+
+    def test_RenderBatch(self, tmp_path):
+        items = {}
+        for ticker in ["AAA", "BBB", "CCC"]:
+            self.model.horizon = 30
+            self.model.Generate()
+            items[ticker] = self.model.prices.copy()
+
+        items["BROKEN"] = pd.DataFrame({"datetime": []})
+
+        for kind in PriceGenerator.RENDER_KINDS:
+            outputDir = str(tmp_path / kind)
+            report = PriceGenerator.RenderBatch(items, workers=2, kind=kind, outputDir=outputDir, options={"statCacheDir": str(tmp_path / "cache")})
+
+            assert [chart["name"] for chart in report["charts"]] == ["AAA", "BBB", "CCC"], "Expected 3 rendered charts in the same order as items!"
+            assert [chart["name"] for chart in report["failed"]] == ["BROKEN"], "Expected broken item in failed charts!"
+            assert report["chartsPerSecond"] > 0, "Expected positive throughput!"
+
+            for chart in report["charts"]:
+                assert os.path.exists(chart["file"]), "Expected rendered chart '{}'!".format(chart["file"])
+
+            with open(report["index"], "r", encoding="UTF-8") as fH:
+                index = fH.read()
+
+            for ticker in ["AAA", "BBB", "CCC"]:
+                assert 'href="{}.{}"'.format(ticker, "png" if kind == "png" else "html") in index, "Expected link to chart of {} in index page!".format(ticker)
+
+        report = PriceGenerator.RenderBatch([os.path.join("tests", "AFLT_day.csv")], workers=1, outputDir=str(tmp_path / "csv"), indexFile=None)
+        assert report["charts"][0]["name"] == "AFLT_day" and report["index"] is None, "Expected chart named as .CSV-file and no index page!"
+
+        with pytest.raises(Exception):
+            PriceGenerator.RenderBatch(items, kind="unknown")
+
+    def test_PageBounds(self):
+        self.model.timeframe = timedelta(hours=1)
+        self.model.timeStart = datetime(2022, 1, 30, 0, 0)
+        self.model.horizon = 24 * 5  # from 30 January to 3 February
+        self.model.Generate()
+
+        testData = [
+            ("month", [(0, 48), (48, 120)]),
+            ("day", [(start, start + 24) for start in range(0, 120, 24)]),
+            (50, [(0, 50), (50, 100), (100, 120)]),
+            ("50", [(0, 50), (50, 100), (100, 120)]),
+        ]
+
+        for period, expected in testData:
+            assert self.model.PageBounds(period) == expected, "Unexpected pages for period {}!".format(period)
+
+        for period in ["decade", 0]:
+            with pytest.raises(Exception):
+                self.model.PageBounds(period)
+
+    def test_RenderPages(self, tmp_path):
+        self.model.horizon = 250
+        self.model.Generate()
+        sma200 = self.model.indicators["sma200"].values
+
+        report = self.model.RenderPages(outputDir=str(tmp_path), period=100, workers=2, showStatOnChart=True)
+        assert [(chart["start"], chart["stop"]) for chart in report["charts"]] == [(0, 100), (100, 200), (200, 250)], "Expected 3 pages in order!"
+
+        with open(report["index"], "r", encoding="UTF-8") as fH:
+            index = fH.read()
+
+        for chart in report["charts"]:
+            assert os.path.exists(chart["file"]), "Expected rendered page '{}'!".format(chart["file"])
+            assert 'href="{}"'.format(os.path.basename(chart["file"])) in index, "Expected link to page '{}' in index page!".format(chart["name"])
+
+        page = self.model.Window(200, 250, indicators=["sma200"])
+        page.GetStatistics()
+        assert np.array_equal(page.indicators["sma200"].values, sma200[200:]), "Expected indicators of page sliced from the whole chain!"
+
+    def test_RenderPagesGoogle(self, tmp_path):
+        self.model.horizon = 250
+        self.model.Generate()
+        self.model.RenderGoogle(fileName=str(tmp_path / "full.html"), viewInBrowser=False)  # model of Google chart for all candles
+        self.model.RegisterIndicator("double", inputs=["close"], func=lambda close: close * 2)  # lambda can't be pickled
+
+        report = self.model.RenderPages(outputDir=str(tmp_path / "pages"), period=100, kind="google", workers=2)
+        assert not report["failed"], "Expected all pages rendered in worker processes!"
+
+        for chart, count in zip(report["charts"], [100, 100, 50]):
+            with open(chart["file"], "r", encoding="UTF-8") as fH:
+                assert "horizon length: {} ".format(count) in fH.read(), "Expected only candles of page '{}' on Google chart!".format(chart["name"])
+
+        page = self.model.Window(200, 250)
+        assert page.j2model is None and self.model.j2model is not None, "Expected model of Google chart is not copied to page!"
+        assert np.array_equal(page.indicators["double"].values, 2 * page.prices.close.values), "Expected custom indicators copied to page!"
+
+        with pytest.raises(Exception):
+            self.model.Window(200, 250, customs=False).indicators["double"]
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+
+from pricegenerator import PriceGenerator
+from pricegenerator.Similarity import KSDistance, ADDistance, Autocorrelation, HurstExponent
+
+
+class TestFeatures:
+
+    @pytest.fixture(scope='function', autouse=True)
+    def init(self):
+        PriceGenerator.uLogger.level = 50  # Disable debug logging while test, logger CRITICAL = 50
+        PriceGenerator.uLogger.handlers[0].level = 50  # Disable debug logging for STDOUT
+
+        self.model = PriceGenerator.PriceGenerator()  # init generator for the next tests
+
+    def test_KSDistance(self):
+        assert KSDistance([1, 2, 3], [1, 2, 3]) == 0, "Expected zero distance for the same samples!"
+        assert KSDistance([1, 2, 3], [4, 5]) == 1, "Expected maximal distance for not overlapped samples!"
+        assert KSDistance([1, 2, 3, 4], [3, 4]) == 0.5, "Expected distance between empirical distribution functions!"
+
+    def test_ADDistance(self):
+        rng = np.random.default_rng(seed=5)
+        a = rng.normal(size=500)
+        assert ADDistance(a, a) == pytest.approx(0), "Expected zero statistic for the same samples!"
+        assert ADDistance(a, rng.normal(size=500)) < ADDistance(a, rng.normal(loc=1, size=500)), "Expected bigger statistic for shifted sample!"
+
+    def test_Autocorrelation(self):
+        x = np.random.default_rng(seed=6).normal(size=1000)
+        expected = [np.corrcoef(x[:-lag], x[lag:])[0, 1] for lag in [1, 2, 3]]
+        assert list(Autocorrelation(x, maxLag=3)) == pytest.approx(expected, abs=0.01), "Expected autocorrelations calculated with FFT!"
+        assert np.isnan(Autocorrelation([1, 1, 1, 1], maxLag=2)).all(), "Expected NaN for constant series!"
+
+    def test_HurstExponent(self):
+        rng = np.random.default_rng(seed=7)
+        assert 0.4 < HurstExponent(rng.normal(size=20000)) < 0.6, "Expected Hurst exponent about 0.5 for random walk!"
+        assert HurstExponent(np.cumsum(rng.normal(size=20000))) > 0.9, "Expected Hurst exponent about 1 for persistent increments!"
+        assert np.isnan(HurstExponent([0.1, 0.2])), "Expected NaN for short series!"
+
+    def test_CompareDistributions(self):
+        self.model.horizon = 500
+        self.model.Generate()
+        same = self.model.CompareDistributions(self.model.prices.copy())
+        assert same["score"] == pytest.approx(0), "Expected zero score for the same prices!"
+        assert same["returns"]["ks"] == 0 and same["hurst"] == 0, "Expected zero distances for the same prices!"
+
+        other = PriceGenerator.PriceGenerator()
+        other.horizon = 500
+        other.maxCandleBody = 50
+        other.Generate()
+        report = self.model.CompareDistributions(other)
+        assert report["score"] > same["score"], "Expected bigger score for different model!"
+        assert set(report.keys()) == {"returns", "body", "upperShadow", "lowerShadow", "acfReturns", "acfAbsReturns", "hurst", "score"}, "Expected all parts of report!"
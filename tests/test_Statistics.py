@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import timedelta
+
+from pricegenerator import PriceGenerator
+from pricegenerator.Statistics import P2Quantile, OnlineStatistics, DetectPrecision, PrecisionOfValues, RunLengths, ChainStatistics, DistributionSummary, WindowExtremes, TimeIndex
+
+
+class TestFeatures:
+
+    @pytest.fixture(scope='function', autouse=True)
+    def init(self):
+        PriceGenerator.uLogger.level = 50  # Disable debug logging while test, logger CRITICAL = 50
+        PriceGenerator.uLogger.handlers[0].level = 50  # Disable debug logging for STDOUT
+
+        self.model = PriceGenerator.PriceGenerator()  # init generator for the next tests
+
+    def test_P2Quantile(self):
+        values = np.random.default_rng(seed=1).normal(loc=10, scale=2, size=20000)
+        for q in [0.5, 0.8, 0.95, 0.99]:
+            sketch = P2Quantile(q)
+            for x in values:
+                sketch.Update(x)
+            expected = np.quantile(values, q)
+            assert abs(sketch.value - expected) < 0.05, "Expected P² estimation of {} quantile close to {}, but {} given!".format(q, expected, sketch.value)
+
+        sketch = P2Quantile(0.8)
+        for x in [3, 1, 2]:
+            sketch.Update(x)
+        assert sketch.value == np.quantile([1, 2, 3], 0.8), "Expected exact quantile for the first 5 values!"
+
+    def test_OnlineStatistics(self):
+        self.model.horizon = 500
+        self.model.Generate()
+        self.model.GetStatistics()
+        online = OnlineStatistics(trendDeviation=self.model.trendDeviation, precision=self.model.precision)
+        online.UpdateMany(self.model.prices)
+        stat = online.stat
+        for key in ["candles", "closeFirst", "closeLast", "closeMax", "closeMin", "trend", "upCount", "downCount", "upCountChainMax", "downCountChainMax", "cumSumVolumes", "patterns"]:
+            assert stat[key] == self.model.stat[key], "Expected the same '{}' value in online statistics!".format(key)
+        for key in ["max", "min", "stDev"]:
+            assert stat["deltas"][key] == pytest.approx(self.model.stat["deltas"][key]), "Expected the same deltas '{}' value in online statistics!".format(key)
+        assert len(online.Summary(self.model.timeframe)) == len(self.model.GetStatistics()), "Expected the same summary format!"
+
+    def test_OnlineStatisticsPatterns(self):
+        self.model.horizon = 1000
+        self.model.Generate()
+        self.model.GetStatistics()
+        prices = self.model.prices
+
+        whole = OnlineStatistics()
+        whole.UpdateMany(prices)
+
+        parts = OnlineStatistics()  # patterns crossing borders of frames and single candles must be found too
+        parts.UpdateMany(prices.iloc[:500])
+        parts.Update(*prices.iloc[500][["open", "high", "low", "close", "volume"]])
+        parts.UpdateMany(prices.iloc[501:])
+
+        byCandles = OnlineStatistics()
+        for row in zip(prices.open, prices.high, prices.low, prices.close, prices.volume):
+            byCandles.Update(*row)
+
+        for online in [whole, parts, byCandles]:
+            assert online.stat["patterns"] == self.model.stat["patterns"], "Expected the same counts of patterns in online and batch statistics!"
+
+    def test_Extend(self):
+        self.model.horizon = 50
+        self.model.Generate()
+        online = self.model.onlineStat
+        assert online.candles == 50, "Expected online statistics built from all prices!"
+        newCandles = self.model.Extend(horizon=10)
+        assert len(newCandles) == 10 and len(self.model.prices) == 60 and self.model.horizon == 60, "Expected 10 new candles in prices!"
+        assert self.model.prices.datetime.iloc[50] - self.model.prices.datetime.iloc[49] == self.model.timeframe, "Expected new candles continue timeline!"
+        assert self.model.prices.open.iloc[50] == self.model.prices.close.iloc[49], "Expected new candles continue from the last close price!"
+        assert self.model.onlineStat is online and online.candles == 60, "Expected online statistics updated incrementally!"
+        self.model.GetStatistics()
+        assert online.stat["closeLast"] == self.model.stat["closeLast"], "Expected the same last close in online and full statistics!"
+        assert online.stat["cumSumVolumes"] == self.model.stat["cumSumVolumes"], "Expected the same volumes in online and full statistics!"
+
+    def test_PrecisionOfValues(self):
+        actual = list(PrecisionOfValues(np.array([0.1 + 0.2, 1.25, 2., 123456.789, 0.00001])))
+        assert actual == [1, 2, 1, 3, 5], "Expected precision of every value without float artefacts, but {} given!".format(actual)
+        assert list(PrecisionOfValues(np.array([1, 2, 3]))) == [0, 0, 0], "Expected zero precision for integer values!"
+
+    def test_DetectPrecisionSampling(self):
+        values = np.round(np.random.default_rng(seed=2).uniform(10, 100, size=500000), 3)
+        assert DetectPrecision(values, sampleSize=1000) == 3, "Expected precision 3 detected by sample of values!"
+        assert DetectPrecision([np.nan, 1.5, 2.5]) == 1, "Expected NaN values are ignored!"
+
+    def test_DetectPrecisionIntegers(self):
+        assert DetectPrecision(np.array([100, 2500, 7, 10 ** 12])) == 0, "Expected zero precision for integer prices!"
+        assert DetectPrecision(np.array([1e15, 2e20, 3e300])) == 1, "Expected non-negative precision for very large prices!"
+        assert DetectPrecision([1.5, 2.25], maxPrecision=-1) >= 0, "Expected non-negative precision for any maximal precision!"
+
+        self.model.horizon = 30
+        self.model.Generate()
+        self.model.prices[["open", "high", "low", "close"]] = self.model.prices[["open", "high", "low", "close"]].round().astype(np.int64)
+        self.model.GetStatistics()
+        assert self.model.precision == 0 and self.model.stat["precision"] == 0, "Expected zero precision for integer prices in statistics!"
+
+    def test_RunLengths(self):
+        values, lengths, starts = RunLengths([True, True, False, True, True, True, False, False])
+        assert list(values) == [True, False, True, False], "Expected value of every run!"
+        assert list(lengths) == [2, 1, 3, 2], "Expected length of every run!"
+        assert list(starts) == [0, 2, 3, 6], "Expected start index of every run!"
+
+    def test_ChainStatistics(self):
+        chains = ChainStatistics([True, True, False, True, True, True, False, False, True])
+        assert chains["upCount"] == 6 and chains["downCount"] == 3, "Expected counts of up and down candles!"
+        assert chains["upCountChainMax"] == 3 and chains["downCountChainMax"] == 2, "Expected maxima of chains!"
+        assert chains["upChains"] == {1: 1, 2: 1, 3: 1} and chains["downChains"] == {1: 1, 2: 1}, "Expected distributions of chains lengths!"
+
+        self.model.horizon = 300
+        self.model.Generate()
+        self.model.GetStatistics()
+        online = self.model.onlineStat.stat
+        assert online["upChains"] == self.model.stat["upChains"], "Expected the same distribution of up chains in online statistics!"
+        assert online["downChains"] == self.model.stat["downChains"], "Expected the same distribution of down chains in online statistics!"
+
+    def test_DistributionSummary(self):
+        values = np.random.default_rng(seed=3).gamma(shape=2., scale=1.5, size=10000)
+        summary = DistributionSummary(np.append(values, np.nan), quantiles=[0.99, 0.5, 0.995])
+        assert summary["count"] == 10000, "Expected NaN values are ignored!"
+        assert summary["stDev"] == pytest.approx(np.std(values)), "Expected population standard deviation!"
+        assert summary["q99"] == pytest.approx(np.quantile(values, 0.99)), "Expected the same quantile as numpy gives!"
+        assert summary["q99.5"] == pytest.approx(np.quantile(values, 0.995)), "Expected the same quantile as numpy gives!"
+        assert summary["skew"] == pytest.approx(2 / np.sqrt(2), rel=0.15), "Expected skewness of gamma distribution about 2/√k!"
+        assert summary["kurtosis"] == pytest.approx(6 / 2, rel=0.3), "Expected excess kurtosis of gamma distribution about 6/k!"
+
+    def test_GetDistribution(self):
+        self.model.horizon = 200
+        self.model.Generate()
+        self.model.deltaQuantiles = [0.9, 0.5]
+        summary = self.model.GetStatistics()
+        assert "q90" in self.model.stat["deltas"] and "q99" not in self.model.stat["deltas"], "Expected configured quantiles of deltas!"
+        assert "  - 90 percentile: ≤ {}".format(round(self.model.stat["deltas"]["q90"], self.model.precision)) in summary, "Expected configured quantiles in summary!"
+        online = self.model.onlineStat.stat["deltas"]
+        assert online["skew"] == pytest.approx(self.model.stat["deltas"]["skew"]), "Expected the same skewness in online statistics!"
+        assert online["kurtosis"] == pytest.approx(self.model.stat["deltas"]["kurtosis"]), "Expected the same kurtosis in online statistics!"
+        bodies = self.model.GetDistribution("body")
+        assert bodies["max"] == pytest.approx(max(abs(self.model.prices.close - self.model.prices.open))), "Expected distribution of candle bodies!"
+        assert self.model.GetDistribution("returns")["count"] == 199, "Expected returns for all candles except the first one!"
+
+    def test_WindowExtremes(self):
+        values = np.random.default_rng(seed=3).normal(size=300)
+        quantiles = [0.9, 0.5]
+        windows = [
+            (np.arange(0, 300, 50), np.arange(50, 301, 50)),  # not overlapped
+            (np.arange(0, 251, 10), np.arange(50, 301, 10)),  # overlapped
+            (np.zeros(6, dtype=np.int64), np.arange(50, 301, 50)),  # expanding
+            (np.array([0, 30, 20]), np.array([40, 90, 60])),  # any other
+        ]
+        for starts, ends in windows:
+            minimums, maximums, qs = WindowExtremes(values, starts, ends, quantiles)
+            for i, (start, end) in enumerate(zip(starts, ends)):
+                assert minimums[i] == values[start:end].min() and maximums[i] == values[start:end].max(), "Expected extremes of window [{}, {})!".format(start, end)
+                assert list(qs[i]) == pytest.approx(list(np.quantile(values[start:end], quantiles))), "Expected quantiles of window [{}, {})!".format(start, end)
+
+    def test_GetRollingStatistics(self):
+        self.model.horizon = 300
+        self.model.Generate()
+        table = self.model.GetRollingStatistics(window=100)
+        assert len(table) == 3 and list(table.candles) == [100, 100, 100], "Expected 3 windows of 100 candles!"
+
+        full = self.model.prices
+        for i, row in table.iterrows():
+            part = PriceGenerator.PriceGenerator()
+            part.prices = full.iloc[i * 100:(i + 1) * 100].reset_index(drop=True)
+            part.precision = self.model.precision
+            part.GetStatistics()
+            assert row.trend == part.stat["trend"], "Expected the same trend in window {}!".format(i)
+            assert row.upCount == part.stat["upCount"] and row.closeMax == part.stat["closeMax"], "Expected the same candles statistics in window {}!".format(i)
+            assert row.delta_q99 == pytest.approx(part.stat["deltas"]["q99"], abs=10 ** -part.precision), "Expected the same quantile of deltas in window {}!".format(i)
+            assert row.cumSumVolumes == part.stat["cumSumVolumes"], "Expected the same sum of volumes in window {}!".format(i)
+
+        assert len(self.model.GetRollingStatistics(window=100, step=50)) == 5, "Expected 5 overlapped windows!"
+        expanding = self.model.GetRollingStatistics(window=100, expanding=True)
+        assert list(expanding.candles) == [100, 200, 300] and expanding.cumSumVolumes.iloc[-1] == full.volume.sum(), "Expected expanding windows!"
+        daily = self.model.GetRollingStatistics(window="1D")
+        assert daily.candles.sum() == 300 and (daily.start.dt.floor("1D") == daily.end.dt.floor("1D")).all(), "Expected calendar windows per day!"
+
+    def test_GetPathsStatistics(self):
+        self.model.horizon = 100
+        paths = []
+        for _ in range(5):
+            self.model.Generate()
+            paths.append(self.model.prices.copy())
+
+        table, aggregate = self.model.GetPathsStatistics(paths)
+        assert len(table) == 5 and aggregate["paths"] == 5, "Expected one row of statistics per path!"
+        assert sum(aggregate["trends"].values()) == pytest.approx(1), "Expected frequencies of trends!"
+
+        for i, prices in enumerate(paths):
+            self.model.prices = prices
+            self.model.GetStatistics()
+            for key in ["trend", "upCount", "downCount", "upCountChainMax", "downCountChainMax", "closeMax", "closeMin", "cumSumVolumes"]:
+                assert table[key][i] == self.model.stat[key], "Expected the same '{}' for path {}!".format(key, i)
+
+            assert table.delta_q99[i] == pytest.approx(self.model.stat["deltas"]["q99"], abs=10 ** -self.model.precision), "Expected the same quantile of deltas for path {}!".format(i)
+
+        assert aggregate["fields"]["upCountChainMax"]["max"] == table.upCountChainMax.max(), "Expected distribution of chains maxima across paths!"
+
+        with pytest.raises(Exception):
+            self.model.GetPathsStatistics([paths[0], paths[1].iloc[:50]])
+
+    def test_GetPanelStatistics(self):
+        self.model.horizon = 100
+        panel = {}
+        for ticker in ["A", "B", "C"]:
+            self.model.Generate()
+            panel[ticker] = self.model.prices.copy()
+
+        panel["C"] = panel["C"].iloc[10:]  # only common candles are used
+        table, correlations = self.model.GetPanelStatistics(panel)
+        assert list(table.index) == ["A", "B", "C"] and list(table.candles) == [90, 90, 90], "Expected one row per ticker for common candles!"
+        assert list(correlations.index) == ["A", "B", "C"] and np.diag(correlations.values) == pytest.approx([1, 1, 1]), "Expected correlation matrix of tickers!"
+
+        self.model.prices = panel["A"].iloc[10:].reset_index(drop=True)
+        summary = self.model.GetStatistics()
+        assert table.loc["A", "upCountChainMax"] == self.model.stat["upCountChainMax"], "Expected the same statistics for ticker!"
+        assert self.model.PanelSummary(table)["A"] == summary, "Expected the same Markdown summary for ticker!"
+
+    def test_TimeIndex(self):
+        dates = pd.to_datetime(["2022-01-03", "2022-01-04", "2022-01-05", "2022-01-06", "2022-01-07", "2022-01-10", "2022-01-10", "2022-01-09", "2022-01-11", "2022-01-14"])
+        index = TimeIndex(dates)
+        assert index["timeframe"] == timedelta(days=1), "Expected the most frequent time delta between candles!"
+        assert list(index["gaps"]) == [5, 8, 9] and list(index["gapCandles"]) == [2, 1, 2], "Expected positions of gaps and counts of missed candles!"
+        assert list(index["duplicates"]) == [6] and list(index["outOfOrder"]) == [7], "Expected positions of duplicates and rows out of order!"
+        assert TimeIndex(dates[:1])["timeframe"] is None, "Expected no timeframe for one candle!"
+
+    def test_DetectTimeframeWithGaps(self):
+        self.model.horizon = 20
+        self.model.timeframe = timedelta(minutes=5)
+        self.model.Generate()
+        self.model.prices = self.model.prices.drop(index=[17, 18]).reset_index(drop=True)  # missed candles at the end
+        self.model.timeframe = timedelta(hours=1)
+        assert self.model.DetectTimeframe() == timedelta(minutes=5), "Expected timeframe is not changed by missed candles!"
+        assert list(self.model.timeIndex["gaps"]) == [17], "Expected gap before the last candle!"
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+import os
+import random
+import pytest
+
+from pricegenerator import PriceGenerator
+from pricegenerator import Templates
+from pricegenerator.Templates import GetTemplate, TemplateVariables, J2_ENVIRONMENT
+
+
+class TestFeatures:
+
+    @pytest.fixture(scope='function', autouse=True)
+    def init(self):
+        PriceGenerator.uLogger.level = 50  # Disable debug logging while test, logger CRITICAL = 50
+        PriceGenerator.uLogger.handlers[0].level = 50  # Disable debug logging for STDOUT
+
+        self.model = PriceGenerator.PriceGenerator()  # init generator for the next tests
+
+    def test_GetTemplateInline(self):
+        template = GetTemplate("<b>{{ title }}</b>")
+        assert GetTemplate("<b>{{ title }}</b>") is template, "Expected the same compiled template for the same text!"
+        assert GetTemplate("<i>{{ title }}</i>") is not template, "Expected another compiled template for another text!"
+        assert template.render(title="test") == "<b>test</b>", "Unexpected rendered template!"
+        assert TemplateVariables(template) == {"title"}, "Expected only 'title' variable in template!"
+
+    def test_InlineTemplatesLimit(self, monkeypatch):
+        monkeypatch.setattr(Templates, "TEMPLATES_CACHE_SIZE", 3)
+        texts = ["<p>{{{{ title }}}} {}</p>".format(number) for number in range(5)]
+
+        for text in texts:
+            GetTemplate(text)
+
+        assert list(Templates._inlineTemplates.values()) == texts[2:], "Expected only TEMPLATES_CACHE_SIZE recently used texts of inline templates!"
+        assert GetTemplate(texts[0]).render(title="test") == "<p>test 0</p>", "Expected dropped template compiled again!"
+
+    def test_GetTemplateFile(self):
+        name = "test_template{}.j2".format(random.uniform(0, 1000000000))
+
+        try:
+            with open(name, "w", encoding="UTF-8") as fH:
+                fH.write("{{ title }}")
+
+            template = GetTemplate(name)
+            assert GetTemplate(name) is template, "Expected the same compiled template if file is not changed!"
+
+            with open(name, "w", encoding="UTF-8") as fH:
+                fH.write("{{ title }}!")
+            os.utime(name, (0, os.path.getmtime(name) + 10))
+
+            changed = GetTemplate(name)
+            assert changed is not template, "Expected recompiled template after file changing!"
+            assert changed.render(title="test") == "test!", "Expected new text of changed template file!"
+
+        finally:
+            os.remove(name)
+
+    def test_GetTemplateBytecodeCache(self, tmp_path):
+        cacheDir = str(tmp_path / "j2cache")
+        text = "{{ title }} {}".format(random.uniform(0, 1000000000))  # new template, so it is compiled and saved
+
+        try:
+            GetTemplate(text, bytecodeCacheDir=cacheDir)
+            assert os.listdir(cacheDir), "Expected compiled template as bytecode in cache directory!"
+
+        finally:
+            J2_ENVIRONMENT.bytecode_cache = None
+
+    def test_RenderGoogleWithCachedTemplate(self):
+        self.model.horizon = 30
+        self.model.Generate()
+        self.model.j2template = os.path.join("tests", "test_template.j2")
+        name = "test_render_google_cached{}.html".format(random.uniform(0, 1000000000))
+
+        self.model.RenderGoogle(fileName=name, viewInBrowser=False)
+        template = GetTemplate(self.model.j2template)
+        self.model.RenderGoogle(fileName=name, viewInBrowser=False)
+        assert GetTemplate(self.model.j2template) is template, "Expected template compiled only once for repeated rendering!"
+        assert os.path.exists(name), "Expected .html-file '{}' after saving but it is not exist!".format(name)
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from pricegenerator import PriceGenerator
+from pricegenerator.Validation import ValidateOHLCV, RepairOHLCV
+
+
+class TestFeatures:
+
+    @pytest.fixture(scope='function', autouse=True)
+    def init(self):
+        PriceGenerator.uLogger.level = 50  # Disable debug logging while test, logger CRITICAL = 50
+        PriceGenerator.uLogger.handlers[0].level = 50  # Disable debug logging for STDOUT
+
+        self.model = PriceGenerator.PriceGenerator()  # init generator for the next tests
+
+        self.prices = pd.DataFrame({
+            "open": [10., 10.5, 11., 11., np.nan, 12.],
+            "high": [11., 10.8, 11.5, 12., 12., 12.5],
+            "low": [9.5, 10.6, 10.5, 10., 11., 11.5],
+            "close": [10.5, 10.7, 11.2, 11.5, 11.8, 12.2],
+            "volume": [100, 200, -5, 300, 400, 500],
+        })  # broken candles: 1 (low above body), 2 (negative volume), 4 (NaN open)
+
+    def test_ValidateOHLCV(self):
+        violations = ValidateOHLCV(self.prices)
+        assert list(violations["lowAboveBody"]) == [1], "Expected low above body in candle 1!"
+        assert list(violations["negativeVolume"]) == [2], "Expected negative volume in candle 2!"
+        assert list(violations["notFinite"]) == [4], "Expected NaN price in candle 4!"
+        assert len(violations["highBelowBody"]) == 0 and len(violations["notPositive"]) == 0, "Expected no other violations!"
+
+    def test_RepairOHLCV(self):
+        clipped = RepairOHLCV(self.prices, method="clip")
+        assert clipped.low[1] == 10.5 and clipped.volume[2] == 0, "Expected clipped low and volume!"
+        assert list(ValidateOHLCV(clipped)["notFinite"]) == [4], "Expected NaN is not repaired by clipping!"
+
+        dropped = RepairOHLCV(self.prices, method="drop")
+        assert list(dropped.open) == [10., 11., 12.], "Expected broken candles are removed!"
+
+        filled = RepairOHLCV(self.prices, method="ffill")
+        assert list(filled.close) == [10.5, 10.5, 10.5, 11.5, 11.5, 12.2], "Expected broken candles replaced with previous correct candle!"
+        assert filled.volume.dtype == self.prices.volume.dtype, "Expected the same type of volumes!"
+        assert all(len(positions) == 0 for positions in ValidateOHLCV(filled).values()), "Expected no broken candles after repairing!"
+        assert self.prices.low[1] == 10.6, "Expected input prices are not changed!"
+
+        with pytest.raises(Exception):
+            RepairOHLCV(self.prices, method="unknown")
+
+    def test_Validate(self):
+        self.model.horizon = 50
+        self.model.validation = "clip"
+        self.model.Generate()
+        assert all(len(positions) == 0 for positions in self.model.Validate().values()), "Expected consistent generated candles!"
+
+        self.model.prices.loc[10, "high"] = self.model.prices.loc[10, "low"] - 1
+        violations = self.model.Validate(repair="drop")
+        assert list(violations["highBelowBody"]) == [10], "Expected broken candle found!"
+        assert len(self.model.prices) == 49 and self.model.horizon == 49, "Expected broken candle removed from prices!"
+
+    def test_ValidateSplitTrends(self):
+        self.model.horizon = 50
+        self.model.trendSplit = "/\\"
+        self.model.splitCount = [25, 25]
+        self.model.Generate()
+
+        self.model.prices.loc[[10, 49], "high"] = self.model.prices.loc[[10, 49], "low"] - 1
+        self.model.Validate(repair="drop")
+        assert len(self.model.prices) == 48, "Expected broken candles removed from prices!"
+        assert self.model.splitCount == [24, 24] and self.model.trendSplit == "up-down", "Expected trends shrunk to the remaining candles!"
+
+        self.model.prices.loc[0:23, "high"] = self.model.prices.loc[0:23, "low"] - 1
+        self.model.Validate(repair="drop")
+        assert self.model.splitCount == [24] and self.model.trendSplit == "down", "Expected trend without candles removed!"
+
+        chart = self.model.RenderBokeh(fileName=None, viewInBrowser=False)
+        assert chart is not None, "Expected chart rendered after removing of candles!"
+
+        self.model.trendSplit, self.model.splitCount = "up-down", [30, 30]  # trends longer than prices
+        assert self.model.RenderBokeh(fileName=None, viewInBrowser=False) is not None, "Expected trend lines only for existing candles!"